@@ -0,0 +1,454 @@
+"""API HTTP/JSON local sobre os modelos (clientes, produtos, pedidos e itens).
+
+Servidor da biblioteca padrão para que os caixas da loja usem o mesmo banco pela
+rede, em vez de cada aplicação abrir banco_dados.db diretamente. As requisições são
+atendidas por um pool fixo de threads; cada thread mantém a sua conexão SQLite
+(db.conectar é por thread), reaproveitada entre requisições e conexões HTTP.
+
+    python -m api --porta 8765                  # só nesta máquina
+    python -m api --host 0.0.0.0 --porta 8765   # acessível pela rede local
+
+Rotas (corpo e respostas em JSON; valores monetários em centavos inteiros):
+
+    GET    /clientes?depois_de=&limite=   página de clientes, em ordem de id
+    GET    /clientes?busca=termo          pesquisa por nome, email ou telefone
+    GET    /clientes?ids=1,2,3            vários clientes de uma vez
+    GET    /clientes/<id>
+    POST   /clientes                      {"nome", "email", "telefone"}
+    PUT    /clientes/<id>
+    DELETE /clientes/<id>
+    GET    /produtos?depois_de=&limite=   (e ?ids=, /produtos/<id>, POST, PUT e DELETE
+                                           como em clientes, com {"nome", "preco_centavos"})
+    GET    /pedidos?antes_de=&limite=     página de pedidos, dos mais recentes para os mais antigos
+    GET    /pedidos?cliente=termo         pesquisa pelo nome do cliente
+    GET    /pedidos/<id>                  pedido com os seus itens
+    POST   /pedidos                       {"id_cliente", "data", "itens": [{"produto_id", "quantidade"}, ...]}
+    DELETE /pedidos/<id>                  remove o pedido e os seus itens
+    GET    /pedidos/<id>/itens
+    POST   /pedidos/<id>/itens            {"produto_id", "quantidade"}
+    PUT    /itens/<id>                    {"pedido_id", "produto_id", "quantidade"}
+    DELETE /itens/<id>
+
+As listas paginadas retornam {"itens": [...], "proximo": caminho da próxima página
+ou null}. Erros retornam {"erro": mensagem} com 400 (dados inválidos), 404 (não
+encontrado), 405 (método não suportado na rota) ou 500 (falha no banco). Corpos
+acima de MAX_CORPO bytes são recusados com 400.
+"""
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import db
+from models import Cliente, ItemPedido, Pedido, Produto
+from utils import validar_data, validar_email, validar_telefone
+
+PORTA = 8765
+THREADS = 16              # requisições atendidas ao mesmo tempo (e conexões SQLite abertas)
+LIMITE_PADRAO = 100       # linhas por página quando `limite` não é informado
+LIMITE_MAXIMO = 500
+TEMPO_OCIOSO = 30         # segundos até fechar uma conexão HTTP keep-alive parada
+MAX_CORPO = 1 << 20       # bytes aceitos no corpo de uma requisição
+MAX_INTEIRO = 2 ** 63 - 1 # maior inteiro que o SQLite guarda (acima disso, OverflowError)
+
+
+# ===========================================================
+# Conversões e validações
+# ===========================================================
+def _objeto(linha):
+    return linha._asdict() if linha is not None else None
+
+
+def _objetos(linhas):
+    return [linha._asdict() for linha in linhas]
+
+
+def _inteiro(valor, campo, minimo=None):
+    """Converte `valor` em int; ValueError (resposta 400) se não for um inteiro válido.
+
+    Aceita int do JSON (não bool) ou texto só com dígitos (parâmetros da URL). Números
+    com parte decimal são recusados, e não truncados: 12.99 não vira 12.
+    """
+    if isinstance(valor, str):
+        texto = valor.strip()
+        digitos = texto[1:] if texto[:1] in "+-" else texto
+        if not (digitos.isascii() and digitos.isdigit()):
+            raise ValueError(f"{campo} deve ser um número inteiro")
+        if len(digitos) > len(str(MAX_INTEIRO)):
+            raise ValueError(f"{campo} fora do intervalo aceito")
+        numero = int(texto)
+    elif isinstance(valor, int) and not isinstance(valor, bool):
+        numero = valor
+    else:
+        raise ValueError(f"{campo} deve ser um número inteiro")
+    if minimo is not None and numero < minimo:
+        raise ValueError(f"{campo} deve ser maior ou igual a {minimo}")
+    if not -MAX_INTEIRO - 1 <= numero <= MAX_INTEIRO:
+        raise ValueError(f"{campo} fora do intervalo aceito")
+    return numero
+
+
+def _id_do_caminho(texto):
+    """Id capturado na rota (só dígitos) -> int, ou None se não couber em 64 bits (não existe)."""
+    if len(texto) > len(str(MAX_INTEIRO)) or int(texto) > MAX_INTEIRO:
+        return None
+    return int(texto)
+
+
+def _limite(params):
+    return min(_inteiro(params.get("limite", LIMITE_PADRAO), "limite", 1), LIMITE_MAXIMO)
+
+
+def _ids(texto):
+    return [_inteiro(i, "ids", 1) for i in texto.split(",") if i.strip()]
+
+
+def _texto(corpo, campo, obrigatorio=False):
+    valor = corpo.get(campo) or ""
+    if not isinstance(valor, str):
+        raise ValueError(f"{campo} deve ser texto")
+    valor = valor.strip()
+    if obrigatorio and not valor:
+        raise ValueError(f"{campo} obrigatório")
+    return valor
+
+
+def _pagina(linhas, limite, caminho, cursor):
+    """Corpo de uma lista paginada por chave: a próxima página começa depois do id da última linha."""
+    proximo = f"{caminho}?{cursor}={linhas[-1].id}&limite={limite}" if len(linhas) == limite else None
+    return {"itens": _objetos(linhas), "proximo": proximo}
+
+
+def _cliente(corpo, id=None):
+    nome = _texto(corpo, "nome", obrigatorio=True)
+    email = _texto(corpo, "email")
+    telefone = _texto(corpo, "telefone")
+    if email and not validar_email(email):
+        raise ValueError("email inválido")
+    if telefone and not validar_telefone(telefone):
+        raise ValueError("telefone inválido")
+    return Cliente(nome, email, telefone, id=id)
+
+
+def _produto(corpo, id=None):
+    return Produto(_texto(corpo, "nome", obrigatorio=True),
+                   _inteiro(corpo.get("preco_centavos"), "preco_centavos", 0), id=id)
+
+
+def _item(corpo):
+    return _inteiro(corpo.get("produto_id"), "produto_id", 1), _inteiro(corpo.get("quantidade"), "quantidade", 1)
+
+
+def _conferir_existentes(modelo, ids, nome):
+    """ValueError se algum dos `ids` não existir (uma consulta para todos)."""
+    existentes = modelo.buscar_por_ids(ids)
+    faltando = [i for i in ids if i not in existentes]
+    if faltando:
+        raise ValueError(f"{nome} {faltando[0]} não existe")
+
+
+def _gravado(linha, status=200):
+    return (status, _objeto(linha)) if linha is not None else (500, {"erro": "não foi possível gravar"})
+
+
+def _removido(removido):
+    return (204, None) if removido is not None else (404, {"erro": "não encontrado"})
+
+
+# ===========================================================
+# Clientes e produtos
+# ===========================================================
+def listar_clientes(params, corpo):
+    if "busca" in params:
+        return 200, {"itens": _objetos(Cliente.pesquisar(params["busca"], _limite(params)))}
+    if "ids" in params:
+        return 200, {"itens": _objetos(Cliente.buscar_por_ids(_ids(params["ids"])).values())}
+    limite = _limite(params)
+    linhas = Cliente.listar_pagina(_inteiro(params.get("depois_de", 0), "depois_de", 0), limite)
+    return 200, _pagina(linhas, limite, "/clientes", "depois_de")
+
+
+def obter_cliente(params, corpo, cliente_id):
+    linha = Cliente.buscar_por_ids([cliente_id]).get(cliente_id)
+    return (200, _objeto(linha)) if linha is not None else (404, {"erro": "cliente não encontrado"})
+
+
+def criar_cliente(params, corpo):
+    return _gravado(_cliente(corpo).salvar(), 201)
+
+
+def alterar_cliente(params, corpo, cliente_id):
+    cliente = _cliente(corpo, id=cliente_id)
+    if not Cliente.buscar_por_ids([cliente.id]):
+        return 404, {"erro": "cliente não encontrado"}
+    return _gravado(cliente.salvar())
+
+
+def remover_cliente(params, corpo, cliente_id):
+    return _removido(Cliente.deletar(cliente_id))
+
+
+def listar_produtos(params, corpo):
+    if "ids" in params:
+        return 200, {"itens": _objetos(Produto.buscar_por_ids(_ids(params["ids"])).values())}
+    limite = _limite(params)
+    linhas = Produto.listar_pagina(_inteiro(params.get("depois_de", 0), "depois_de", 0), limite)
+    return 200, _pagina(linhas, limite, "/produtos", "depois_de")
+
+
+def obter_produto(params, corpo, produto_id):
+    linha = Produto.buscar_por_ids([produto_id]).get(produto_id)
+    return (200, _objeto(linha)) if linha is not None else (404, {"erro": "produto não encontrado"})
+
+
+def criar_produto(params, corpo):
+    return _gravado(_produto(corpo).salvar(), 201)
+
+
+def alterar_produto(params, corpo, produto_id):
+    produto = _produto(corpo, id=produto_id)
+    if not Produto.buscar_por_ids([produto.id]):
+        return 404, {"erro": "produto não encontrado"}
+    return _gravado(produto.salvar())
+
+
+def remover_produto(params, corpo, produto_id):
+    return _removido(Produto.deletar(produto_id))
+
+
+# ===========================================================
+# Pedidos e itens
+# ===========================================================
+def listar_pedidos(params, corpo):
+    if "cliente" in params:
+        return 200, {"itens": _objetos(Pedido.pesquisar_por_cliente(params["cliente"], _limite(params)))}
+    limite = _limite(params)
+    antes_de = _inteiro(params["antes_de"], "antes_de", 1) if "antes_de" in params else None
+    return 200, _pagina(Pedido.listar_pagina(antes_de=antes_de, limite=limite), limite, "/pedidos", "antes_de")
+
+
+def obter_pedido(params, corpo, pedido_id):
+    linha = Pedido.buscar_por_ids([pedido_id]).get(pedido_id)
+    if linha is None:
+        return 404, {"erro": "pedido não encontrado"}
+    return 200, dict(linha._asdict(), itens=_objetos(ItemPedido.listar_por_pedido(linha.id)))
+
+
+def criar_pedido(params, corpo):
+    id_cliente = _inteiro(corpo.get("id_cliente"), "id_cliente", 1)
+    data = _texto(corpo, "data", obrigatorio=True)
+    if not validar_data(data):
+        raise ValueError("data inválida (use YYYY-MM-DD)")
+    itens = corpo.get("itens")
+    if not isinstance(itens, list) or not itens or not all(isinstance(i, dict) for i in itens):
+        raise ValueError("itens deve ser uma lista não vazia de {produto_id, quantidade}")
+    itens = [_item(i) for i in itens]
+    _conferir_existentes(Cliente, [id_cliente], "cliente")
+    _conferir_existentes(Produto, list({p for p, _ in itens}), "produto")
+
+    pedido = Pedido(id_cliente, data)
+    if pedido.salvar_com_itens(itens) is None:
+        return 500, {"erro": "não foi possível gravar o pedido"}
+    return 201, pedido.como_linha()._asdict()
+
+
+def remover_pedido(params, corpo, pedido_id):
+    return _removido(Pedido.deletar(pedido_id))
+
+
+def listar_itens(params, corpo, pedido_id):
+    if not Pedido.buscar_por_ids([pedido_id]):
+        return 404, {"erro": "pedido não encontrado"}
+    return 200, {"itens": _objetos(ItemPedido.listar_por_pedido(pedido_id))}
+
+
+def criar_item(params, corpo, pedido_id):
+    produto_id, quantidade = _item(corpo)
+    if not Pedido.buscar_por_ids([pedido_id]):
+        return 404, {"erro": "pedido não encontrado"}
+    _conferir_existentes(Produto, [produto_id], "produto")
+    return _gravado(ItemPedido(pedido_id, produto_id, quantidade).salvar(), 201)
+
+
+def alterar_item(params, corpo, item_id):
+    pedido_id = _inteiro(corpo.get("pedido_id"), "pedido_id", 1)
+    produto_id, quantidade = _item(corpo)
+    _conferir_existentes(Pedido, [pedido_id], "pedido")
+    _conferir_existentes(Produto, [produto_id], "produto")
+    item = ItemPedido(pedido_id, produto_id, quantidade, id=item_id)
+    if not db.consultar("SELECT 1 FROM itens_pedido WHERE id=?", (item.id,)):
+        return 404, {"erro": "item não encontrado"}
+    return _gravado(item.salvar())
+
+
+def remover_item(params, corpo, item_id):
+    return _removido(ItemPedido.deletar(item_id))
+
+
+# (método, caminho, função): os grupos da expressão são passados à função depois de (params, corpo)
+ROTAS = [
+    ("GET", r"/clientes", listar_clientes),
+    ("POST", r"/clientes", criar_cliente),
+    ("GET", r"/clientes/(\d+)", obter_cliente),
+    ("PUT", r"/clientes/(\d+)", alterar_cliente),
+    ("DELETE", r"/clientes/(\d+)", remover_cliente),
+    ("GET", r"/produtos", listar_produtos),
+    ("POST", r"/produtos", criar_produto),
+    ("GET", r"/produtos/(\d+)", obter_produto),
+    ("PUT", r"/produtos/(\d+)", alterar_produto),
+    ("DELETE", r"/produtos/(\d+)", remover_produto),
+    ("GET", r"/pedidos", listar_pedidos),
+    ("POST", r"/pedidos", criar_pedido),
+    ("GET", r"/pedidos/(\d+)", obter_pedido),
+    ("DELETE", r"/pedidos/(\d+)", remover_pedido),
+    ("GET", r"/pedidos/(\d+)/itens", listar_itens),
+    ("POST", r"/pedidos/(\d+)/itens", criar_item),
+    ("PUT", r"/itens/(\d+)", alterar_item),
+    ("DELETE", r"/itens/(\d+)", remover_item),
+]
+_ROTAS = [(metodo, re.compile(caminho), funcao) for metodo, caminho, funcao in ROTAS]
+
+
+# ===========================================================
+# Servidor
+# ===========================================================
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive: o cliente reaproveita a conexão TCP
+    # cabeçalhos e corpo saem em duas escritas; com o algoritmo de Nagle, a segunda
+    # esperaria o ACK atrasado do cliente (~40 ms por resposta)
+    disable_nagle_algorithm = True
+    server_version = "GestaoAPI/1.0"
+    timeout = TEMPO_OCIOSO
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def do_DELETE(self):
+        self._atender("DELETE")
+
+    def _ler_corpo(self):
+        texto = (self.headers.get("Content-Length") or "0").strip()
+        # nos dois erros abaixo o corpo não é lido: a conexão não pode ser reaproveitada
+        if not (texto.isascii() and texto.isdigit()):
+            self.close_connection = True
+            raise ValueError("Content-Length inválido")
+        if len(texto) > len(str(MAX_CORPO)) or int(texto) > MAX_CORPO:
+            self.close_connection = True
+            raise ValueError(f"corpo maior que {MAX_CORPO} bytes")
+        tamanho = int(texto)
+        if not tamanho:
+            return {}
+        try:
+            corpo = json.loads(self.rfile.read(tamanho))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}") from None
+        if not isinstance(corpo, dict):
+            raise ValueError("o corpo deve ser um objeto JSON")
+        return corpo
+
+    def _atender(self, metodo):
+        url = urlsplit(self.path)
+        params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        try:
+            corpo = self._ler_corpo()
+            status, resposta = 404, {"erro": "rota não encontrada"}
+            for metodo_rota, padrao, funcao in _ROTAS:
+                encontrado = padrao.fullmatch(url.path.rstrip("/") or "/")
+                if encontrado is None:
+                    continue
+                if metodo_rota == metodo:
+                    ids = [_id_do_caminho(g) for g in encontrado.groups()]
+                    if None in ids:
+                        status, resposta = 404, {"erro": "não encontrado"}
+                    else:
+                        status, resposta = funcao(params, corpo, *ids)
+                    break
+                status, resposta = 405, {"erro": f"método {metodo} não suportado em {url.path}"}
+        except ValueError as e:
+            status, resposta = 400, {"erro": str(e)}
+        except Exception as e:
+            print(f"❌ Erro ao atender {metodo} {self.path}: {e}")
+            status, resposta = 500, {"erro": "erro interno"}
+        self._responder(status, resposta)
+
+    def _responder(self, status, resposta):
+        dados = b"" if resposta is None else json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if dados:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        if self.server.registrar:
+            super().log_message(formato, *args)
+
+
+class ServidorAPI(ThreadingHTTPServer):
+    """ThreadingHTTPServer com um pool fixo de threads em vez de uma thread nova por conexão.
+
+    As threads do pool vivem enquanto o servidor roda, então cada uma abre a sua
+    conexão SQLite uma única vez. Cada conexão HTTP keep-alive ocupa uma thread até
+    ser fechada (ou ficar TEMPO_OCIOSO segundos parada): `threads` deve passar do
+    número de clientes ligados ao mesmo tempo.
+    """
+
+    # fila de conexões ainda não aceitas; com o padrão (5), vários caixas conectando
+    # juntos perdem o SYN e só tentam de novo depois de 1 s
+    request_queue_size = 128
+
+    def __init__(self, endereco, threads=THREADS, registrar=False):
+        super().__init__(endereco, _Handler)
+        self.registrar = registrar
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def servir(host="127.0.0.1", porta=PORTA, threads=THREADS, registrar=False):
+    """Inicializa o banco configurado e atende requisições até Ctrl+C. Retorna o código de saída."""
+    if not db.inicializar_banco():
+        return 1
+    with ServidorAPI((host, porta), threads, registrar) as servidor:
+        host, porta = servidor.server_address[:2]
+        print(f"🌐 API em http://{host}:{porta} ({threads} threads)", flush=True)
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--banco", default=db.DB_PATH, help="arquivo do banco (padrão: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 para aceitar outros computadores")
+    parser.add_argument("--porta", type=int, default=PORTA, help="0 escolhe uma porta livre")
+    parser.add_argument("--threads", type=int, default=THREADS)
+    parser.add_argument("--registrar", action="store_true", help="mostra cada requisição atendida")
+    args = parser.parse_args(argv)
+    db.configurar_banco(args.banco)
+    db.configurar_instrumentacao(ativa=False)
+    return servir(args.host, args.porta, args.threads, args.registrar)
+
+
+__all__ = ["ROTAS", "ServidorAPI", "servir"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
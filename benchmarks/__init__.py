@@ -0,0 +1,6 @@
+"""Benchmarks do sistema de gestão.
+
+Cada módulo pode ser executado isoladamente a partir da raiz do projeto, ex.:
+
+    python -m benchmarks.bench_conexao
+"""
@@ -0,0 +1,208 @@
+"""Teste de carga da API HTTP/JSON (api.py): requisições por segundo e latência p99.
+
+Copia o banco da escala pedida para um diretório temporário, sobe `python -m api`
+nele em outro processo (porta livre) e, para cada cenário, dispara requisições de
+`--clientes` threads durante `--segundos`, cada thread com a sua conexão HTTP
+keep-alive (como um caixa ligado à API):
+
+- GET /pedidos?limite=50: primeira página da lista de pedidos;
+- GET /pedidos/<id>: um pedido sorteado, com os itens;
+- GET /clientes?ids=...: 20 clientes sorteados de uma vez;
+- POST /pedidos: criação de um pedido com 3 itens (concorre pela escrita no SQLite).
+
+Antes da carga, confere que entradas inválidas (ids fora de 64 bits, números com
+parte decimal, Content-Length negativo) são recusadas com 4xx e não gravam nada.
+
+    python -m benchmarks.bench_api --escala 100k --clientes 8 --segundos 5
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+
+
+def _cenarios(n_clientes, n_produtos, n_pedidos):
+    def pagina(rng):
+        return "GET", "/pedidos?limite=50", None
+
+    def pedido(rng):
+        return "GET", f"/pedidos/{rng.randint(1, n_pedidos)}", None
+
+    def clientes(rng):
+        return "GET", "/clientes?ids=" + ",".join(str(rng.randint(1, n_clientes)) for _ in range(20)), None
+
+    def novo_pedido(rng):
+        corpo = {"id_cliente": rng.randint(1, n_clientes), "data": "2024-06-15",
+                 "itens": [{"produto_id": rng.randint(1, n_produtos), "quantidade": rng.randint(1, 5)}
+                           for _ in range(3)]}
+        return "POST", "/pedidos", corpo
+
+    return (
+        ("GET /pedidos (página de 50)", pagina, 200),
+        ("GET /pedidos/<id>", pedido, 200),
+        ("GET /clientes?ids= (20)", clientes, 200),
+        ("POST /pedidos (3 itens)", novo_pedido, 201),
+    )
+
+
+# (método, caminho, corpo, status esperado): entradas que a API deve recusar
+RECUSAS = (
+    ("GET", f"/clientes/{2 ** 63}", None, 404),
+    ("GET", "/clientes?depois_de=" + "9" * 25, None, 400),
+    ("GET", "/pedidos?limite=1.5", None, 400),
+    ("POST", "/produtos", {"nome": "Fracionado", "preco_centavos": 12.99}, 400),
+    ("POST", "/pedidos", {"id_cliente": 1, "data": "2024-06-15",
+                          "itens": [{"produto_id": 1, "quantidade": 2.9}]}, 400),
+    ("POST", "/pedidos", {"id_cliente": 1.0, "data": "2024-06-15",
+                          "itens": [{"produto_id": 1, "quantidade": 1}]}, 400),
+)
+
+
+def conferir_recusas(porta):
+    """Envia RECUSAS (e um Content-Length negativo) e retorna as que não tiveram o status esperado."""
+    falhas = []
+    for metodo, caminho, corpo, esperado in RECUSAS:
+        conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+        conexao.request(metodo, caminho, body=json.dumps(corpo).encode() if corpo is not None else None)
+        status = conexao.getresponse().status
+        conexao.close()
+        if status != esperado:
+            falhas.append(f"{metodo} {caminho} {corpo or ''}: {status} (esperado {esperado})")
+    # corpo negativo: rfile.read(-1) prenderia uma thread do servidor até o cliente fechar
+    with socket.create_connection(("127.0.0.1", porta), timeout=10) as s:
+        s.sendall(b"POST /clientes HTTP/1.1\r\nHost: api\r\nContent-Length: -5\r\n\r\n")
+        linha = s.recv(4096).split(b"\r\n", 1)[0].decode()
+    if " 400 " not in linha:
+        falhas.append(f"Content-Length negativo: {linha or 'sem resposta'} (esperado 400)")
+    return falhas
+
+
+def _percentil(ordenados, fracao):
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))]
+
+
+def carga(porta, gerar, esperado, n_threads, segundos, semente=42):
+    """Roda `gerar(rng) -> (método, caminho, corpo)` em `n_threads` threads por `segundos`.
+
+    Retorna (requisições/s, latências ordenadas em ms, erros).
+    """
+    latencias = []
+    erros = [0]
+    trava = threading.Lock()
+    barreira = threading.Barrier(n_threads + 1)
+    fim = [0.0]
+
+    def trabalhar(indice):
+        rng = random.Random(semente + indice)
+        conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=30)
+        minhas, meus_erros = [], 0
+        barreira.wait()
+        while time.perf_counter() < fim[0]:
+            metodo, caminho, corpo = gerar(rng)
+            dados = json.dumps(corpo).encode() if corpo is not None else None
+            cabecalhos = {"Content-Type": "application/json"} if dados else {}
+            inicio = time.perf_counter()
+            try:
+                conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+                resposta = conexao.getresponse()
+                resposta.read()
+                if resposta.status != esperado:
+                    meus_erros += 1
+            except (OSError, http.client.HTTPException):
+                meus_erros += 1
+                conexao.close()
+                conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=30)
+                continue
+            minhas.append((time.perf_counter() - inicio) * 1000)
+        conexao.close()
+        with trava:
+            latencias.extend(minhas)
+            erros[0] += meus_erros
+
+    threads = [threading.Thread(target=trabalhar, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    inicio = time.perf_counter()
+    fim[0] = inicio + segundos
+    barreira.wait()
+    for t in threads:
+        t.join()
+    decorrido = time.perf_counter() - inicio
+    latencias.sort()
+    return len(latencias) / decorrido, latencias, erros[0]
+
+
+def _subir_api(banco, threads):
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "api", "--banco", banco, "--porta", "0", "--threads", str(threads)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    for linha in processo.stdout:
+        if linha.startswith("🌐 API em"):
+            return processo, int(linha.split()[3].rsplit(":", 1)[1])
+    processo.wait()
+    raise RuntimeError(f"a API não iniciou (código {processo.returncode})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--clientes", type=int, default=8, help="threads cliente simultâneas")
+    parser.add_argument("--segundos", type=float, default=5.0, help="duração de cada cenário")
+    parser.add_argument("--threads", type=int, default=16, help="threads do servidor")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    origem = sqlite3.connect(preparar_banco(args.escala, args.dados, args.semente))
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = os.path.join(diretorio, "api.db")
+        copia = sqlite3.connect(banco)
+        origem.backup(copia)
+        origem.close()
+        n_clientes, n_produtos, n_pedidos = (copia.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                                             for t in ("clientes", "produtos", "pedidos"))
+        copia.close()
+
+        processo, porta = _subir_api(banco, args.threads)
+        try:
+            falhas = conferir_recusas(porta)
+            gravados = sqlite3.connect(banco).execute(
+                "SELECT COUNT(*) FROM produtos WHERE nome = 'Fracionado'").fetchone()[0]
+            if gravados:
+                falhas.append(f"{gravados} produto(s) com preço fracionado gravados")
+            for falha in falhas:
+                print(f"❌ {falha}")
+            if not falhas:
+                print(f"✅ {len(RECUSAS) + 1} entradas inválidas recusadas")
+            print(f"📊 {n_pedidos} pedidos · {args.clientes} clientes HTTP · {args.threads} threads no servidor")
+            print(f"{'cenário':<30}{'req/s':>10}{'p50 (ms)':>11}{'p99 (ms)':>11}{'máx (ms)':>11}{'erros':>8}")
+            for nome, gerar, esperado in _cenarios(n_clientes, n_produtos, n_pedidos):
+                rps, lat, erros = carga(porta, gerar, esperado, args.clientes, args.segundos, args.semente)
+                if not lat:
+                    print(f"{nome:<30}{'—':>10}{'':>33}{erros:>8}")
+                    continue
+                print(f"{nome:<30}{rps:>10.0f}{_percentil(lat, 0.50):>11.1f}{_percentil(lat, 0.99):>11.1f}"
+                      f"{lat[-1]:>11.1f}{erros:>8}")
+        finally:
+            processo.terminate()
+            processo.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
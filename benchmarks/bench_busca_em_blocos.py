@@ -0,0 +1,97 @@
+"""Resolução de vários ids: uma consulta por id (N+1) vs. tabela inteira vs. buscar_por_ids.
+
+Para `--ids` clientes sorteados no banco da escala pedida, monta {id: nome} de
+três formas e mostra o tempo de cada uma (cache de leitura invalidado antes de
+cada execução, como após uma gravação):
+
+- N+1: um SELECT ... WHERE id=? por cliente;
+- tabela inteira: Cliente.listar() e um dict em Python (o padrão antigo das views);
+- buscar_por_ids: Cliente.buscar_por_ids, com IN (...) em blocos de db.MAX_PARAMETROS.
+
+    python -m benchmarks.bench_busca_em_blocos --escala 1M --ids 200 5000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+from models import Cliente
+
+REPETICOES = 5
+
+
+def _um_por_id(ids):
+    nomes = {}
+    for cliente_id in ids:
+        linhas = db.consultar("SELECT id, nome FROM clientes WHERE id=?", (cliente_id,))
+        if linhas:
+            nomes[cliente_id] = linhas[0][1]
+    return nomes
+
+
+def _tabela_inteira(ids):
+    todos = {c.id: c.nome for c in Cliente.listar()}
+    return {i: todos[i] for i in ids if i in todos}
+
+
+def _em_blocos(ids):
+    return {i: c.nome for i, c in Cliente.buscar_por_ids(ids).items()}
+
+
+CENARIOS = (
+    ("N+1 (um SELECT por id)", _um_por_id),
+    ("tabela inteira (listar)", _tabela_inteira),
+    ("buscar_por_ids (IN em blocos)", _em_blocos),
+)
+
+
+def _mediana_ms(funcao, ids):
+    tempos = []
+    for _ in range(REPETICOES):
+        db.invalidar("clientes")
+        inicio = time.perf_counter()
+        resultado = funcao(ids)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return resultado, statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--ids", type=int, nargs="+", default=[200, 5000], help="quantidades de ids resolvidos")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    db.configurar_banco(preparar_banco(args.escala, args.dados, args.semente))
+    db.configurar_instrumentacao(ativa=False)
+    n_clientes = db.consultar("SELECT COUNT(*) FROM clientes")[0][0]
+    rng = random.Random(args.semente)
+    print(f"📊 {n_clientes} clientes")
+    print(f"{'cenário':<34}{'ids':>8}{'mediana (ms)':>14}")
+    for quantidade in args.ids:
+        ids = rng.sample(range(1, n_clientes + 1), min(quantidade, n_clientes))
+        esperado = None
+        for nome, funcao in CENARIOS:
+            resultado, ms = _mediana_ms(funcao, ids)
+            if esperado is None:
+                esperado = resultado
+            elif resultado != esperado:
+                print(f"❌ {nome} retornou um resultado diferente")
+            print(f"{nome:<34}{len(ids):>8}{ms:>14.2f}")
+    db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
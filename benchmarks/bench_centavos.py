@@ -0,0 +1,83 @@
+"""Agregações de valores monetários: REAL em reais vs. INTEGER em centavos.
+
+Grava os mesmos valores aleatórios (com centavos) em duas colunas, uma REAL em
+reais (o formato antigo de pedidos.total) e uma INTEGER em centavos, e compara
+o tempo de SUM/AVG e a exatidão de cada uma contra a soma exata feita em Python.
+
+    python -m benchmarks.bench_centavos --linhas 5000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+REPETICOES = 5
+
+CONSULTAS = (
+    ("SUM REAL (reais)", "SELECT SUM(total) FROM valores_reais"),
+    ("SUM INTEGER (centavos)", "SELECT SUM(total_centavos) FROM valores_centavos"),
+    ("AVG REAL (reais)", "SELECT AVG(total) FROM valores_reais"),
+    ("média inteira (centavos)",
+     "SELECT (2 * SUM(total_centavos) + COUNT(*)) / (2 * COUNT(*)) FROM valores_centavos"),
+)
+
+
+def preparar(caminho, n_linhas, semente=42):
+    """Cria as duas tabelas com os mesmos valores e retorna a soma exata em centavos."""
+    rng = random.Random(semente)
+    centavos = [rng.randint(1, 500_000) for _ in range(n_linhas)]
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE valores_reais (id INTEGER PRIMARY KEY, total REAL)")
+    conn.execute("CREATE TABLE valores_centavos (id INTEGER PRIMARY KEY, total_centavos INTEGER)")
+    # o valor em reais é o que o código antigo gravava: um float com duas casas
+    conn.executemany("INSERT INTO valores_reais (total) VALUES (?)", ((round(c / 100, 2),) for c in centavos))
+    conn.executemany("INSERT INTO valores_centavos (total_centavos) VALUES (?)", ((c,) for c in centavos))
+    conn.commit()
+    conn.close()
+    return sum(centavos)
+
+
+def medir(conn, sql):
+    """Retorna (resultado, mediana em ms) de REPETICOES execuções de `sql`."""
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = conn.execute(sql).fetchone()[0]
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return resultado, statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "centavos.db")
+        print(f"⏳ Gravando {args.linhas} valores...")
+        soma_exata = preparar(caminho, args.linhas)
+        n = args.linhas
+        media_exata = (2 * soma_exata + n) // (2 * n)   # arredondada para o centavo mais próximo
+        # AVG REAL não arredonda: é comparado com a média exata sem arredondamento
+        esperado = {"SUM": soma_exata, "AVG": Fraction(soma_exata, n), "méd": media_exata}
+
+        conn = sqlite3.connect(caminho)
+        conn.execute("SELECT COUNT(*) FROM valores_reais").fetchone()  # aquece o cache de páginas
+        conn.execute("SELECT COUNT(*) FROM valores_centavos").fetchone()
+        print(f"{'agregação':<28}{'mediana (ms)':>14}{'resultado':>22}{'erro (centavos)':>18}")
+        for nome, sql in CONSULTAS:
+            resultado, ms = medir(conn, sql)
+            em_centavos = resultado * 100 if "REAL" in nome else resultado
+            erro = float(Fraction(em_centavos) - esperado[nome[:3]])
+            print(f"{nome:<28}{ms:>14.1f}{resultado!r:>22}{erro:>18.6f}")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Partida da linha de comando (cli.py): tempo até o comando rodar e ausência do tkinter.
+
+Executa várias vezes, em processos novos, `python -c pass` (a partida do próprio
+interpretador) e `python -m cli --banco <vazio> verificar` (partida, importações,
+argumentos e um comando barato), e compara o acréscimo da CLI, na mediana, com
+ORCAMENTO_MS. Também confere que nenhum módulo usado pelos comandos importa
+tkinter. Sai com código 1 se o orçamento for estourado ou se o tkinter aparecer.
+
+    python -m benchmarks.bench_cli --repeticoes 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# acréscimo máximo da CLI sobre a partida do interpretador (mediana, em ms)
+ORCAMENTO_MS = 100
+
+# importa os módulos de todos os comandos e informa se algum deles trouxe o tkinter
+VERIFICAR_TKINTER = (
+    "import sys, cli, api, importacao, exportacao, relatorios; "
+    "print(sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter')))"
+)
+
+
+def _mediana_ms(comando, repeticoes, diretorio):
+    tempos = []
+    # a primeira execução aquece o cache de disco e os .pyc; fica fora da estatística
+    for i in range(repeticoes + 1):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=diretorio, env=dict(os.environ, PYTHONPATH=ROOT), check=True,
+                       stdout=subprocess.DEVNULL)
+        if i:
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = os.path.join(diretorio, "cli.db")
+        subprocess.run([sys.executable, "-m", "cli", "--banco", banco, "inicializar"], cwd=diretorio,
+                       env=dict(os.environ, PYTHONPATH=ROOT), check=True, stdout=subprocess.DEVNULL)
+        interpretador = _mediana_ms([sys.executable, "-c", "pass"], args.repeticoes, diretorio)
+        cli = _mediana_ms([sys.executable, "-m", "cli", "--banco", banco, "verificar"], args.repeticoes, diretorio)
+        tkinter = subprocess.run([sys.executable, "-c", VERIFICAR_TKINTER], cwd=diretorio, capture_output=True,
+                                 text=True, env=dict(os.environ, PYTHONPATH=ROOT), check=True).stdout.strip()
+
+    acrescimo = cli - interpretador
+    print(f"{'partida (mediana)':<36}{'ms':>10}")
+    print(f"{'python -c pass':<36}{interpretador:>10.1f}")
+    print(f"{'python -m cli verificar':<36}{cli:>10.1f}")
+    print(f"{'acréscimo da CLI':<36}{acrescimo:>10.1f}   (orçamento: {ORCAMENTO_MS} ms)")
+    print(f"módulos tkinter importados: {tkinter}")
+    ok = acrescimo <= ORCAMENTO_MS and tkinter == "[]"
+    print("✅ Dentro do orçamento e sem tkinter." if ok else "❌ Orçamento estourado ou tkinter importado.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Compara o custo por consulta de abrir uma conexão a cada chamada (modelo antigo)
+com a conexão persistente e configurada de db.py."""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+
+
+def _consultar_antigo(caminho, query, parametros=()):
+    """Reproduz o db.consultar original: abre, consulta e fecha a cada chamada."""
+    conn = sqlite3.connect(caminho)
+    try:
+        return conn.execute(query, parametros).fetchall()
+    finally:
+        conn.close()
+
+
+def _executar_antigo(caminho, query, parametros=()):
+    """Reproduz o db.executar_query original: abre, executa, commita e fecha."""
+    conn = sqlite3.connect(caminho)
+    try:
+        conn.execute(query, parametros)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        funcao(i)
+    return (time.perf_counter() - inicio) / repeticoes * 1e6  # µs por chamada
+
+
+def main(repeticoes=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = os.path.join(tmp, "bench.db")
+        db.configurar_banco(caminho)
+        db.inicializar_banco()
+        db.executar_query("INSERT INTO clientes (nome, email, telefone) VALUES (?, ?, ?)",
+                          ("Cliente Bench", "bench@exemplo.com", "(11) 99999-9999"))
+
+        sel = "SELECT * FROM clientes WHERE id=?"
+        ins = "INSERT INTO produtos (nome, preco_centavos) VALUES (?, ?)"
+
+        resultados = {
+            "consultar (antes)": _medir(lambda i: _consultar_antigo(caminho, sel, (1,)), repeticoes),
+            "consultar (depois)": _medir(lambda i: db.consultar(sel, (1,)), repeticoes),
+            "executar_query (antes)": _medir(lambda i: _executar_antigo(caminho, ins, (f"p{i}", 1.0)), repeticoes),
+            "executar_query (depois)": _medir(lambda i: db.executar_query(ins, (f"p{i}", 1.0)), repeticoes),
+        }
+
+        def _pedido_com_itens(i):
+            with db.transacao() as conn:
+                conn.execute("INSERT INTO pedidos (id_cliente, data, total_centavos) VALUES (1, '2024-01-01', 0)")
+                for _ in range(20):
+                    conn.execute("INSERT INTO itens_pedido (pedido_id, produto_id, quantidade) VALUES (1, 1, 1)")
+
+        resultados["pedido com 20 itens em transacao()"] = _medir(_pedido_com_itens, repeticoes // 10)
+        db.fechar_conexao()
+
+    print(f"{'operação':<40}{'µs/chamada':>14}")
+    for nome, us in resultados.items():
+        print(f"{nome:<40}{us:>14.1f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
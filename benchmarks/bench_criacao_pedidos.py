@@ -0,0 +1,74 @@
+"""Vazão de criação de pedidos: fluxo antigo do modal x Pedido.salvar_com_itens.
+
+O fluxo antigo grava o pedido, relê a tabela inteira para descobrir o id e grava
+cada item com um commit próprio; o novo grava cabeçalho e itens em uma transação,
+usando lastrowid e executemany.
+
+    python -m benchmarks.bench_criacao_pedidos [--pedidos N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from models import Pedido, ItemPedido
+
+ITENS_POR_PEDIDO = 20
+
+
+def _fluxo_antigo(itens):
+    pedido = Pedido(1, "2024-05-10")
+    pedido.salvar()
+    novo_id = Pedido.listar()[-1][0]
+    for produto_id, qtd in itens:
+        ItemPedido(novo_id, produto_id, qtd).salvar()
+
+
+def _fluxo_novo(itens):
+    Pedido(1, "2024-05-10").salvar_com_itens(itens)
+
+
+def _vazao(funcao, n_pedidos):
+    itens = [(1 + i % 10, 1 + i % 3) for i in range(ITENS_POR_PEDIDO)]
+    inicio = time.perf_counter()
+    for _ in range(n_pedidos):
+        funcao(itens)
+    return n_pedidos / (time.perf_counter() - inicio)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pedidos", type=int, default=50_000, help="pedidos já gravados antes da medição")
+    pedidos_existentes = parser.parse_args(argv).pedidos
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configurar_banco(os.path.join(tmp, "criacao.db"))
+        db.inicializar_banco()
+        with db.transacao() as conn:
+            conn.execute("INSERT INTO clientes (nome, email, telefone) VALUES ('Cliente', '', '')")
+            conn.executemany("INSERT INTO produtos (nome, preco_centavos) VALUES (?, ?)",
+                             ((f"Produto {i}", 500) for i in range(10)))
+            conn.executemany("INSERT INTO pedidos (id_cliente, data, total_centavos) VALUES (1, '2024-01-01', 1000)",
+                             (() for _ in range(pedidos_existentes)))
+
+        resultados = {
+            "fluxo antigo (salvar + listar + item a item)": _vazao(_fluxo_antigo, 50),
+            "salvar_com_itens (transação única)": _vazao(_fluxo_novo, 2000),
+        }
+        db.fechar_conexao()
+
+    print(f"{pedidos_existentes} pedidos pré-existentes, {ITENS_POR_PEDIDO} itens por pedido")
+    print(f"{'operação':<48}{'pedidos/s':>12}")
+    for nome, vazao in resultados.items():
+        print(f"{nome:<48}{vazao:>12.0f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Custo da checagem de alterações do dashboard (db.versao_dados) vs. refazer as consultas.
+
+No banco da escala pedida, mede a mediana de tempo de:
+
+- db.versao_dados(): o que o timer do dashboard faz a cada checagem com o banco parado;
+- consultar_metricas() + consultar_vendas_mensais(24): o que uma atualização refaz.
+
+Mostra também a fração de CPU gasta pelo timer no intervalo do dashboard e confere
+que a versão muda com um COMMIT de outra conexão e com uma escrita da própria thread.
+
+    python -m benchmarks.bench_data_version --escala 1M
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+from views.dashboard_view import DashboardView, consultar_metricas, consultar_vendas_mensais
+
+REPETICOES = 2000
+
+
+def _atualizacao():
+    consultar_metricas()
+    consultar_vendas_mensais(24)
+
+
+def medir(funcao, repeticoes):
+    """Retorna a mediana em microssegundos de `repeticoes` execuções de `funcao`."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    origem = sqlite3.connect(preparar_banco(args.escala, args.dados, args.semente))
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "data_version.db")
+        copia = sqlite3.connect(caminho)
+        origem.backup(copia)
+        origem.close()
+        copia.close()
+        db.configurar_banco(caminho)
+        db.inicializar_banco()
+
+        checagem = medir(db.versao_dados, REPETICOES)
+        atualizacao = medir(_atualizacao, 50)
+        intervalo_s = DashboardView.INTERVALO_VERIFICACAO_MS / 1000
+        print(f"checagem (db.versao_dados):      {checagem:10.1f} µs "
+              f"-> {checagem / 1e6 / intervalo_s:.5%} de CPU a cada {intervalo_s:g} s com o banco parado")
+        print(f"atualização (métricas + série):  {atualizacao:10.1f} µs "
+              f"({atualizacao / checagem:.0f}x a checagem)")
+
+        # a versão muda com commits de outra conexão e com escritas da própria thread
+        antes = db.versao_dados()
+        externa = sqlite3.connect(caminho)
+        externa.execute("UPDATE clientes SET nome = nome WHERE id = 1")
+        externa.commit()
+        externa.close()
+        depois_externa = db.versao_dados()
+        db.executar_comando("UPDATE clientes SET nome = nome WHERE id = 1")
+        depois_propria = db.versao_dados()
+        ok = antes != depois_externa != depois_propria and db.versao_dados() == depois_propria
+        print(f"detecção: outra conexão {antes} -> {depois_externa}, própria thread -> {depois_propria}, "
+              f"parado -> {db.versao_dados()} {'✅' if ok else '❌'}")
+        db.fechar_conexao()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
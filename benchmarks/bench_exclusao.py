@@ -0,0 +1,65 @@
+"""Exclusão de pedidos: um por vez (Pedido.deletar) vs. em massa (Pedido.deletar_varios).
+
+Copia o banco da escala pedida para um diretório temporário, exclui `--pedidos`
+pedidos de cada forma e mostra o tempo, pedidos/s e quantos itens órfãos
+restaram (deve ser 0: o gatilho pedidos_itens_ad remove os itens junto).
+
+    python -m benchmarks.bench_exclusao --escala 100k --pedidos 5000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+from models import Pedido
+
+ORFAOS = "SELECT COUNT(*) FROM itens_pedido WHERE NOT EXISTS (SELECT 1 FROM pedidos WHERE id = itens_pedido.pedido_id)"
+
+
+def _um_por_vez(ids):
+    for pedido_id in ids:
+        Pedido.deletar(pedido_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--pedidos", type=int, default=5000, help="pedidos excluídos em cada cenário")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    origem = sqlite3.connect(preparar_banco(args.escala, args.dados, args.semente))
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "exclusao.db")
+        copia = sqlite3.connect(caminho)
+        origem.backup(copia)
+        origem.close()
+        copia.close()
+
+        db.configurar_banco(caminho)
+        n = args.pedidos
+        ids = [r[0] for r in db.consultar("SELECT id FROM pedidos ORDER BY id LIMIT ?", (2 * n,))]
+        print(f"{'exclusão de ' + str(n) + ' pedidos':<30}{'ms':>10}{'pedidos/s':>12}{'itens órfãos':>14}")
+        for nome, funcao, lote in (("um por vez (Pedido.deletar)", _um_por_vez, ids[:n]),
+                                   ("em massa (deletar_varios)", Pedido.deletar_varios, ids[n:])):
+            inicio = time.perf_counter()
+            funcao(lote)
+            segundos = time.perf_counter() - inicio
+            orfaos = db.consultar(ORFAOS)[0][0]
+            print(f"{nome:<30}{segundos * 1000:>10.0f}{len(lote) / segundos:>12.0f}{orfaos:>14}")
+        db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
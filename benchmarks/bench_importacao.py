@@ -0,0 +1,89 @@
+"""Velocidade da importação de CSV (importacao.py) em um banco novo.
+
+Gera arquivos CSV sintéticos (com ~1% de linhas inválidas) para clientes,
+produtos e pedidos, importa cada um em um banco vazio e mostra linhas/s e o
+total de linhas rejeitadas.
+
+    python -m benchmarks.bench_importacao --linhas 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+import importacao
+from benchmarks.gerador import DOMINIOS, NOMES, PRODUTOS, SOBRENOMES, VARIACOES
+
+
+def gerar_csvs(diretorio, n_linhas, semente=42):
+    """Grava clientes.csv, produtos.csv e pedidos.csv e retorna os caminhos."""
+    rng = random.Random(semente)
+    n_clientes = n_linhas
+    n_produtos = max(n_linhas // 50, 50)
+    caminhos = {nome: os.path.join(diretorio, f"{nome}.csv") for nome in ("clientes", "produtos", "pedidos")}
+
+    with open(caminhos["clientes"], "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["nome", "email", "telefone"])
+        for i in range(n_clientes):
+            nome, sobrenome = rng.choice(NOMES), rng.choice(SOBRENOMES)
+            email = f"{nome.lower()}.{sobrenome.lower()}{i}@{rng.choice(DOMINIOS)}"
+            if rng.random() < 0.01:
+                email = email.replace("@", " ")
+            w.writerow([f"{nome} {sobrenome}", email, f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"])
+
+    with open(caminhos["produtos"], "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["nome", "preco_unit"])
+        for i in range(n_produtos):
+            preco = f"{rng.lognormvariate(2.5, 0.8):.2f}".replace(".", ",")
+            w.writerow([f"{rng.choice(PRODUTOS)} {rng.choice(VARIACOES)} {i + 1}", preco if rng.random() > 0.01 else "?"])
+
+    with open(caminhos["pedidos"], "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["pedido", "id_cliente", "data", "produto_id", "quantidade"])
+        linhas = pedido = 0
+        while linhas < n_linhas:
+            pedido += 1
+            id_cliente = rng.randint(1, int(n_clientes * 1.01))  # ~1% de clientes inexistentes
+            data = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            for _ in range(rng.randint(1, 5)):
+                w.writerow([f"P{pedido}", id_cliente, data, rng.randint(1, int(n_produtos * 0.98)), rng.randint(1, 10)])
+                linhas += 1
+    return caminhos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=100_000, help="linhas de clientes e de itens de pedidos")
+    parser.add_argument("--lote", type=int, default=importacao.LOTE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        print(f"⏳ Gerando CSVs com {args.linhas} linhas...")
+        caminhos = gerar_csvs(diretorio, args.linhas)
+        db.configurar_banco(os.path.join(diretorio, "importacao.db"))
+        db.inicializar_banco()
+        print(f"{'arquivo':<12}{'linhas':>10}{'importadas':>12}{'rejeitadas':>12}{'segundos':>10}{'linhas/s':>12}")
+        for nome, funcao in (("clientes", importacao.importar_clientes),
+                             ("produtos", importacao.importar_produtos),
+                             ("pedidos", importacao.importar_pedidos)):
+            inicio = time.perf_counter()
+            r = funcao(caminhos[nome], lote=args.lote)
+            segundos = time.perf_counter() - inicio
+            print(f"{nome:<12}{r['lidas']:>10}{r['importadas']:>12}{r['rejeitadas']:>12}"
+                  f"{segundos:>10.2f}{r['lidas'] / segundos:>12.0f}")
+        db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
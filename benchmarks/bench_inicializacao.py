@@ -0,0 +1,85 @@
+"""Tempo de inicialização da aplicação: início do processo → primeira pintura da janela.
+
+Executa `python main.py` várias vezes em um diretório com o banco da escala
+pedida (copiado como banco_dados.db) e com GESTAO_MEDIR_INICIO=1, que faz o
+main.py imprimir o instante da primeira pintura e encerrar. O tempo medido
+inclui a partida do interpretador, as importações e a montagem da janela.
+
+    python -m benchmarks.bench_inicializacao --escala 100k --repeticoes 5
+
+Precisa de um display (no Linux sem interface gráfica, use xvfb-run).
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+
+MARCADOR = "PRIMEIRA_PINTURA"
+
+
+def medir_uma_vez(diretorio):
+    """Retorna os segundos entre o início do processo e a primeira pintura (ou None se falhar)."""
+    ambiente = dict(os.environ, GESTAO_MEDIR_INICIO="1")
+    inicio = time.time()
+    processo = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "main.py")],
+        cwd=diretorio, env=ambiente, capture_output=True, text=True, timeout=120,
+    )
+    for linha in processo.stdout.splitlines():
+        if linha.startswith(MARCADOR):
+            return float(linha.split()[1]) - inicio
+    print(f"❌ main.py não chegou a pintar a janela (código {processo.returncode}):")
+    print(processo.stderr.strip()[-2000:])
+    return None
+
+
+def executar(escala, repeticoes, dados, semente=42):
+    with tempfile.TemporaryDirectory() as diretorio:
+        destino = os.path.join(diretorio, "banco_dados.db")
+        if escala:
+            origem = sqlite3.connect(preparar_banco(escala, dados, semente))
+            copia = sqlite3.connect(destino)
+            origem.backup(copia)
+            origem.close()
+            copia.close()
+        tempos = []
+        # a primeira execução aquece o cache de disco e os .pyc; fica fora da estatística
+        for i in range(repeticoes + 1):
+            segundos = medir_uma_vez(diretorio)
+            if segundos is None:
+                return None
+            if i:
+                tempos.append(segundos * 1000)
+    tempos.sort()
+    return {"min_ms": tempos[0], "mediana_ms": statistics.median(tempos), "max_ms": tempos[-1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), help="padrão: banco vazio")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    r = executar(args.escala, args.repeticoes, args.dados, args.semente)
+    if r is None:
+        return 1
+    print(f"banco {args.escala or 'vazio'}: início → primeira pintura "
+          f"mín {r['min_ms']:.0f} ms · mediana {r['mediana_ms']:.0f} ms · máx {r['max_ms']:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
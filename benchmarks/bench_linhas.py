@@ -0,0 +1,75 @@
+"""Memória por linha: tuplas de fetchall vs. linhas nomeadas vs. leitura em lotes.
+
+Lê todos os pedidos do banco da escala pedida de três formas e mede, com
+tracemalloc, o pico de memória alocada durante a leitura e o tempo total:
+
+- consultar() sem tipo: lista de tuplas (o formato antigo);
+- Pedido.listar(): lista de LinhaPedido (namedtuple via row factory);
+- Pedido.iterar(): gerador em lotes de db.TAMANHO_LOTE, só somando os totais.
+
+    python -m benchmarks.bench_linhas --escala 100k
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+from models import Pedido
+
+
+def _tuplas():
+    return db.consultar("SELECT id, id_cliente, data, total_centavos, qtd_itens FROM pedidos")
+
+
+def _em_lotes():
+    return sum(p.total_centavos for p in Pedido.iterar())
+
+
+CENARIOS = (
+    ("tuplas (fetchall)", _tuplas),
+    ("LinhaPedido (fetchall)", Pedido.listar),
+    ("LinhaPedido (em lotes)", _em_lotes),
+)
+
+
+def medir(funcao):
+    """Retorna (pico de memória em bytes, segundos) de uma execução de `funcao`."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return pico, segundos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    db.configurar_banco(preparar_banco(args.escala, args.dados, args.semente))
+    n = ESCALAS[args.escala]
+    _tuplas()  # aquece o cache de páginas do SQLite
+    print(f"{'leitura de ' + str(n) + ' pedidos':<28}{'pico (MB)':>12}{'bytes/linha':>14}{'tempo (ms)':>13}")
+    for nome, funcao in CENARIOS:
+        pico, segundos = medir(funcao)
+        print(f"{nome:<28}{pico / 1e6:>12.1f}{pico / n:>14.1f}{segundos * 1000:>13.0f}")
+    db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Benchmark da camada de modelos e das consultas do dashboard.
+
+Gera (ou reaproveita) um banco sintético na escala pedida, mede cada método
+público de models.py e consultar_metricas do dashboard, e grava os resultados em
+JSON para que execuções diferentes possam ser comparadas.
+
+    python -m benchmarks.bench_models --escala 100k --saida resultados.json
+    python -m benchmarks.bench_models --escala 100k --comparar resultados.json
+
+Os bancos gerados ficam em --dados (padrão: diretório temporário do sistema) e são
+reutilizados nas execuções seguintes da mesma escala e semente.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.gerador import ESCALAS, dimensoes, gerar_banco
+from models import Cliente, Pedido, ItemPedido, Produto
+from views.dashboard_view import consultar_metricas
+
+TEMPO_POR_OPERACAO = 1.0  # segundos de medição por operação (após a primeira execução)
+MIN_REPETICOES = 3
+MAX_REPETICOES = 200
+
+
+def _operacoes(n_pedidos):
+    """Retorna [(nome, função)]: leituras primeiro, depois as gravações."""
+    n_clientes, n_produtos = dimensoes(n_pedidos)
+    meio = n_pedidos // 2
+    criados = {"cliente": [], "produto": [], "pedido": [], "item": []}
+
+    def novo_cliente():
+        linha = Cliente("Cliente Benchmark", "bench@exemplo.com", "(11) 99999-0000").salvar()
+        criados["cliente"].append(linha[0])
+        return linha
+
+    def novo_produto():
+        linha = Produto("Produto Benchmark", 990).salvar()
+        criados["produto"].append(linha[0])
+        return linha
+
+    def novo_pedido():
+        linha = Pedido(1, "2024-01-01").salvar()
+        criados["pedido"].append(linha[0])
+        return linha
+
+    def novo_pedido_com_itens():
+        novo_id = Pedido(1, "2024-01-01").salvar_com_itens([(1, 1), (2, 2), (3, 3)])
+        criados["pedido"].append(novo_id)
+        return novo_id
+
+    def novo_item():
+        linha = ItemPedido(meio, 1, 1).salvar()
+        criados["item"].append(linha[0])
+        return linha
+
+    def remover(tipo, funcao):
+        def _remover():
+            return funcao(criados[tipo].pop()) if criados[tipo] else None
+        return _remover
+
+    return [
+        # leituras
+        ("Cliente.listar", Cliente.listar),
+        ("Cliente.listar (sem cache)", lambda: (db.invalidar("clientes"), Cliente.listar())[1]),
+        ("Cliente.pesquisar_por_email", lambda: Cliente.pesquisar_por_email("silva1234")),
+        ("Cliente.pesquisar", lambda: Cliente.pesquisar("silva1234")),
+        ("Produto.listar", Produto.listar),
+        ("Produto.listar (sem cache)", lambda: (db.invalidar("produtos"), Produto.listar())[1]),
+        ("Pedido.listar", Pedido.listar),
+        ("Pedido.listar_pagina (primeira)", lambda: Pedido.listar_pagina()),
+        ("Pedido.listar_pagina (meio)", lambda: Pedido.listar_pagina(antes_de=meio)),
+        ("Pedido.pesquisar_por_cliente", lambda: Pedido.pesquisar_por_cliente("Paula Lima")),
+        ("ItemPedido.listar_por_pedido", lambda: ItemPedido.listar_por_pedido(meio)),
+        ("dashboard.consultar_metricas", consultar_metricas),
+        # gravações
+        ("Cliente.salvar (insert)", novo_cliente),
+        ("Cliente.salvar (update)", lambda: Cliente("Cliente Alterado", "alt@exemplo.com", "", id=n_clientes // 2).salvar()),
+        ("Cliente.deletar", remover("cliente", Cliente.deletar)),
+        ("Produto.salvar (insert)", novo_produto),
+        ("Produto.salvar (update)", lambda: Produto("Produto Alterado", 100, id=n_produtos // 2).salvar()),
+        ("Produto.deletar", remover("produto", Produto.deletar)),
+        ("Pedido.salvar (insert)", novo_pedido),
+        ("Pedido.salvar_com_itens", novo_pedido_com_itens),
+        ("Pedido.deletar", remover("pedido", Pedido.deletar)),
+        ("ItemPedido.salvar (insert)", novo_item),
+        ("ItemPedido.deletar", remover("item", ItemPedido.deletar)),
+    ]
+
+
+def medir(funcao):
+    """Executa `funcao` repetidamente e retorna as estatísticas em milissegundos."""
+    tempos = []
+    resultado = None
+    limite = time.perf_counter() + TEMPO_POR_OPERACAO
+    while len(tempos) < MIN_REPETICOES or (time.perf_counter() < limite and len(tempos) < MAX_REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    linhas = len(resultado) if isinstance(resultado, list) else None
+    return {
+        "repeticoes": len(tempos),
+        "min_ms": round(tempos[0], 4),
+        "mediana_ms": round(statistics.median(tempos), 4),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 4),
+        "linhas": linhas,
+    }
+
+
+def preparar_banco(escala, diretorio, semente=42):
+    """Retorna o caminho do banco da escala, gerando-o se ainda não existir."""
+    caminho = os.path.join(diretorio, f"bench_{escala}_s{semente}.db")
+    if not os.path.exists(caminho):
+        print(f"⏳ Gerando banco {escala} em {caminho}...")
+        inicio = time.perf_counter()
+        gerar_banco(caminho, ESCALAS[escala], semente)
+        db.fechar_conexao()
+        print(f"   gerado em {time.perf_counter() - inicio:.1f}s")
+    return caminho
+
+
+def executar(escala, diretorio, semente=42):
+    caminho = preparar_banco(escala, diretorio, semente)
+    # as gravações do benchmark são feitas em uma cópia, preservando o banco gerado
+    copia = caminho + ".exec"
+    origem = sqlite3.connect(caminho)
+    destino = sqlite3.connect(copia)
+    origem.backup(destino)
+    origem.close()
+    destino.close()
+
+    db.configurar_banco(copia)
+    db.inicializar_banco()
+    resultados = {}
+    try:
+        for nome, funcao in _operacoes(ESCALAS[escala]):
+            resultados[nome] = medir(funcao)
+            print(f"{nome:<36}{resultados[nome]['mediana_ms']:>12.3f} ms")
+    finally:
+        db.fechar_conexao()
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(copia + sufixo):
+                os.remove(copia + sufixo)
+
+    return {
+        "escala": escala,
+        "pedidos": ESCALAS[escala],
+        "semente": semente,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(atual, anterior):
+    """Imprime a razão entre as medianas de duas execuções (atual / anterior)."""
+    print(f"\n{'operação':<36}{'antes':>12}{'agora':>12}{'razão':>9}")
+    for nome, r in atual["resultados"].items():
+        antes = anterior.get("resultados", {}).get(nome)
+        if not antes:
+            continue
+        razao = r["mediana_ms"] / antes["mediana_ms"] if antes["mediana_ms"] else float("inf")
+        print(f"{nome:<36}{antes['mediana_ms']:>12.3f}{r['mediana_ms']:>12.3f}{razao:>8.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="1k")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    parser.add_argument("--saida", help="arquivo JSON de resultados (padrão: stdout)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    relatorio = executar(args.escala, args.dados, args.semente)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto)
+        print(f"✅ Resultados gravados em {args.saida}")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(relatorio, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
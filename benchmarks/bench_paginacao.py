@@ -0,0 +1,82 @@
+"""Tempo até a primeira linha da lista de pedidos: carga completa x paginação por chave.
+
+Mede a parte de dados de PedidosView (o que roda no executor antes de a primeira
+linha poder ser inserida no Treeview) sobre um banco sintético.
+
+    python -m benchmarks.bench_paginacao [--pedidos N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from models import Cliente, Pedido
+from utils import formatar_centavos
+from views.pedidos_view import PedidosView
+
+
+def _popular(n_pedidos, n_clientes=1000, semente=42):
+    rng = random.Random(semente)
+    with db.transacao() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nome, email, telefone) VALUES (?, ?, ?)",
+            ((f"Cliente {i}", f"cliente{i}@exemplo.com", "(11) 99999-9999") for i in range(n_clientes)),
+        )
+        conn.executemany(
+            "INSERT INTO pedidos (id_cliente, data, total_centavos) VALUES (?, ?, ?)",
+            ((rng.randint(1, n_clientes), f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+              rng.randint(500, 50000)) for _ in range(n_pedidos)),
+        )
+
+
+def _carga_completa():
+    """Reproduz a listagem original: todos os pedidos e todos os clientes, unidos em Python."""
+    clientes = {c[0]: c[1] for c in Cliente.listar()}
+    return [(p[0], clientes.get(p[1], "Desconhecido"), p[2], formatar_centavos(p[3])) for p in Pedido.listar()]
+
+
+def _medir(funcao, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000  # ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pedidos", type=int, default=500_000, help="pedidos no banco sintético")
+    n_pedidos = parser.parse_args(argv).pedidos
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configurar_banco(os.path.join(tmp, "paginacao.db"))
+        db.inicializar_banco()
+        _popular(n_pedidos)
+
+        tamanho = PedidosView.TAMANHO_PAGINA
+        resultados = {
+            "carga completa (antes)": _medir(_carga_completa),
+            f"primeira página de {tamanho} (depois)": _medir(
+                lambda: PedidosView.buscar_pagina(limite=tamanho)),
+            f"página no meio da lista (id < {n_pedidos // 2})": _medir(
+                lambda: PedidosView.buscar_pagina(antes_de=n_pedidos // 2, limite=tamanho)),
+        }
+        db.fechar_conexao()
+
+    print(f"{n_pedidos} pedidos")
+    print(f"{'tempo até a primeira linha':<45}{'ms':>10}")
+    for nome, ms in resultados.items():
+        print(f"{nome:<45}{ms:>10.1f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
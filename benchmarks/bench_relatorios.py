@@ -0,0 +1,76 @@
+"""Relatórios analíticos: partes em série no processo vs. em paralelo no pool de processos.
+
+Usa o banco da escala pedida (1M pedidos ≈ 3M itens por padrão), aplica o
+esquema atual (índices de cobertura) e mede:
+
+- em série: _clientes, _produtos e _resumo, uma após a outra, neste processo;
+- pool (1ª chamada): gerar_relatorios, incluindo a criação dos processos;
+- pool (aquecido): gerar_relatorios com os processos já criados.
+
+    python -m benchmarks.bench_relatorios --escala 1M
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+import relatorios
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+
+REPETICOES = 3
+
+
+def _em_serie():
+    relatorios._clientes(relatorios.LIMITE)
+    relatorios._produtos(relatorios.LIMITE)
+    relatorios._resumo()
+
+
+def _mediana_ms(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="1M")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    caminho = preparar_banco(args.escala, args.dados, args.semente)
+    db.configurar_banco(caminho)
+    db.configurar_instrumentacao(ativa=False)
+    db.inicializar_banco()
+    itens = db.consultar("SELECT COUNT(*) FROM itens_pedido")[0][0]
+    print(f"📊 {ESCALAS[args.escala]} pedidos, {itens} itens")
+
+    _em_serie()  # aquece o cache de páginas do sistema operacional
+    print(f"{'cenário':<28}{'ms':>10}")
+    print(f"{'em série (1 processo)':<28}{_mediana_ms(_em_serie):>10.0f}")
+
+    inicio = time.perf_counter()
+    r = relatorios.gerar_relatorios(caminho=caminho)
+    print(f"{'pool (1ª chamada)':<28}{(time.perf_counter() - inicio) * 1000:>10.0f}")
+    print(f"{'pool (aquecido)':<28}{_mediana_ms(lambda: relatorios.gerar_relatorios(caminho=caminho)):>10.0f}")
+    partes = ", ".join(f"{k} {v:.0f} ms" for k, v in r["tempos_ms"].items() if k != "total")
+    print(f"   partes nos processos: {partes}")
+    relatorios.encerrar()
+    db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Série mensal do dashboard: tabela de resumo vendas_mensais vs. GROUP BY em pedidos.
+
+Mede, no banco da escala pedida, a mediana de tempo e as linhas lidas para montar
+a série de 12 e 24 meses de cada forma:
+
+- resumo: consultar_vendas_mensais() (busca pela chave de vendas_mensais);
+- agregação: GROUP BY substr(data, 1, 7) sobre os pedidos do período.
+
+    python -m benchmarks.bench_vendas_mensais --escala 1M
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+from benchmarks.bench_models import preparar_banco
+from benchmarks.gerador import ESCALAS
+from views.dashboard_view import consultar_vendas_mensais, meses_ate
+
+REPETICOES = 20
+
+
+def _agregar(meses):
+    chaves = meses_ate(None, meses)
+    return db.consultar(
+        "SELECT substr(data, 1, 7), COUNT(*), SUM(total_centavos) FROM pedidos "
+        "WHERE data >= ? GROUP BY substr(data, 1, 7)", (chaves[0] + "-01",))
+
+
+def medir(funcao, *args):
+    """Retorna a mediana em ms de REPETICOES execuções de `funcao(*args)`."""
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", choices=list(ESCALAS), default="100k")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dados", default=tempfile.gettempdir(), help="diretório dos bancos gerados")
+    args = parser.parse_args(argv)
+
+    db.configurar_banco(preparar_banco(args.escala, args.dados, args.semente))
+    db.inicializar_banco()  # bancos gerados antes do resumo mensal recebem a tabela aqui
+    for meses in (12, 24):
+        lidas = db.consultar("SELECT COUNT(*) FROM pedidos WHERE data >= ?", (meses_ate(None, meses)[0] + "-01",))
+        resumo = consultar_vendas_mensais(meses)
+        if [tuple(r) for r in _agregar(meses)] != [r for r in resumo if r[1]]:
+            print(f"❌ {meses} meses: resumo diverge da agregação sobre pedidos")
+            return 1
+        print(f"{meses} meses: resumo {medir(consultar_vendas_mensais, meses):.3f} ms ({meses} linhas lidas) · "
+              f"GROUP BY {medir(_agregar, meses):.1f} ms ({lidas[0][0]} pedidos lidos)")
+    db.fechar_conexao()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Gerador de dados sintéticos e reprodutíveis para os benchmarks.
+
+Cria um banco com clientes, produtos, pedidos e itens_pedido em proporções
+parecidas com as de uma loja real (10 pedidos por cliente, 1 a 5 itens por
+pedido, datas espalhadas pelos últimos dois anos). A mesma semente sempre gera
+o mesmo banco.
+
+    python -m benchmarks.gerador 100k caminho/do/banco.db
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+
+# Escalas padrão: nome -> quantidade de pedidos
+ESCALAS = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1M": 1_000_000,
+}
+
+NOMES = ("Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela",
+         "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Tiago",
+         "Vanessa", "William")
+SOBRENOMES = ("Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira",
+              "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes")
+DOMINIOS = ("gmail.com", "hotmail.com", "outlook.com", "yahoo.com.br", "uol.com.br")
+PRODUTOS = ("Caneta", "Lápis", "Caderno", "Borracha", "Papel A4", "Grampeador", "Cola", "Régua",
+            "Mochila", "Estojo", "Marcador", "Tesoura", "Agenda", "Pasta", "Clips", "Fita Adesiva")
+VARIACOES = ("Azul", "Preto", "Vermelho", "Verde", "Pequeno", "Médio", "Grande", "Premium", "Eco", "Kit")
+
+LOTE = 50_000  # linhas por executemany
+
+
+def _lotes(iteravel, tamanho=LOTE):
+    lote = []
+    for item in iteravel:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def dimensoes(n_pedidos):
+    """Retorna (clientes, produtos) usados para uma quantidade de pedidos."""
+    n_clientes = max(n_pedidos // 10, 50)
+    n_produtos = min(max(n_pedidos // 20, 50), 20_000)
+    return n_clientes, n_produtos
+
+
+def gerar_banco(caminho, n_pedidos, semente=42):
+    """Cria e popula o banco em `caminho` (que não deve existir) com `n_pedidos` pedidos.
+
+    Retorna um dict com as quantidades geradas de cada tabela.
+    """
+    rng = random.Random(semente)
+    n_clientes, n_produtos = dimensoes(n_pedidos)
+
+    db.configurar_banco(caminho)
+    db.inicializar_banco()
+
+    precos = [round(rng.lognormvariate(2.5, 0.8) * 100) for _ in range(n_produtos)]  # centavos
+    hoje = date.today()
+    inicio = hoje - timedelta(days=730)
+
+    def clientes():
+        for i in range(1, n_clientes + 1):
+            nome, sobrenome = rng.choice(NOMES), rng.choice(SOBRENOMES)
+            email = f"{nome.lower()}.{sobrenome.lower()}{i}@{rng.choice(DOMINIOS)}"
+            telefone = f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+            yield (f"{nome} {sobrenome}", email, telefone)
+
+    def produtos():
+        for i in range(n_produtos):
+            yield (f"{rng.choice(PRODUTOS)} {rng.choice(VARIACOES)} {i + 1}", precos[i])
+
+    n_itens = 0
+
+    def pedidos_e_itens():
+        nonlocal n_itens
+        for pedido_id in range(1, n_pedidos + 1):
+            itens = []
+            for _ in range(rng.randint(1, 5)):
+                produto_id = rng.randint(1, n_produtos)
+                itens.append((pedido_id, produto_id, rng.randint(1, 10), precos[produto_id - 1]))
+            n_itens += len(itens)
+            data = (inicio + timedelta(days=rng.randint(0, 730))).isoformat()
+            yield (pedido_id, rng.randint(1, n_clientes), data), itens
+
+    with db.transacao() as conn:
+        for lote in _lotes(clientes()):
+            conn.executemany("INSERT INTO clientes (nome, email, telefone) VALUES (?, ?, ?)", lote)
+        for lote in _lotes(produtos()):
+            conn.executemany("INSERT INTO produtos (nome, preco_centavos) VALUES (?, ?)", lote)
+
+    for lote in _lotes(pedidos_e_itens(), LOTE // 3):
+        with db.transacao() as conn:
+            # totais e quantidade de itens dos pedidos são somados pelos gatilhos de itens_pedido
+            conn.executemany("INSERT INTO pedidos (id, id_cliente, data) VALUES (?, ?, ?)", (p for p, _ in lote))
+            db.inserir_itens_em_massa(conn, (item for _, itens in lote for item in itens))
+
+    db.conectar().execute("ANALYZE")
+    return {"clientes": n_clientes, "produtos": n_produtos, "pedidos": n_pedidos, "itens_pedido": n_itens}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] not in ESCALAS:
+        print(f"uso: python -m benchmarks.gerador {{{'|'.join(ESCALAS)}}} caminho.db")
+        return 2
+    escala, caminho = argv
+    if os.path.exists(caminho):
+        print(f"❌ {caminho} já existe.")
+        return 1
+    inicio = time.perf_counter()
+    contagens = gerar_banco(caminho, ESCALAS[escala])
+    db.fechar_conexao()
+    print(f"✅ {contagens} gerados em {time.perf_counter() - inicio:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
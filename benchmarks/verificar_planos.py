@@ -0,0 +1,156 @@
+"""Verificação de regressão dos planos de consulta.
+
+Executa cada operação pública de models.py e as consultas do dashboard contra um
+banco temporário, captura o SQL realmente emitido e roda `EXPLAIN QUERY PLAN` em
+cada instrução. Falha (código de saída 1) quando alguma delas varre uma tabela
+inteira sem que isso seja esperado para a operação.
+
+    python -m benchmarks.verificar_planos
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import db
+import relatorios
+from models import Cliente, Pedido, ItemPedido, Produto
+from views.dashboard_view import consultar_metricas, consultar_vendas_mensais
+
+
+# (nome, operação, tabelas em que uma varredura completa é esperada)
+CENARIOS = (
+    ("Cliente.salvar (insert)", lambda: Cliente("Ana", "ana@ex.com", "(11) 99999-0000").salvar(), ()),
+    ("Cliente.salvar (update)", lambda: Cliente("Ana", "ana@ex.com", "(11) 99999-0000", id=1).salvar(), ()),
+    ("Cliente.listar", Cliente.listar, ("clientes",)),  # listagem completa
+    # LIKE com curinga inicial não tem como usar índice B-tree
+    ("Cliente.pesquisar_por_email", lambda: Cliente.pesquisar_por_email("ana"), ("clientes",)),
+    ("Cliente.listar_pagina", lambda: Cliente.listar_pagina(depois_de=1, limite=50), ()),
+    ("Cliente.buscar_por_ids", lambda: Cliente.buscar_por_ids([1, 2, 3]), ()),
+    ("Cliente.buscar_por_nomes", lambda: Cliente.buscar_por_nomes(["Ana", "Bruno"]), ()),
+    ("Cliente.pesquisar (FTS5)", lambda: Cliente.pesquisar("ana@ex"), ()),
+    # com trigram, termos de 1-2 caracteres não têm trigramas e comparam casefold das colunas
+    ("Cliente.pesquisar (termo curto)", lambda: Cliente.pesquisar("an"), ("clientes",)),
+    ("Produto.salvar (insert)", lambda: Produto("Caneta", 250).salvar(), ()),
+    ("Produto.salvar (update)", lambda: Produto("Caneta", 300, id=1).salvar(), ()),
+    ("Produto.listar", Produto.listar, ("produtos",)),  # listagem completa
+    ("Produto.listar_pagina", lambda: Produto.listar_pagina(depois_de=1, limite=50), ()),
+    ("Produto.buscar_por_ids", lambda: Produto.buscar_por_ids([1, 2, 3]), ()),
+    ("Produto.buscar_por_nomes", lambda: Produto.buscar_por_nomes(["Caneta", "Lápis"]), ()),
+    ("Pedido.salvar (insert)", lambda: Pedido(1, "2024-05-10").salvar(), ()),
+    ("Pedido.salvar (update)", lambda: Pedido(1, "2024-05-12", id=1).salvar(), ()),
+    ("Pedido.listar", Pedido.listar, ("pedidos",)),  # listagem completa
+    ("Pedido.buscar_por_ids", lambda: Pedido.buscar_por_ids(range(1, 2000)), ()),
+    # primeira página: percorre a tabela em ordem de rowid, mas para no LIMIT
+    ("Pedido.listar_pagina (primeira)", lambda: Pedido.listar_pagina(limite=50), ("pedidos",)),
+    ("Pedido.listar_pagina (antes_de)", lambda: Pedido.listar_pagina(antes_de=100, limite=50), ()),
+    ("Pedido.listar_pagina (depois_de)", lambda: Pedido.listar_pagina(depois_de=100, limite=50), ()),
+    # clientes pela coluna nome de clientes_fts; pedidos pelo índice de id_cliente
+    ("Pedido.pesquisar_por_cliente (FTS5)", lambda: Pedido.pesquisar_por_cliente("Ângela"), ()),
+    # termo curto: casefold(nome) percorre o índice idx_clientes_nome (não a tabela)
+    ("Pedido.pesquisar_por_cliente (curto)", lambda: Pedido.pesquisar_por_cliente("ân"), ("clientes",)),
+    ("Pedido.salvar_com_itens", lambda: Pedido(1, "2024-05-11").salvar_com_itens([(1, 2), (1, 1)]), ()),
+    ("ItemPedido.salvar (insert)", lambda: ItemPedido(1, 1, 2).salvar(), ()),
+    ("ItemPedido.salvar (update)", lambda: ItemPedido(1, 1, 3, id=1).salvar(), ()),
+    ("ItemPedido.listar_por_pedido", lambda: ItemPedido.listar_por_pedido(1), ()),
+    # COUNT(*) de clientes percorre o menor índice disponível por definição
+    ("dashboard: consultar_metricas", consultar_metricas, ("clientes",)),
+    # série mensal: busca pela chave primária de vendas_mensais, no máximo 24 linhas
+    ("dashboard: consultar_vendas_mensais", lambda: consultar_vendas_mensais(24), ()),
+    # reconstrução do resumo: percorre pedidos (pelo índice idx_pedidos_data) por definição
+    ("db.reconstruir_vendas_mensais", db.reconstruir_vendas_mensais, ("pedidos", "vendas_mensais")),
+    # conferência em massa dos totais: percorre pedidos e o índice de itens por definição
+    ("db.verificar_totais_pedidos", lambda: db.verificar_totais_pedidos(corrigir=False), ("pedidos", "itens_pedido")),
+    # relatórios: agregam tudo por definição, percorrendo só os índices de cobertura
+    ("relatorios: clientes", lambda: relatorios._clientes(relatorios.LIMITE), ("pedidos",)),
+    ("relatorios: produtos", lambda: relatorios._produtos(relatorios.LIMITE), ("itens_pedido",)),
+    ("relatorios: resumo", relatorios._resumo, ("pedidos",)),
+    ("ItemPedido.deletar", lambda: ItemPedido.deletar(1), ()),
+    ("Pedido.deletar", lambda: Pedido.deletar(1), ()),
+    ("Pedido.deletar_varios", lambda: Pedido.deletar_varios([2, 3]), ()),
+    # conferência do resumo mensal: agrupa pedidos e percorre vendas_mensais por definição
+    ("db.verificar_vendas_mensais", lambda: db.verificar_vendas_mensais(corrigir=False), ("pedidos", "vendas_mensais")),
+    # contagem e limpeza de itens órfãos: percorrem itens_pedido por definição
+    ("db.contar_itens_orfaos", db.contar_itens_orfaos, ("itens_pedido",)),
+    ("db.remover_itens_orfaos", db.remover_itens_orfaos, ("itens_pedido",)),
+    ("Produto.deletar", lambda: Produto.deletar(1), ()),
+    ("Cliente.deletar", lambda: Cliente.deletar(1), ()),
+)
+
+# "--" marca instruções internas (gatilhos, FTS5) repassadas pelo trace do SQLite
+_IGNORADAS = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "EXPLAIN", "--")
+
+
+def _tabelas_varridas(conn, sql):
+    """Retorna as tabelas que o plano de `sql` percorre por completo."""
+    tabelas = set()
+    subconsultas = set()
+    for _id, _pai, _nao_usado, detalhe in conn.execute("EXPLAIN QUERY PLAN " + sql):
+        if detalhe.startswith(("CO-ROUTINE ", "MATERIALIZE ")):
+            subconsultas.add(detalhe.split()[1])
+        # "SCAN f VIRTUAL TABLE INDEX ..." é a consulta ao índice FTS5, não uma varredura
+        elif detalhe.startswith("SCAN ") and not detalhe.startswith("SCAN CONSTANT ROW") \
+                and "VIRTUAL TABLE" not in detalhe:
+            tabelas.add(detalhe.split()[1])
+    # percorrer o resultado de uma subconsulta não é varrer uma tabela: o plano dela já foi verificado
+    return tabelas - subconsultas
+
+
+def _aliases(sql):
+    """Mapeia aliases de tabela usados no SQL (ex.: 'ip' -> 'itens_pedido')."""
+    palavras = sql.replace(",", " ").split()
+    mapa = {}
+    for i, p in enumerate(palavras[:-1]):
+        if p.upper() in ("FROM", "JOIN", "INTO", "UPDATE"):
+            tabela = palavras[i + 1]
+            mapa[tabela] = tabela
+            if i + 2 < len(palavras) and palavras[i + 2].upper() not in ("WHERE", "ON", "JOIN", "SET", "VALUES", "(", "ORDER", "GROUP", "LIMIT"):
+                mapa[palavras[i + 2]] = tabela
+    return mapa
+
+
+def verificar():
+    """Executa todos os cenários e retorna a lista de falhas (cenário, sql, tabelas)."""
+    falhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configurar_banco(os.path.join(tmp, "planos.db"))
+        db.inicializar_banco()
+        db.tokenizador_busca_clientes()  # detecção do FTS5 fica fora das medições
+        conn = db.conectar()
+        capturadas = []
+        for nome, operacao, permitidas in CENARIOS:
+            capturadas.clear()
+            conn.set_trace_callback(capturadas.append)
+            try:
+                operacao()
+            finally:
+                conn.set_trace_callback(None)
+            for sql in capturadas:
+                if sql.strip().upper().startswith(_IGNORADAS):
+                    continue
+                aliases = _aliases(sql)
+                varridas = {aliases.get(t, t) for t in _tabelas_varridas(conn, sql)}
+                indevidas = varridas - set(permitidas)
+                if indevidas:
+                    falhas.append((nome, sql, sorted(indevidas)))
+                print(f"{'FALHA' if indevidas else 'ok':<6}{nome:<40}{' '.join(sql.split())[:90]}")
+        db.fechar_conexao()
+    return falhas
+
+
+def main():
+    falhas = verificar()
+    if falhas:
+        print(f"\n{len(falhas)} consulta(s) com varredura completa de tabela:")
+        for nome, sql, tabelas in falhas:
+            print(f"  - {nome}: {', '.join(tabelas)}\n      {' '.join(sql.split())}")
+        return 1
+    print("\nNenhuma varredura de tabela inesperada.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Linha de comando para tarefas em lote (importação, exportação, verificação, relatórios) e a API.
+
+Roda sem a interface: nada aqui importa tkinter, e só db é importado na partida;
+o módulo de cada comando é importado quando o comando roda (a partida é medida
+por benchmarks/bench_cli.py).
+
+    python -m cli inicializar
+    python -m cli importar pedidos pedidos.csv --rejeitadas rejeitadas.csv
+    python -m cli exportar clientes clientes.csv
+    python -m cli verificar [--corrigir]
+    python -m cli relatorios [--limite 20] [--json]
+    python -m cli servir [--host 0.0.0.0] [--porta 8765]
+
+--banco escolhe o arquivo de banco (padrão: banco_dados.db no diretório atual).
+Código de saída: 0 em sucesso, 1 em erro ou quando `verificar` sem --corrigir
+encontra inconsistências, 2 em argumentos inválidos.
+"""
+import argparse
+import sys
+
+import db
+
+TABELAS = ("clientes", "produtos", "pedidos")
+
+
+# ===========================================================
+# Comandos
+# ===========================================================
+def inicializar(args):
+    """Cria as tabelas, índices e gatilhos (e migra bancos antigos)."""
+    return 0 if db.inicializar_banco() else 1
+
+
+def importar(args):
+    import importacao
+
+    # a importação pode ser a primeira gravação em um banco novo
+    if not db.inicializar_banco():
+        return 1
+    resultado = getattr(importacao, f"importar_{args.tabela}")(args.arquivo, lote=args.lote)
+    if resultado is None:
+        return 1
+    print(f"{args.tabela}: {resultado['lidas']} lidas, {resultado['importadas']} importadas, "
+          f"{resultado['rejeitadas']} rejeitadas")
+    for erro in resultado["erros"][:args.mostrar_erros]:
+        print(f"   linha {erro.numero}: {erro.motivo}")
+    if args.rejeitadas and resultado["erros"]:
+        importacao.gravar_rejeitadas(resultado, args.rejeitadas)
+        print(f"   linhas rejeitadas gravadas em {args.rejeitadas}")
+    return 0
+
+
+def exportar(args):
+    import exportacao
+
+    gravadas = getattr(exportacao, f"exportar_{args.tabela}")(args.arquivo)
+    if gravadas is None:
+        return 1
+    print(f"{args.tabela}: {gravadas} linhas gravadas em {args.arquivo}")
+    return 0
+
+
+def verificar(args):
+    """Totais dos pedidos, itens órfãos e vendas_mensais; com --corrigir, corrige o que divergir."""
+    if args.corrigir:
+        # os órfãos saem antes: a reconstrução dos totais e do resumo já os desconsidera
+        verificacoes = (
+            ("itens órfãos removidos", db.remover_itens_orfaos),
+            ("pedidos com totais corrigidos", db.verificar_totais_pedidos),
+            ("meses de vendas_mensais reconstruídos", db.verificar_vendas_mensais),
+        )
+    else:
+        verificacoes = (
+            ("itens órfãos", db.contar_itens_orfaos),
+            ("pedidos com totais divergentes", lambda: db.verificar_totais_pedidos(corrigir=False)),
+            ("meses divergentes em vendas_mensais", lambda: db.verificar_vendas_mensais(corrigir=False)),
+        )
+    codigo = 0
+    for descricao, funcao in verificacoes:
+        quantidade = funcao()
+        if quantidade is None:
+            print(f"❌ {descricao}: falhou")
+            codigo = 1
+            continue
+        print(f"{'⚠️ ' if quantidade and not args.corrigir else '✅'} {descricao}: {quantidade}")
+        if quantidade and not args.corrigir:
+            codigo = 1
+    return codigo
+
+
+def relatorios(args):
+    import relatorios as modulo
+    from utils import formatar_centavos
+
+    try:
+        r = modulo.gerar_relatorios(limite=args.limite, caminho=db.DB_PATH)
+    finally:
+        modulo.encerrar()
+    if args.json:
+        import json
+        # json gravaria as namedtuples como listas; cada linha vira um objeto com os nomes das colunas
+        for chave in ("top_clientes", "top_produtos", "abc"):
+            r[chave] = [linha._asdict() for linha in r[chave]]
+        json.dump(r, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print("Maiores clientes")
+    for i, c in enumerate(r["top_clientes"], start=1):
+        print(f"{i:>4}  {c.nome or 'Desconhecido':<40}{c.pedidos:>8}{formatar_centavos(c.receita_centavos):>16}")
+    print("\nProdutos mais vendidos")
+    for i, p in enumerate(r["top_produtos"], start=1):
+        print(f"{i:>4}  {p.nome or 'Desconhecido':<40}{p.quantidade:>8}{formatar_centavos(p.receita_centavos):>16}"
+              f"  {p.classe}")
+    print("\nCurva ABC")
+    for a in r["abc"]:
+        print(f"{a.classe:>4}  {a.produtos:>6} produtos ({a.fracao_produtos:>6.1%})"
+              f"{formatar_centavos(a.receita_centavos):>18} ({a.fracao_receita:>6.1%})")
+    m = r["medias"]
+    print(f"\n{m['pedidos']} pedidos · {m['itens_por_pedido']:.2f} itens/pedido · "
+          f"{m['unidades_por_pedido']:.2f} unidades/pedido · ticket médio {formatar_centavos(m['ticket_medio_centavos'])}")
+    print(f"calculado em {r['tempos_ms']['total']:.0f} ms")
+    return 0
+
+
+def servir(args):
+    """API HTTP/JSON sobre os modelos (ver api.py), até Ctrl+C."""
+    import api
+
+    return api.servir(args.host, args.porta, args.threads, args.registrar)
+
+
+# ===========================================================
+# Argumentos
+# ===========================================================
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__.splitlines()[0])
+    parser.add_argument("--banco", default=db.DB_PATH, help="arquivo do banco (padrão: %(default)s)")
+    comandos = parser.add_subparsers(dest="comando", required=True, metavar="comando")
+
+    p = comandos.add_parser("inicializar", help="cria ou atualiza o esquema do banco")
+    p.set_defaults(funcao=inicializar)
+
+    p = comandos.add_parser("importar", help="importa um CSV (mesmo formato das telas)")
+    p.add_argument("tabela", choices=TABELAS)
+    p.add_argument("arquivo")
+    p.add_argument("--lote", type=int, default=5000, help="linhas gravadas por transação")
+    p.add_argument("--rejeitadas", help="grava as linhas rejeitadas neste CSV")
+    p.add_argument("--mostrar-erros", type=int, default=10, help="linhas rejeitadas exibidas")
+    p.set_defaults(funcao=importar)
+
+    p = comandos.add_parser("exportar", help="exporta uma tabela para CSV")
+    p.add_argument("tabela", choices=TABELAS)
+    p.add_argument("arquivo")
+    p.set_defaults(funcao=exportar)
+
+    p = comandos.add_parser("verificar", help="confere totais, itens órfãos e vendas_mensais")
+    p.add_argument("--corrigir", action="store_true", help="corrige as inconsistências encontradas")
+    p.set_defaults(funcao=verificar)
+
+    p = comandos.add_parser("relatorios", help="gera os relatórios analíticos")
+    p.add_argument("--limite", type=int, default=20, help="linhas dos rankings")
+    p.add_argument("--json", action="store_true", help="saída em JSON")
+    p.set_defaults(funcao=relatorios)
+
+    p = comandos.add_parser("servir", help="atende a API HTTP/JSON (ver api.py)")
+    p.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 para aceitar outros computadores")
+    p.add_argument("--porta", type=int, default=8765, help="0 escolhe uma porta livre")
+    p.add_argument("--threads", type=int, default=16)
+    p.add_argument("--registrar", action="store_true", help="mostra cada requisição atendida")
+    p.set_defaults(funcao=servir)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    db.configurar_banco(args.banco)
+    db.configurar_instrumentacao(ativa=False)
+    try:
+        return args.funcao(args)
+    finally:
+        db.fechar_conexao()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,165 +1,1154 @@
+import os
 import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 from sqlite3 import Error
 
 
+# Caminho do banco usado por todas as conexões (pode ser trocado com configurar_banco)
+DB_PATH = "banco_dados.db"
+
+# PRAGMAs aplicados uma única vez, quando a conexão da thread é aberta
+PRAGMAS = (
+    ("journal_mode", "WAL"),     # leitores não bloqueiam o escritor
+    ("synchronous", "NORMAL"),   # seguro com WAL e bem mais barato que FULL
+    ("cache_size", -16000),      # ~16 MB de cache de páginas por conexão
+    ("temp_store", "MEMORY"),    # ordenações e tabelas temporárias em memória
+)
+
+# Índices dos caminhos de acesso reais (criados por inicializar_banco)
+INDICES = (
+    # itens de um pedido: cobre a listagem dos itens e o recálculo dos totais sem visitar a tabela
+    "CREATE INDEX IF NOT EXISTS idx_itens_pedido_preco ON itens_pedido (pedido_id, produto_id, quantidade, preco_centavos)",
+    # pedidos de um cliente; o total permite somar a receita por cliente só com o índice
+    "CREATE INDEX IF NOT EXISTS idx_pedidos_cliente_total ON pedidos (id_cliente, total_centavos)",
+    # vendas por produto (relatórios): agrega quantidade e receita sem visitar a tabela
+    "CREATE INDEX IF NOT EXISTS idx_itens_pedido_produto ON itens_pedido (produto_id, quantidade, preco_centavos)",
+    # filtro por período do dashboard: cobre COUNT e SUM(total_centavos) pelo intervalo de datas
+    "CREATE INDEX IF NOT EXISTS idx_pedidos_data ON pedidos (data, total_centavos)",
+    # pesquisa de pedidos pelo nome do cliente: varre só este índice (id, nome), não a tabela
+    "CREATE INDEX IF NOT EXISTS idx_clientes_nome ON clientes (nome COLLATE NOCASE)",
+    # busca de produtos pelo nome
+    "CREATE INDEX IF NOT EXISTS idx_produtos_nome ON produtos (nome)",
+)
+
+# Índices substituídos por versões que cobrem mais colunas (removidos por inicializar_banco)
+INDICES_OBSOLETOS = ("idx_itens_pedido_pedido", "idx_pedidos_cliente")
+
+# Parâmetros por instrução nas operações em blocos (IN (...)), abaixo do limite do SQLite
+MAX_PARAMETROS = 900
+
+# Cada thread mantém a sua própria conexão de longa duração
+_local = threading.local()
+
+
 # ===========================================================
-# Função para conectar ao banco de dados
+# Gerenciador de conexões
 # ===========================================================
+def _casefold(texto):
+    return texto.casefold() if isinstance(texto, str) else texto
+
+
+def _abrir_conexao(caminho):
+    """Abre uma nova conexão já configurada com os PRAGMAs de desempenho."""
+    # isolation_level=None: as transações são controladas explicitamente por transacao()
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    for nome, valor in PRAGMAS:
+        conn.execute(f"PRAGMA {nome}={valor}")
+    # LIKE e NOCASE só ignoram maiúsculas em ASCII; casefold(x) compara "Ângela" com "ângela"
+    conn.create_function("casefold", 1, _casefold, deterministic=True)
+    return conn
+
+
 def conectar():
-    """Cria e retorna a conexão com o banco de dados SQLite."""
-    try:
-        conn = sqlite3.connect("banco_dados.db")
+    """Retorna a conexão persistente da thread atual, criando-a na primeira chamada.
+
+    A conexão é compartilhada por todas as chamadas da mesma thread e não deve ser
+    fechada pelo chamador; use fechar_conexao() para encerrá-la explicitamente.
+    """
+    conn = getattr(_local, "conexao", None)
+    if conn is not None and _local.caminho == DB_PATH:
         return conn
+    if conn is not None:
+        # O caminho do banco mudou desde a abertura: descarta a conexão antiga
+        fechar_conexao()
+    try:
+        conn = _abrir_conexao(DB_PATH)
     except Error as e:
         print(f"❌ Erro ao conectar ao banco de dados: {e}")
         return None
+    _local.conexao = conn
+    _local.caminho = DB_PATH
+    _local.profundidade = 0
+    _local.data_version = None
+    return conn
+
+
+def fechar_conexao():
+    """Fecha a conexão persistente da thread atual (se houver)."""
+    conn = getattr(_local, "conexao", None)
+    _local.conexao = None
+    _local.profundidade = 0
+    if conn is not None:
+        conn.close()
+
+
+def configurar_banco(caminho):
+    """Aponta as próximas conexões para outro arquivo de banco (ex.: testes e benchmarks)."""
+    global DB_PATH
+    fechar_conexao()
+    DB_PATH = caminho
+    limpar_cache()
+
+
+@contextmanager
+def transacao(imediata=False):
+    """Executa o bloco dentro de uma transação na conexão da thread.
+
+    Faz COMMIT ao final ou ROLLBACK se ocorrer uma exceção. Transações aninhadas são
+    incorporadas à transação mais externa, que é a única a confirmar as alterações.
+    Com `imediata`, a trava de escrita é obtida já no BEGIN (BEGIN IMMEDIATE): o que
+    o bloco ler não pode ser alterado por outra conexão antes das gravações dele.
+
+        with transacao() as conn:
+            conn.execute("INSERT ...")
+            conn.execute("INSERT ...")
+    """
+    conn = conectar()
+    if conn is None:
+        raise Error("Não foi possível conectar ao banco de dados.")
+    if _local.profundidade > 0:
+        _local.profundidade += 1
+        try:
+            yield conn
+        finally:
+            _local.profundidade -= 1
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if imediata else "BEGIN")
+    _local.profundidade = 1
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        try:
+            conn.execute("COMMIT")
+        except BaseException:
+            # COMMIT falhou (SQLITE_BUSY, disco cheio...): desfaz para a conexão
+            # persistente não ficar presa em uma transação aberta
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except Error:
+                    pass
+            raise
+    finally:
+        _local.profundidade = 0
+
+
+def versao_dados():
+    """Retorna um valor que muda a cada alteração confirmada no banco, por qualquer conexão.
+
+    Combina PRAGMA data_version (commits de outras conexões, deste ou de outro
+    processo) com total_changes da conexão desta thread (as alterações feitas por
+    ela mesma). Não lê nenhuma tabela, então pode ser consultado em um timer para
+    saber se vale a pena refazer consultas. Retorna None se não houver conexão.
+    """
+    conexao = conectar()
+    if conexao is None:
+        return None
+    try:
+        return conexao.execute("PRAGMA data_version").fetchone()[0], conexao.total_changes
+    except Error as e:
+        print(f"❌ Erro ao consultar data_version: {e}")
+        return None
 
 
 # ===========================================================
 # Função para criar as tabelas
 # ===========================================================
+# Tabelas com valores monetários; {tabela} permite criar a cópia usada na migração
+TABELA_PEDIDOS = """
+    CREATE TABLE IF NOT EXISTS {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_cliente INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        total_centavos INTEGER NOT NULL DEFAULT 0,
+        qtd_itens INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (id_cliente) REFERENCES clientes (id)
+    );
+"""
+
+TABELA_PRODUTOS = """
+    CREATE TABLE IF NOT EXISTS {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        preco_centavos INTEGER NOT NULL
+    );
+"""
+
+
+def _migrar_para_centavos(cursor, tabela, antiga, nova, ddl, sem_valor=None):
+    """Recria `tabela` trocando a coluna REAL `antiga` (reais) pela INTEGER `nova` (centavos).
+
+    Colunas REAL não guardam inteiros (a afinidade os converte de volta em float),
+    então a tabela é copiada para uma nova e renomeada. Não faz nada se a
+    coluna antiga não existir. Índices e gatilhos da tabela antiga são recriados
+    depois, em inicializar_banco. Com `sem_valor` (tabela temporária), os ids das
+    linhas com `antiga` NULL são anotados nela e a nova coluna recebe 0.
+    """
+    colunas = [r[1] for r in cursor.execute(f"PRAGMA table_info({tabela})").fetchall()]
+    if antiga not in colunas:
+        return
+    if sem_valor is not None:
+        cursor.execute(f"INSERT OR IGNORE INTO {sem_valor} (id) SELECT id FROM {tabela} WHERE {antiga} IS NULL")
+    destino = ", ".join(nova if c == antiga else c for c in colunas)
+    origem = ", ".join(f"COALESCE(CAST(ROUND({c} * 100) AS INTEGER), 0)" if c == antiga else c for c in colunas)
+    copia = f"{tabela}_centavos"
+    # preserva o contador do AUTOINCREMENT: ids de linhas excluídas não podem voltar
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name=?", (tabela,))
+    sequencia = cursor.fetchone()
+    cursor.execute(f"DROP TABLE IF EXISTS {copia}")
+    cursor.execute(ddl.format(tabela=copia))
+    cursor.execute(f"INSERT INTO {copia} ({destino}) SELECT {origem} FROM {tabela}")
+    cursor.execute(f"DROP TABLE {tabela}")
+    cursor.execute(f"ALTER TABLE {copia} RENAME TO {tabela}")
+    if sequencia is not None:
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name=?", (tabela,))
+        cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (tabela, sequencia[0]))
+    print(f"✅ {tabela}.{antiga} migrado para {nova} (centavos).")
+
+
 def inicializar_banco():
-    """Cria as tabelas no banco de dados, se não existirem."""
-    conexao = conectar()
-    if conexao is None:
+    """Cria as tabelas no banco de dados, se não existirem. Retorna True se deu certo."""
+    if conectar() is None:
         print("❌ Falha ao conectar. O banco não foi inicializado.")
-        return
+        return False
 
     try:
-        cursor = conexao.cursor()
-
-        # Tabela de clientes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS clientes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                email TEXT,
-                telefone TEXT
-            );
-        """)
-
-        # Tabela de pedidos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pedidos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                id_cliente INTEGER NOT NULL,
-                data TEXT NOT NULL,
-                total REAL DEFAULT 0,
-                FOREIGN KEY (id_cliente) REFERENCES clientes (id)
-            );
-        """)
-
-        # Tabela de itens do pedido (modelo novo: apenas referencia produto_id e quantidade)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS itens_pedido (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pedido_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            );
-        """)
-
-        # Tabela de produtos
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS produtos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                preco_unit REAL NOT NULL
-            );
-        """)
-
-        # Migração para versões antigas: se a tabela itens_pedido existia com colunas antigas (produto, preco_unit,
-        # etc), recria a tabela migrando produto_id quando possível.
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='itens_pedido_old_migration_check'")
-        # Check current columns
-        cursor.execute("PRAGMA table_info(itens_pedido)")
-        existing_cols = [row[1] for row in cursor.fetchall()]
-        # If existing columns include 'produto' or 'preco_unit' (old schema) but not only new schema, attempt migration
-        old_cols = set(["produto", "preco_unit"]) & set(existing_cols)
-        if old_cols:
-            # We assume current table already matches new schema if it has produto_id and quantidade only — skip
-            # To be safe, create a temp table, copy mapped data, drop old and rename
-            try:
-                cursor.execute("ALTER TABLE itens_pedido RENAME TO itens_pedido_old")
-                cursor.execute("""
-                    CREATE TABLE itens_pedido (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        pedido_id INTEGER NOT NULL,
-                        produto_id INTEGER NOT NULL,
-                        quantidade INTEGER NOT NULL,
-                        FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                        FOREIGN KEY (produto_id) REFERENCES produtos (id)
-                    );
-                """)
-                # Copy data: try to map produto name to produto_id in produtos, otherwise NULL (will fail NOT NULL)
-                cursor.execute("SELECT id, pedido_id, produto, quantidade FROM itens_pedido_old")
-                rows = cursor.fetchall()
-                for r in rows:
-                    old_id, pedido_id, produto_nome, quantidade = r
-                    # find produto_id by name
-                    cursor.execute("SELECT id FROM produtos WHERE nome=?", (produto_nome,))
-                    res = cursor.fetchone()
-                    if res:
-                        produto_id = res[0]
-                    else:
-                        produto_id = None
-                    if produto_id is not None:
-                        cursor.execute("INSERT INTO itens_pedido (pedido_id, produto_id, quantidade) VALUES (?, ?, ?)", (pedido_id, produto_id, quantidade))
-                cursor.execute("DROP TABLE itens_pedido_old")
-            except Error:
-                # If migration fails, ignore and continue with the new (empty) table
-                pass
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+
+            # Tabela de clientes
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS clientes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    email TEXT,
+                    telefone TEXT
+                );
+            """)
+
+            # Tabela de pedidos (total em centavos; total e qtd_itens mantidos pelos gatilhos de itens_pedido)
+            cursor.execute(TABELA_PEDIDOS.format(tabela="pedidos"))
+
+            # Tabela de itens do pedido (referencia produto_id; preco_centavos é o preço unitário na venda)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS itens_pedido (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pedido_id INTEGER NOT NULL,
+                    produto_id INTEGER NOT NULL,
+                    quantidade INTEGER NOT NULL,
+                    preco_centavos INTEGER,
+                    FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
+                    FOREIGN KEY (produto_id) REFERENCES produtos (id)
+                );
+            """)
+
+            # Tabela de produtos (preço em centavos)
+            cursor.execute(TABELA_PRODUTOS.format(tabela="produtos"))
+
+            # Migração para versões antigas: valores em reais (REAL) passam a centavos (INTEGER);
+            # pedidos sem total ficam anotados para receber a soma dos itens (_criar_gatilhos_totais)
+            cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {PEDIDOS_SEM_TOTAL} (id INTEGER PRIMARY KEY)")
+            _migrar_para_centavos(cursor, "pedidos", "total", "total_centavos", TABELA_PEDIDOS,
+                                  sem_valor=PEDIDOS_SEM_TOTAL)
+            _migrar_para_centavos(cursor, "produtos", "preco_unit", "preco_centavos", TABELA_PRODUTOS)
+
+            # Migração para versões antigas: se a tabela itens_pedido existia com colunas antigas (produto, preco_unit,
+            # etc), recria a tabela migrando produto_id quando possível.
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='itens_pedido_old_migration_check'")
+            # Check current columns
+            cursor.execute("PRAGMA table_info(itens_pedido)")
+            existing_cols = [row[1] for row in cursor.fetchall()]
+            # If existing columns include 'produto' or 'preco_unit' (old schema) but not only new schema, attempt migration
+            old_cols = set(["produto", "preco_unit"]) & set(existing_cols)
+            if old_cols:
+                # We assume current table already matches new schema if it has produto_id and quantidade only — skip
+                # To be safe, create a temp table, copy mapped data, drop old and rename
+                try:
+                    cursor.execute("ALTER TABLE itens_pedido RENAME TO itens_pedido_old")
+                    cursor.execute("""
+                        CREATE TABLE itens_pedido (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            pedido_id INTEGER NOT NULL,
+                            produto_id INTEGER NOT NULL,
+                            quantidade INTEGER NOT NULL,
+                            FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
+                            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+                        );
+                    """)
+                    # Copy data: try to map produto name to produto_id in produtos, otherwise NULL (will fail NOT NULL)
+                    cursor.execute("SELECT id, pedido_id, produto, quantidade FROM itens_pedido_old")
+                    rows = cursor.fetchall()
+                    # nomes resolvidos em blocos (e não um SELECT por item); com nomes repetidos
+                    # no cadastro, vale o produto de menor id
+                    produto_por_nome = {}
+                    for produto_id, produto_nome in consultar_em_blocos(
+                            "SELECT id, nome FROM produtos WHERE nome IN ({}) ORDER BY id DESC",
+                            {r[2] for r in rows}, conexao=conexao):
+                        produto_por_nome[produto_nome] = produto_id
+                    cursor.executemany(
+                        "INSERT INTO itens_pedido (pedido_id, produto_id, quantidade) VALUES (?, ?, ?)",
+                        ((pedido_id, produto_por_nome[produto_nome], quantidade)
+                         for _, pedido_id, produto_nome, quantidade in rows if produto_nome in produto_por_nome))
+                    cursor.execute("DROP TABLE itens_pedido_old")
+                except Error:
+                    # If migration fails, ignore and continue with the new (empty) table
+                    pass
+
+            # Migração para versões antigas: preço do item na venda e quantidade de itens do pedido
+            _adicionar_colunas_totais(cursor)
+
+            # Índices secundários para os caminhos de acesso usados pelos modelos e views
+            for nome in INDICES_OBSOLETOS:
+                cursor.execute(f"DROP INDEX IF EXISTS {nome}")
+            for ddl in INDICES:
+                cursor.execute(ddl)
+
+            # Gatilhos que mantêm pedidos.total_centavos e pedidos.qtd_itens
+            _criar_gatilhos_totais(cursor)
+
+            # Exclusão em cascata dos itens de um pedido
+            _criar_cascata_pedidos(cursor)
+
+            # Resumo mensal de vendas mantido pelos gatilhos de pedidos
+            _criar_vendas_mensais(cursor)
+
+            # Índice de texto completo de clientes (FTS5), quando disponível
+            _criar_busca_clientes(cursor)
 
-        conexao.commit()
         print("✅ Banco de dados inicializado com sucesso.")
+        return True
 
     except Error as e:
         print(f"❌ Erro ao criar tabelas: {e}")
+        return False
 
-    finally:
-        if conexao:
-            conexao.close()
+
+# ===========================================================
+# Totais dos pedidos (gatilhos em itens_pedido)
+# ===========================================================
+# Cada item guarda o preço unitário do momento da venda (preco_centavos); o total do
+# pedido é a soma de quantidade * preco_centavos dos seus itens e qtd_itens conta as
+# linhas. Os gatilhos ajustam os dois valores a cada item inserido, alterado ou
+# removido, sem reler os demais itens do pedido.
+GATILHOS_TOTAIS_PEDIDOS = (
+    # item gravado sem preço: usa o preço atual do produto
+    """CREATE TRIGGER IF NOT EXISTS itens_pedido_preco AFTER INSERT ON itens_pedido
+    WHEN new.preco_centavos IS NULL BEGIN
+        UPDATE itens_pedido
+        SET preco_centavos = COALESCE((SELECT preco_centavos FROM produtos WHERE id = new.produto_id), 0)
+        WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS itens_pedido_totais_ai AFTER INSERT ON itens_pedido BEGIN
+        UPDATE pedidos SET
+            total_centavos = total_centavos + new.quantidade * COALESCE(
+                new.preco_centavos, (SELECT preco_centavos FROM produtos WHERE id = new.produto_id), 0),
+            qtd_itens = qtd_itens + 1
+        WHERE id = new.pedido_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS itens_pedido_totais_ad AFTER DELETE ON itens_pedido BEGIN
+        UPDATE pedidos SET
+            total_centavos = total_centavos - old.quantidade * COALESCE(old.preco_centavos, 0),
+            qtd_itens = qtd_itens - 1
+        WHERE id = old.pedido_id;
+    END""",
+    # old.preco_centavos nulo: é o preenchimento do preço acima, já somado na inserção
+    """CREATE TRIGGER IF NOT EXISTS itens_pedido_totais_au
+    AFTER UPDATE OF pedido_id, quantidade, preco_centavos ON itens_pedido
+    WHEN old.preco_centavos IS NOT NULL BEGIN
+        UPDATE pedidos SET
+            total_centavos = total_centavos - old.quantidade * old.preco_centavos,
+            qtd_itens = qtd_itens - 1
+        WHERE id = old.pedido_id;
+        UPDATE pedidos SET
+            total_centavos = total_centavos + new.quantidade * COALESCE(new.preco_centavos, 0),
+            qtd_itens = qtd_itens + 1
+        WHERE id = new.pedido_id;
+    END""",
+)
+
+# Pedidos cujo total ou quantidade de itens difere da soma dos itens (id, total, qtd_itens corretos)
+# Tabela temporária com os pedidos que não tinham total no banco antigo (ver _migrar_para_centavos)
+PEDIDOS_SEM_TOTAL = "temp.pedidos_sem_total"
+
+_PEDIDOS_DIVERGENTES = """
+    SELECT p.id, COALESCE(s.total, 0) AS total, COALESCE(s.n, 0) AS n
+    FROM pedidos p LEFT JOIN (
+        SELECT pedido_id, SUM(quantidade * preco_centavos) AS total, COUNT(*) AS n
+        FROM itens_pedido GROUP BY pedido_id
+    ) s ON s.pedido_id = p.id
+    WHERE p.total_centavos IS NOT COALESCE(s.total, 0) OR p.qtd_itens IS NOT COALESCE(s.n, 0)
+"""
+
+
+def _adicionar_colunas_totais(cursor):
+    """Acrescenta itens_pedido.preco_centavos e pedidos.qtd_itens a bancos antigos.
+
+    Bancos antigos não guardavam o preço da venda: itens existentes recebem o preço
+    *atual* do produto, que é só uma aproximação para pedidos antigos. Por isso os
+    totais já gravados desses pedidos são mantidos (ver _criar_gatilhos_totais), e
+    verificar_totais_pedidos pode apontá-los como divergentes dos itens.
+    """
+    colunas = [r[1] for r in cursor.execute("PRAGMA table_info(itens_pedido)").fetchall()]
+    if "preco_centavos" not in colunas:
+        cursor.execute("ALTER TABLE itens_pedido ADD COLUMN preco_centavos INTEGER")
+        cursor.execute(
+            "UPDATE itens_pedido SET preco_centavos = "
+            "COALESCE((SELECT preco_centavos FROM produtos WHERE id = itens_pedido.produto_id), 0)")
+    colunas = [r[1] for r in cursor.execute("PRAGMA table_info(pedidos)").fetchall()]
+    if "qtd_itens" not in colunas:
+        cursor.execute("ALTER TABLE pedidos ADD COLUMN qtd_itens INTEGER NOT NULL DEFAULT 0")
+
+
+def _criar_gatilhos_totais(cursor):
+    """Cria os gatilhos de totais; na primeira vez, preenche qtd_itens dos pedidos existentes.
+
+    O total_centavos já gravado de cada pedido é o valor histórico e é mantido; só os
+    pedidos anotados em PEDIDOS_SEM_TOTAL (total NULL no banco antigo) recebem a soma
+    dos itens, calculada com os preços aproximados de _adicionar_colunas_totais.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='itens_pedido_totais_ai'")
+    novos = cursor.fetchone() is None
+    for ddl in GATILHOS_TOTAIS_PEDIDOS:
+        cursor.execute(ddl)
+    if novos:
+        cursor.execute(
+            "UPDATE pedidos SET qtd_itens = d.n, total_centavos = CASE "
+            f"  WHEN pedidos.id IN (SELECT id FROM {PEDIDOS_SEM_TOTAL}) THEN d.total ELSE pedidos.total_centavos END "
+            f"FROM ({_PEDIDOS_DIVERGENTES}) AS d WHERE pedidos.id = d.id")
+        sem_total = cursor.execute(f"SELECT COUNT(*) FROM {PEDIDOS_SEM_TOTAL}").fetchone()[0]
+        if sem_total:
+            print(f"✅ Totais de {sem_total} pedido(s) sem total calculados a partir dos itens.")
+    cursor.execute(f"DROP TABLE IF EXISTS {PEDIDOS_SEM_TOTAL}")
+
+
+def _recalcular_totais(cursor):
+    """Corrige, com um único UPDATE, os pedidos divergentes. Retorna quantos foram corrigidos."""
+    cursor.execute(
+        "UPDATE itens_pedido SET preco_centavos = "
+        "COALESCE((SELECT preco_centavos FROM produtos WHERE id = itens_pedido.produto_id), 0) "
+        "WHERE preco_centavos IS NULL")
+    cursor.execute(
+        "UPDATE pedidos SET total_centavos = d.total, qtd_itens = d.n "
+        f"FROM ({_PEDIDOS_DIVERGENTES}) AS d WHERE pedidos.id = d.id")
+    return cursor.rowcount
+
+
+def inserir_itens_em_massa(conn, itens):
+    """Insere muitos (pedido_id, produto_id, quantidade, preco_centavos) na transação aberta em `conn`.
+
+    Como em inserir_clientes_em_massa, o gatilho por linha (itens_pedido_totais_ai) é
+    removido durante o executemany e os totais dos pedidos recebem as novas linhas com
+    um único UPDATE agregado; outras conexões nunca veem a tabela sem o gatilho.
+    """
+    ultimo_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM itens_pedido").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS itens_pedido_totais_ai")
+    conn.executemany(
+        "INSERT INTO itens_pedido (pedido_id, produto_id, quantidade, preco_centavos) VALUES (?, ?, ?, ?)", itens)
+    conn.execute(
+        "UPDATE pedidos SET total_centavos = total_centavos + s.total, qtd_itens = qtd_itens + s.n "
+        "FROM (SELECT pedido_id, SUM(quantidade * preco_centavos) AS total, COUNT(*) AS n "
+        "      FROM itens_pedido WHERE id > ? GROUP BY pedido_id) AS s "
+        "WHERE pedidos.id = s.pedido_id", (ultimo_id,))
+    conn.execute(GATILHOS_TOTAIS_PEDIDOS[1])
+
+
+def verificar_totais_pedidos(corrigir=True):
+    """Confere pedidos.total_centavos e pedidos.qtd_itens contra a soma dos itens.
+
+    Com corrigir=True refaz os valores divergentes em massa (uma transação) e
+    retorna quantos pedidos foram corrigidos; com corrigir=False apenas os conta.
+    Retorna None em caso de erro.
+    """
+    try:
+        if not corrigir:
+            r = consultar(f"SELECT COUNT(*) FROM ({_PEDIDOS_DIVERGENTES})")
+            return r[0][0] if r else None
+        with transacao() as conn:
+            corrigidos = _recalcular_totais(conn.cursor())
+    except Error as e:
+        print(f"❌ Erro ao verificar os totais dos pedidos: {e}")
+        return None
+    if corrigidos:
+        invalidar("pedidos", "itens_pedido")
+    return corrigidos
+
+
+# ===========================================================
+# Exclusão em cascata de pedidos
+# ===========================================================
+# Equivale a ON DELETE CASCADE em itens_pedido.pedido_id. Chaves estrangeiras no
+# SQLite dependem de PRAGMA foreign_keys em cada conexão (que não pode ser trocado
+# dentro de uma transação) e a cláusula só muda recriando a tabela; além disso,
+# ligá-las passaria a impedir a exclusão de clientes e produtos com pedidos.
+GATILHO_CASCATA_PEDIDOS = """CREATE TRIGGER IF NOT EXISTS pedidos_itens_ad AFTER DELETE ON pedidos BEGIN
+    DELETE FROM itens_pedido WHERE pedido_id = old.id;
+END"""
+
+
+def _criar_cascata_pedidos(cursor):
+    """Cria o gatilho de cascata; na primeira vez, remove os itens órfãos deixados por versões antigas."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='pedidos_itens_ad'")
+    novo = cursor.fetchone() is None
+    cursor.execute(GATILHO_CASCATA_PEDIDOS)
+    if novo:
+        removidos = _remover_itens_orfaos(cursor)
+        if removidos:
+            print(f"✅ {removidos} item(ns) de pedidos excluídos removido(s).")
+
+
+def _remover_itens_orfaos(cursor):
+    cursor.execute("DELETE FROM itens_pedido WHERE NOT EXISTS (SELECT 1 FROM pedidos WHERE id = itens_pedido.pedido_id)")
+    return cursor.rowcount
+
+
+def contar_itens_orfaos():
+    """Retorna quantos itens apontam para um pedido que não existe (ou None se falhar)."""
+    r = consultar("SELECT COUNT(*) FROM itens_pedido WHERE NOT EXISTS (SELECT 1 FROM pedidos WHERE id = itens_pedido.pedido_id)")
+    return r[0][0] if r else None
+
+
+def remover_itens_orfaos():
+    """Remove, em uma transação, os itens cujo pedido não existe mais. Retorna quantos (ou None se falhar)."""
+    try:
+        with transacao() as conn:
+            removidos = _remover_itens_orfaos(conn.cursor())
+    except Error as e:
+        print(f"❌ Erro ao remover itens órfãos: {e}")
+        return None
+    if removidos:
+        invalidar("itens_pedido")
+    return removidos
+
+
+# ===========================================================
+# Resumo mensal de vendas (vendas_mensais)
+# ===========================================================
+# Uma linha por mês ('YYYY-MM') com a quantidade de pedidos e a receita em centavos.
+# Os gatilhos de pedidos aplicam a diferença de cada pedido inserido, alterado ou
+# removido (inclusive as mudanças de total feitas pelos gatilhos de itens_pedido),
+# então a série do dashboard lê no máximo uma linha por mês exibido.
+TABELA_VENDAS_MENSAIS = """
+    CREATE TABLE IF NOT EXISTS vendas_mensais (
+        mes TEXT PRIMARY KEY,
+        pedidos INTEGER NOT NULL DEFAULT 0,
+        receita_centavos INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+"""
+
+GATILHOS_VENDAS_MENSAIS = (
+    """CREATE TRIGGER IF NOT EXISTS vendas_mensais_ai AFTER INSERT ON pedidos BEGIN
+        INSERT INTO vendas_mensais (mes, pedidos, receita_centavos)
+        VALUES (substr(new.data, 1, 7), 1, new.total_centavos)
+        ON CONFLICT (mes) DO UPDATE SET
+            pedidos = pedidos + 1,
+            receita_centavos = receita_centavos + excluded.receita_centavos;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS vendas_mensais_ad AFTER DELETE ON pedidos BEGIN
+        UPDATE vendas_mensais SET
+            pedidos = pedidos - 1,
+            receita_centavos = receita_centavos - old.total_centavos
+        WHERE mes = substr(old.data, 1, 7);
+    END""",
+    # caso comum (itens incluídos ou removidos): só a receita do mês muda
+    """CREATE TRIGGER IF NOT EXISTS vendas_mensais_au_total AFTER UPDATE OF total_centavos ON pedidos
+    WHEN old.data IS new.data AND old.total_centavos IS NOT new.total_centavos BEGIN
+        UPDATE vendas_mensais SET receita_centavos = receita_centavos + new.total_centavos - old.total_centavos
+        WHERE mes = substr(new.data, 1, 7);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS vendas_mensais_au_data AFTER UPDATE OF data ON pedidos
+    WHEN old.data IS NOT new.data BEGIN
+        UPDATE vendas_mensais SET
+            pedidos = pedidos - 1,
+            receita_centavos = receita_centavos - old.total_centavos
+        WHERE mes = substr(old.data, 1, 7);
+        INSERT INTO vendas_mensais (mes, pedidos, receita_centavos)
+        VALUES (substr(new.data, 1, 7), 1, new.total_centavos)
+        ON CONFLICT (mes) DO UPDATE SET
+            pedidos = pedidos + 1,
+            receita_centavos = receita_centavos + excluded.receita_centavos;
+    END""",
+)
+
+
+def _criar_vendas_mensais(cursor):
+    """Cria a tabela de resumo e seus gatilhos; na primeira vez, preenche a tabela a partir dos pedidos."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='vendas_mensais'")
+    nova = cursor.fetchone() is None
+    cursor.execute(TABELA_VENDAS_MENSAIS)
+    for ddl in GATILHOS_VENDAS_MENSAIS:
+        cursor.execute(ddl)
+    if nova:
+        _reconstruir_vendas_mensais(cursor)
+
+
+def _reconstruir_vendas_mensais(cursor):
+    cursor.execute("DELETE FROM vendas_mensais")
+    cursor.execute(
+        "INSERT INTO vendas_mensais (mes, pedidos, receita_centavos) "
+        "SELECT substr(data, 1, 7), COUNT(*), SUM(total_centavos) FROM pedidos GROUP BY substr(data, 1, 7)")
+    return cursor.rowcount
+
+
+# Meses em que vendas_mensais difere do agrupamento de pedidos (meses sem pedidos são ignorados)
+_MESES_DIVERGENTES = """
+    SELECT mes FROM (
+        SELECT mes, pedidos, receita_centavos FROM vendas_mensais WHERE pedidos <> 0
+        EXCEPT
+        SELECT substr(data, 1, 7), COUNT(*), SUM(total_centavos) FROM pedidos GROUP BY substr(data, 1, 7)
+    )
+    UNION
+    SELECT mes FROM (
+        SELECT substr(data, 1, 7) AS mes, COUNT(*), SUM(total_centavos) FROM pedidos GROUP BY substr(data, 1, 7)
+        EXCEPT
+        SELECT mes, pedidos, receita_centavos FROM vendas_mensais WHERE pedidos <> 0
+    )
+"""
+
+
+def verificar_vendas_mensais(corrigir=True):
+    """Confere vendas_mensais contra o agrupamento dos pedidos por mês.
+
+    Retorna quantos meses divergem (ou None em caso de erro); com corrigir=True e
+    alguma divergência, reconstrói a tabela inteira.
+    """
+    r = consultar(f"SELECT COUNT(*) FROM ({_MESES_DIVERGENTES})")
+    if not r:
+        return None
+    divergentes = r[0][0]
+    if divergentes and corrigir and reconstruir_vendas_mensais() is None:
+        return None
+    return divergentes
+
+
+def reconstruir_vendas_mensais():
+    """Recalcula vendas_mensais inteira a partir de pedidos, em uma transação.
+
+    Retorna a quantidade de meses gravados, ou None em caso de erro.
+    """
+    try:
+        with transacao() as conn:
+            meses = _reconstruir_vendas_mensais(conn.cursor())
+    except Error as e:
+        print(f"❌ Erro ao reconstruir vendas_mensais: {e}")
+        return None
+    invalidar("vendas_mensais")
+    return meses
+
+
+# ===========================================================
+# Busca textual de clientes (FTS5)
+# ===========================================================
+# Tabela FTS5 de "conteúdo externo": guarda só o índice; o texto continua em
+# clientes e os gatilhos abaixo mantêm os dois sincronizados.
+GATILHOS_BUSCA_CLIENTES = (
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON clientes BEGIN
+        INSERT INTO clientes_fts (rowid, nome, email, telefone)
+        VALUES (new.id, new.nome, new.email, new.telefone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON clientes BEGIN
+        INSERT INTO clientes_fts (clientes_fts, rowid, nome, email, telefone)
+        VALUES ('delete', old.id, old.nome, old.email, old.telefone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_au AFTER UPDATE ON clientes BEGIN
+        INSERT INTO clientes_fts (clientes_fts, rowid, nome, email, telefone)
+        VALUES ('delete', old.id, old.nome, old.email, old.telefone);
+        INSERT INTO clientes_fts (rowid, nome, email, telefone)
+        VALUES (new.id, new.nome, new.email, new.telefone);
+    END""",
+)
+
+
+def _criar_busca_clientes(cursor):
+    """Cria (e preenche na primeira vez) o índice FTS5 de clientes.
+
+    Usa o tokenizador trigram quando disponível (busca por trechos de palavras),
+    senão o tokenizador padrão. Sem FTS5 nada é criado e a pesquisa de clientes
+    volta a usar LIKE.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='clientes_fts'")
+    if cursor.fetchone() is None:
+        criada = False
+        for tokenizador in ("trigram", "unicode61 remove_diacritics 2"):
+            try:
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE clientes_fts USING fts5(
+                        nome, email, telefone,
+                        content='clientes', content_rowid='id', tokenize='{tokenizador}'
+                    )
+                """)
+                criada = True
+                break
+            except Error:
+                continue
+        if not criada:
+            print("⚠️ FTS5 indisponível: a pesquisa de clientes usará LIKE.")
+            return
+        # Preenche o índice com os clientes já cadastrados
+        cursor.execute("INSERT INTO clientes_fts (clientes_fts) VALUES ('rebuild')")
+
+    for ddl in GATILHOS_BUSCA_CLIENTES:
+        cursor.execute(ddl)
+
+
+def inserir_clientes_em_massa(conn, clientes):
+    """Insere muitos (nome, email, telefone) dentro da transação aberta em `conn`.
+
+    O gatilho clientes_fts_ai custa uma escrita no índice FTS5 por linha; aqui ele é
+    removido durante o executemany e o índice recebe as novas linhas com um único
+    INSERT ... SELECT (cerca de 6x mais rápido). Como DDL também é transacional,
+    outras conexões nunca veem a tabela sem o gatilho.
+    """
+    sql = "INSERT INTO clientes (nome, email, telefone) VALUES (?, ?, ?)"
+    if tokenizador_busca_clientes() is None:
+        conn.executemany(sql, clientes)
+        return
+    ultimo_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM clientes").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS clientes_fts_ai")
+    conn.executemany(sql, clientes)
+    conn.execute(
+        "INSERT INTO clientes_fts (rowid, nome, email, telefone) "
+        "SELECT id, nome, email, telefone FROM clientes WHERE id > ?", (ultimo_id,))
+    conn.execute(GATILHOS_BUSCA_CLIENTES[0])
+
+
+# Tokenizador do índice de clientes por arquivo de banco (consultado uma vez por arquivo)
+_tokenizadores = {}
+
+
+def tokenizador_busca_clientes():
+    """Retorna o tokenizador do índice FTS5 de clientes ('trigram', 'unicode61') ou None se não existir."""
+    if DB_PATH not in _tokenizadores:
+        r = consultar("SELECT sql FROM sqlite_master WHERE type='table' AND name='clientes_fts'")
+        if not r:
+            return None  # não memoriza: inicializar_banco ainda pode criar o índice
+        _tokenizadores[DB_PATH] = "trigram" if "trigram" in r[0][0] else "unicode61"
+    return _tokenizadores[DB_PATH]
+
+
+# ===========================================================
+# Instrumentação de consultas
+# ===========================================================
+# Consultas acima deste tempo entram no log de consultas lentas
+LIMITE_LENTA_MS = 100.0
+# Captura EXPLAIN QUERY PLAN das consultas lentas (custa uma consulta extra)
+CAPTURAR_PLANO = False
+# Liga/desliga a coleta de estatísticas
+INSTRUMENTACAO_ATIVA = True
+
+_estatisticas = {}                  # sql normalizado -> dict de contadores
+_lentas = deque(maxlen=200)         # últimas consultas lentas
+_erros = deque(maxlen=200)          # últimos erros de SQL
+_trava_estatisticas = threading.Lock()
+
+
+def configurar_instrumentacao(limite_lenta_ms=None, capturar_plano=None, ativa=None):
+    """Ajusta o limite do log de consultas lentas, a captura de planos e a coleta."""
+    global LIMITE_LENTA_MS, CAPTURAR_PLANO, INSTRUMENTACAO_ATIVA
+    if limite_lenta_ms is not None:
+        LIMITE_LENTA_MS = float(limite_lenta_ms)
+    if capturar_plano is not None:
+        CAPTURAR_PLANO = bool(capturar_plano)
+    if ativa is not None:
+        INSTRUMENTACAO_ATIVA = bool(ativa)
+
+
+def _chamador():
+    """Retorna 'arquivo.py:linha (função)' do primeiro quadro fora de db.py."""
+    quadro = sys._getframe(2)
+    while quadro is not None and quadro.f_code.co_filename == _ARQUIVO_DB:
+        quadro = quadro.f_back
+    if quadro is None:
+        return "?"
+    return f"{os.path.basename(quadro.f_code.co_filename)}:{quadro.f_lineno} ({quadro.f_code.co_name})"
+
+
+_ARQUIVO_DB = _chamador.__code__.co_filename
+
+
+@lru_cache(maxsize=512)
+def _normalizar(query):
+    return " ".join(query.split())
+
+
+def _registrar(conexao, query, parametros, inicio, linhas, erro=None):
+    """Contabiliza uma execução de `query` iniciada em `inicio` (perf_counter)."""
+    ms = (time.perf_counter() - inicio) * 1000
+    sql = _normalizar(query)
+    chamador = _chamador()
+
+    plano = None
+    if erro is None and ms >= LIMITE_LENTA_MS and CAPTURAR_PLANO:
+        try:
+            plano = [r[3] for r in conexao.execute("EXPLAIN QUERY PLAN " + query, parametros)]
+        except Error:
+            pass
+
+    with _trava_estatisticas:
+        est = _estatisticas.get(sql)
+        if est is None:
+            est = _estatisticas[sql] = {"sql": sql, "execucoes": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                        "linhas": 0, "erros": 0, "chamadores": Counter()}
+        est["execucoes"] += 1
+        est["total_ms"] += ms
+        est["max_ms"] = max(est["max_ms"], ms)
+        est["linhas"] += linhas
+        est["chamadores"][chamador] += 1
+        if erro is not None:
+            est["erros"] += 1
+            _erros.append({"quando": datetime.now().isoformat(timespec="seconds"), "sql": sql,
+                           "erro": str(erro), "chamador": chamador})
+        elif ms >= LIMITE_LENTA_MS:
+            _lentas.append({"quando": datetime.now().isoformat(timespec="seconds"), "sql": sql,
+                            "parametros": tuple(parametros), "ms": round(ms, 3), "linhas": linhas,
+                            "chamador": chamador, "plano": plano})
+
+
+def resumo_consultas(n=10, ordenar_por="total_ms"):
+    """Retorna as `n` instruções com maior `ordenar_por` (total_ms, max_ms, execucoes, linhas).
+
+    Cada item traz sql, execucoes, total_ms, media_ms, max_ms, linhas, erros e os
+    principais pontos de chamada.
+    """
+    with _trava_estatisticas:
+        copias = [dict(e, chamadores=e["chamadores"].most_common(3)) for e in _estatisticas.values()]
+    for e in copias:
+        e["media_ms"] = e["total_ms"] / e["execucoes"]
+    copias.sort(key=lambda e: e[ordenar_por], reverse=True)
+    return copias[:n]
+
+
+def consultas_lentas():
+    """Retorna o log de consultas lentas (mais recentes por último)."""
+    with _trava_estatisticas:
+        return list(_lentas)
+
+
+def erros_recentes():
+    """Retorna os últimos erros de SQL registrados (mais recentes por último)."""
+    with _trava_estatisticas:
+        return list(_erros)
+
+
+def limpar_estatisticas():
+    with _trava_estatisticas:
+        _estatisticas.clear()
+        _lentas.clear()
+        _erros.clear()
 
 
 # ===========================================================
 # Funções genéricas de execução de SQL
 # ===========================================================
+def executar_comando(query, parametros=()):
+    """Executa INSERT, UPDATE ou DELETE e retorna o cursor (com lastrowid e rowcount).
+
+    Retorna None se a instrução falhar.
+    """
+    if conectar() is None:
+        return None
+
+    inicio = time.perf_counter()
+    try:
+        with transacao() as conexao:
+            cursor = conexao.execute(query, parametros)
+    except Error as e:
+        print(f"❌ Erro ao executar query: {e}")
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(None, query, parametros, inicio, 0, e)
+        return None
+    # o tempo registrado inclui o COMMIT
+    if INSTRUMENTACAO_ATIVA:
+        _registrar(conexao, query, parametros, inicio, max(cursor.rowcount, 0))
+    return cursor
+
+
 def executar_query(query, parametros=()):
     """Executa INSERT, UPDATE ou DELETE."""
+    return executar_comando(query, parametros) is not None
+
+
+@lru_cache(maxsize=None)
+def fabrica(tipo):
+    """Row factory do sqlite3 que monta cada linha como `tipo` (uma namedtuple)."""
+    nova = tuple.__new__
+
+    def _fabrica(_cursor, linha):
+        return nova(tipo, linha)
+    return _fabrica
+
+
+def _cursor(conexao, tipo):
+    cursor = conexao.cursor()
+    if tipo is not None:
+        cursor.row_factory = fabrica(tipo)
+    return cursor
+
+
+def consultar(query, parametros=(), tipo=None):
+    """Executa um SELECT e retorna os resultados.
+
+    Com `tipo` (uma namedtuple), cada linha é montada como `tipo`; sem ele, como tupla.
+    """
     conexao = conectar()
     if conexao is None:
-        return False
+        return []
 
+    inicio = time.perf_counter()
     try:
-        cursor = conexao.cursor()
+        cursor = _cursor(conexao, tipo)
         cursor.execute(query, parametros)
-        conexao.commit()
-        return True
+        resultados = cursor.fetchall()
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(conexao, query, parametros, inicio, len(resultados))
+        return resultados
     except Error as e:
-        print(f"❌ Erro ao executar query: {e}")
-        return False
-    finally:
-        conexao.close()
+        print(f"❌ Erro ao consultar banco: {e}")
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(conexao, query, parametros, inicio, 0, e)
+        return []
+
+
+def executar_em_blocos(query, valores):
+    """Executa `query` (com um IN ({})) para todos os `valores`, em uma única transação.
+
+    Os valores são enviados em blocos de MAX_PARAMETROS. Retorna o total de linhas
+    afetadas, ou None se falhar (nesse caso nenhum bloco é gravado).
+    """
+    valores = list(valores)
+    afetadas = 0
+    inicio = time.perf_counter()
+    try:
+        with transacao() as conexao:
+            for i in range(0, len(valores), MAX_PARAMETROS):
+                bloco = valores[i:i + MAX_PARAMETROS]
+                afetadas += conexao.execute(query.format(",".join("?" * len(bloco))), bloco).rowcount
+    except Error as e:
+        print(f"❌ Erro ao executar comando em blocos: {e}")
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(None, query, (), inicio, 0, e)
+        return None
+    if INSTRUMENTACAO_ATIVA:
+        _registrar(conexao, query, (), inicio, afetadas)
+    return afetadas
 
 
-def consultar(query, parametros=()):
-    """Executa um SELECT e retorna os resultados."""
+def _linhas_em_blocos(conexao, query, valores, tipo):
+    valores = list(dict.fromkeys(valores))  # sem repetidos, na ordem recebida
+    cursor = _cursor(conexao, tipo)
+    for i in range(0, len(valores), MAX_PARAMETROS):
+        bloco = valores[i:i + MAX_PARAMETROS]
+        yield from cursor.execute(query.format(",".join("?" * len(bloco))), bloco)
+
+
+def consultar_em_blocos(query, valores, tipo=None, conexao=None):
+    """Como consultar(), para uma `query` com um IN ({}) que deve cobrir todos os `valores`.
+
+    Os valores (sem repetidos) são enviados em blocos de MAX_PARAMETROS e as linhas
+    de todos os blocos são retornadas juntas. Com `conexao` (ex.: dentro de
+    transacao()), usa essa conexão e deixa os erros para quem chamou; sem ela,
+    retorna [] se falhar.
+    """
+    if conexao is not None:
+        return list(_linhas_em_blocos(conexao, query, valores, tipo))
     conexao = conectar()
     if conexao is None:
         return []
 
+    inicio = time.perf_counter()
     try:
-        cursor = conexao.cursor()
+        resultados = list(_linhas_em_blocos(conexao, query, valores, tipo))
+    except Error as e:
+        print(f"❌ Erro ao consultar banco em blocos: {e}")
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(conexao, query, (), inicio, 0, e)
+        return []
+    if INSTRUMENTACAO_ATIVA:
+        _registrar(conexao, query, (), inicio, len(resultados))
+    return resultados
+
+
+# Linhas buscadas por vez em consultar_em_lotes
+TAMANHO_LOTE = 500
+
+
+def consultar_em_lotes(query, parametros=(), tipo=None, tamanho_lote=TAMANHO_LOTE):
+    """Como consultar(), mas gera as linhas sob demanda, buscando `tamanho_lote` por vez.
+
+    A memória usada não cresce com o tamanho do resultado. O cursor fica aberto até
+    o fim da iteração (ou até o gerador ser descartado) e usa a conexão da thread
+    atual, então o gerador deve ser consumido na thread que o criou.
+    """
+    conexao = conectar()
+    if conexao is None:
+        return
+
+    gasto = 0.0     # tempo dentro do SQLite, sem contar o do consumidor
+    linhas = 0
+    cursor = _cursor(conexao, tipo)
+    try:
+        inicio = time.perf_counter()
         cursor.execute(query, parametros)
-        resultados = cursor.fetchall()
-        return resultados
+        while True:
+            lote = cursor.fetchmany(tamanho_lote)
+            gasto += time.perf_counter() - inicio
+            if not lote:
+                break
+            linhas += len(lote)
+            yield from lote
+            inicio = time.perf_counter()
     except Error as e:
         print(f"❌ Erro ao consultar banco: {e}")
-        return []
+        if INSTRUMENTACAO_ATIVA:
+            _registrar(conexao, query, parametros, time.perf_counter() - gasto, linhas, e)
+        return
     finally:
-        conexao.close()
+        cursor.close()
+    if INSTRUMENTACAO_ATIVA:
+        _registrar(conexao, query, parametros, time.perf_counter() - gasto, linhas)
+
+
+# ===========================================================
+# Cache de leitura versionado por tabela
+# ===========================================================
+# Limite de memória do cache, em linhas somadas de todas as entradas
+CACHE_MAX_LINHAS = 250_000
+
+_versoes = Counter()                # tabela -> versão, incrementada a cada alteração
+_cache = OrderedDict()              # (query, parametros, tipo) -> (versões das tabelas, linhas), do menos ao mais usado
+_cache_linhas = 0                   # linhas somadas das entradas em _cache
+_contadores_cache = Counter()       # acertos, faltas, despejos, invalidacoes_externas
+_alteracoes_externas = 0            # commits de outras conexões percebidos (não é zerado por limpar_cache)
+_trava_cache = threading.Lock()
+
+
+def invalidar(*tabelas):
+    """Marca `tabelas` como alteradas: as entradas do cache que dependem delas deixam de valer."""
+    with _trava_cache:
+        for tabela in tabelas:
+            _versoes[tabela] += 1
+
+
+def _verificar_outras_conexoes(conexao):
+    """Esvazia o cache se outra conexão confirmou alterações desde a última leitura desta thread.
+
+    PRAGMA data_version muda quando outra conexão (de outro processo ou de outra
+    thread deste) faz COMMIT. Como não diz quais tabelas mudaram, tudo é descartado.
+    O valor só é comparável dentro da mesma conexão: na primeira leitura de uma
+    thread não há como saber o que mudou desde que o cache (compartilhado) foi
+    preenchido por outras threads, então ela também descarta tudo.
+    """
+    global _alteracoes_externas
+    versao = conexao.execute("PRAGMA data_version").fetchone()[0]
+    anterior = _local.data_version
+    _local.data_version = versao
+    if versao != anterior:
+        with _trava_cache:
+            _alteracoes_externas += 1
+            if _cache:
+                _descartar_tudo()
+                _contadores_cache["invalidacoes_externas"] += 1
+
+
+def _descartar_tudo():
+    global _cache_linhas
+    _cache.clear()
+    _cache_linhas = 0
+
+
+def _guardar(chave, versoes, linhas):
+    """Guarda o resultado e despeja as entradas menos usadas até caber no limite."""
+    global _cache_linhas
+    if len(linhas) > CACHE_MAX_LINHAS:
+        return
+    antiga = _cache.pop(chave, None)
+    if antiga is not None:
+        _cache_linhas -= len(antiga[1])
+    _cache[chave] = (versoes, linhas)
+    _cache_linhas += len(linhas)
+    while _cache_linhas > CACHE_MAX_LINHAS:
+        _, (_, despejadas) = _cache.popitem(last=False)
+        _cache_linhas -= len(despejadas)
+        _contadores_cache["despejos"] += 1
+
+
+def consultar_em_cache(query, parametros=(), tabelas=(), tipo=None):
+    """Como consultar(), mas reaproveita o resultado enquanto `tabelas` não forem alteradas.
+
+    `tabelas` lista todas as tabelas lidas pela consulta; quem as altera deve chamar
+    invalidar(). Resultados vazios (inclusive de erros) não são guardados.
+    """
+    conexao = conectar()
+    if conexao is None:
+        return []
+    _verificar_outras_conexoes(conexao)
+
+    chave = (query, tuple(parametros), tipo)
+    with _trava_cache:
+        # versões lidas antes da consulta: uma alteração concorrente invalida o que for guardado
+        versoes = tuple(_versoes[t] for t in tabelas)
+        entrada = _cache.get(chave)
+        if entrada is not None and entrada[0] == versoes:
+            _cache.move_to_end(chave)
+            _contadores_cache["acertos"] += 1
+            return list(entrada[1])
+        _contadores_cache["faltas"] += 1
+
+    linhas = consultar(query, parametros, tipo)
+    if linhas:
+        with _trava_cache:
+            _guardar(chave, versoes, linhas)
+    return list(linhas)
+
+
+def versao_tabela(tabela):
+    """Valor que muda quando `tabela` é alterada (invalidar) ou outra conexão confirma alterações.
+
+    Para caches montados fora de consultar_em_cache (ex.: índices em memória): se o
+    valor é o mesmo de quando o cache foi montado, ele ainda vale.
+    """
+    conexao = conectar()
+    if conexao is not None:
+        _verificar_outras_conexoes(conexao)
+    with _trava_cache:
+        return DB_PATH, _versoes[tabela], _alteracoes_externas
+
+
+def estatisticas_cache():
+    """Retorna entradas, linhas, limite e os contadores de acertos/faltas/despejos do cache."""
+    with _trava_cache:
+        estat = {"entradas": len(_cache), "linhas": _cache_linhas, "limite_linhas": CACHE_MAX_LINHAS}
+        for nome in ("acertos", "faltas", "despejos", "invalidacoes_externas"):
+            estat[nome] = _contadores_cache[nome]
+    consultas = estat["acertos"] + estat["faltas"]
+    estat["taxa_acerto"] = estat["acertos"] / consultas if consultas else 0.0
+    return estat
+
+
+def limpar_cache():
+    """Descarta todas as entradas e zera os contadores do cache."""
+    with _trava_cache:
+        _descartar_tudo()
+        _contadores_cache.clear()
 
 
 # ===========================================================
@@ -0,0 +1,64 @@
+"""Exportação de clientes, produtos e pedidos para arquivos CSV.
+
+Os arquivos saem no mesmo formato lido por importacao.py (cabeçalho na primeira
+linha, separador vírgula, preços em reais com ponto decimal), com a coluna id a
+mais: a importação a ignora. As linhas são lidas do banco em lotes, então a
+memória não cresce com o tamanho das tabelas.
+
+    exportar_clientes("clientes.csv")   # id, nome, email, telefone
+    exportar_produtos("produtos.csv")   # id, nome, preco_unit
+    exportar_pedidos("pedidos.csv")     # pedido, id_cliente, data, produto_id, quantidade, preco_unit
+
+Em pedidos.csv cada linha é um item e a coluna `pedido` é o id do pedido no banco;
+preco_unit é o preço da venda (a importação usa o preço cadastrado do produto).
+Pedidos sem itens não aparecem no arquivo.
+
+Cada função retorna a quantidade de linhas gravadas (sem o cabeçalho), ou None
+se o arquivo não puder ser gravado.
+"""
+import csv
+
+from db import consultar_em_lotes
+from utils import formatar_centavos
+
+
+def _exportar(caminho, cabecalho, linhas, converter=None):
+    try:
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(cabecalho)
+            gravadas = 0
+            for linha in linhas:
+                escritor.writerow(converter(linha) if converter else linha)
+                gravadas += 1
+    except OSError as e:
+        print(f"❌ Erro ao gravar {caminho}: {e}")
+        return None
+    return gravadas
+
+
+def exportar_clientes(caminho):
+    """Exporta todos os clientes (colunas id, nome, email, telefone)."""
+    return _exportar(caminho, ("id", "nome", "email", "telefone"),
+                     consultar_em_lotes("SELECT id, nome, email, telefone FROM clientes ORDER BY id"))
+
+
+def exportar_produtos(caminho):
+    """Exporta todos os produtos (colunas id, nome, preco_unit, com o preço em reais)."""
+    return _exportar(caminho, ("id", "nome", "preco_unit"),
+                     consultar_em_lotes("SELECT id, nome, preco_centavos FROM produtos ORDER BY id"),
+                     lambda p: (p[0], p[1], formatar_centavos(p[2])))
+
+
+def exportar_pedidos(caminho):
+    """Exporta os itens de todos os pedidos, agrupados por pedido (uma linha por item)."""
+    query = (
+        "SELECT p.id, p.id_cliente, p.data, ip.produto_id, ip.quantidade, ip.preco_centavos "
+        "FROM pedidos p JOIN itens_pedido ip ON ip.pedido_id = p.id ORDER BY p.id, ip.id"
+    )
+    return _exportar(caminho, ("pedido", "id_cliente", "data", "produto_id", "quantidade", "preco_unit"),
+                     consultar_em_lotes(query),
+                     lambda i: (*i[:5], formatar_centavos(i[5]) if i[5] is not None else ""))
+
+
+__all__ = ["exportar_clientes", "exportar_produtos", "exportar_pedidos"]
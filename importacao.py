@@ -0,0 +1,287 @@
+"""Importação em massa de clientes, produtos e pedidos a partir de arquivos CSV.
+
+O arquivo é lido linha a linha (a memória não cresce com o tamanho do arquivo), as
+linhas são validadas com as mesmas regras das telas e as válidas são gravadas com
+executemany, `lote` linhas por transação. A primeira linha do arquivo deve ser o
+cabeçalho; o separador (vírgula, ponto e vírgula ou tab) é detectado sozinho.
+
+    importar_clientes("clientes.csv")   # nome, email, telefone
+    importar_produtos("produtos.csv")   # nome, preco_unit
+    importar_pedidos("pedidos.csv")     # pedido, id_cliente, data, produto_id, quantidade
+
+Em pedidos.csv cada linha é um item; linhas seguidas com o mesmo valor na coluna
+`pedido` (uma referência qualquer do arquivo, não o id do banco) formam um pedido;
+cada item recebe o preço cadastrado do produto e o total do pedido é somado pelos
+gatilhos de itens_pedido.
+
+Cada função retorna um dict com lidas, importadas, rejeitadas e erros (lista de
+LinhaRejeitada), ou None se o arquivo não puder ser lido (os lotes já gravados
+até o erro de leitura permanecem no banco).
+"""
+import csv
+from collections import namedtuple
+from sqlite3 import Error
+
+from db import consultar_em_blocos, inserir_clientes_em_massa, inserir_itens_em_massa, invalidar, transacao
+from utils import para_centavos, validar_data, validar_email, validar_telefone
+
+LOTE = 5000          # linhas gravadas por transação
+MAX_ERROS = 1000     # linhas rejeitadas guardadas no resultado (as demais só são contadas)
+
+# numero: linha no arquivo (o cabeçalho é a linha 1); valores: campos lidos do CSV
+LinhaRejeitada = namedtuple("LinhaRejeitada", "numero motivo valores")
+
+
+class _Resultado(dict):
+    """Contadores da importação e as primeiras MAX_ERROS linhas rejeitadas."""
+
+    def __init__(self):
+        super().__init__(lidas=0, importadas=0, rejeitadas=0, erros=[])
+
+    def rejeitar(self, numero, motivo, valores, quantidade=1):
+        self["rejeitadas"] += quantidade
+        if len(self["erros"]) < MAX_ERROS:
+            self["erros"].append(LinhaRejeitada(numero, motivo, valores))
+
+
+def _ler(caminho, colunas):
+    """Gera (número da linha, [campos em `colunas`]) de cada linha não vazia do arquivo."""
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.reader(arquivo, dialeto)
+        cabecalho = [c.strip().lower() for c in next(leitor, [])]
+        faltando = [c for c in colunas if c not in cabecalho]
+        if faltando:
+            raise ValueError(f"colunas ausentes no cabeçalho: {', '.join(faltando)}")
+        indices = [cabecalho.index(c) for c in colunas]
+        ultimo = max(indices)
+        for numero, valores in enumerate(leitor, start=2):
+            if not any(valores):
+                continue
+            if len(valores) <= ultimo:
+                valores = valores + [""] * (ultimo + 1 - len(valores))
+            yield numero, [valores[i].strip() for i in indices]
+
+
+def _importar_linhas(caminho, colunas, converter, inserir, tabela, ao_progredir, lote):
+    """Importação de tabelas sem dependências: uma linha do CSV vira uma linha da tabela.
+
+    `inserir(conn, linhas)` grava um lote dentro da transação.
+    """
+    resultado = _Resultado()
+    pendentes = []
+    primeira = None
+
+    def gravar():
+        try:
+            with transacao() as conn:
+                inserir(conn, pendentes)
+            resultado["importadas"] += len(pendentes)
+        except Error as e:
+            print(f"❌ Erro ao importar lote a partir da linha {primeira}: {e}")
+            resultado.rejeitar(primeira, f"lote rejeitado pelo banco: {e}", None, len(pendentes))
+        pendentes.clear()
+        if ao_progredir:
+            ao_progredir(resultado["lidas"], resultado["importadas"], resultado["rejeitadas"])
+
+    try:
+        for numero, campos in _ler(caminho, colunas):
+            resultado["lidas"] += 1
+            try:
+                linha = converter(*campos)
+            except ValueError as e:
+                resultado.rejeitar(numero, str(e), campos)
+                continue
+            if not pendentes:
+                primeira = numero
+            pendentes.append(linha)
+            if len(pendentes) >= lote:
+                gravar()
+    except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+        print(f"❌ Erro ao ler {caminho}: {e}")
+        return None
+    finally:
+        if pendentes:
+            gravar()
+        if resultado["importadas"]:
+            invalidar(tabela)
+    return resultado
+
+
+# ===========================================================
+# Clientes e produtos
+# ===========================================================
+def _cliente(nome, email, telefone):
+    if not nome:
+        raise ValueError("nome obrigatório")
+    if email and not validar_email(email):
+        raise ValueError("email inválido")
+    if telefone and not validar_telefone(telefone):
+        raise ValueError("telefone inválido")
+    return (nome, email, telefone)
+
+
+def _produto(nome, preco):
+    if not nome:
+        raise ValueError("nome obrigatório")
+    try:
+        # preço em reais no arquivo (aceita vírgula decimal: 12,50), centavos no banco
+        preco_centavos = para_centavos(preco)
+    except ValueError:
+        raise ValueError("preço deve ser numérico") from None
+    return (nome, preco_centavos)
+
+
+def importar_clientes(caminho, ao_progredir=None, lote=LOTE):
+    """Importa clientes (colunas nome, email, telefone).
+
+    `ao_progredir(lidas, importadas, rejeitadas)` é chamada após cada lote gravado.
+    """
+    return _importar_linhas(caminho, ("nome", "email", "telefone"), _cliente, inserir_clientes_em_massa,
+                            "clientes", ao_progredir, lote)
+
+
+def importar_produtos(caminho, ao_progredir=None, lote=LOTE):
+    """Importa produtos (colunas nome, preco_unit, com o preço em reais).
+
+    `ao_progredir(lidas, importadas, rejeitadas)` é chamada após cada lote gravado.
+    """
+    def inserir(conn, produtos):
+        conn.executemany("INSERT INTO produtos (nome, preco_centavos) VALUES (?, ?)", produtos)
+
+    return _importar_linhas(caminho, ("nome", "preco_unit"), _produto, inserir, "produtos", ao_progredir, lote)
+
+
+# ===========================================================
+# Pedidos
+# ===========================================================
+def _existentes(conn, sql, ids):
+    """Executa `sql` (com um IN ({})) para os `ids` em blocos e retorna {id: linha}."""
+    return {linha[0]: linha for linha in consultar_em_blocos(sql, ids, conexao=conn)}
+
+
+def _pedidos(linhas, resultado):
+    """Agrupa as linhas seguidas de um mesmo pedido.
+
+    Gera (número da 1ª linha, (id_cliente, data), itens, erro, quantidade de linhas),
+    onde erro é None ou (número da linha, motivo) da primeira linha inválida.
+    """
+    atual = None
+    for numero, (ref, id_cliente, data, produto_id, quantidade) in linhas:
+        resultado["lidas"] += 1
+        if atual is None or ref != atual[0]:
+            if atual is not None:
+                yield tuple(atual[1:])
+            atual = [ref, numero, (id_cliente, data), [], None, 0]
+        atual[5] += 1
+        if atual[4] is not None:
+            continue  # pedido já rejeitado: as demais linhas dele também são descartadas
+        try:
+            if not ref:
+                raise ValueError("referência do pedido obrigatória")
+            if not validar_data(atual[2][1]):
+                raise ValueError("data inválida (use YYYY-MM-DD)")
+            try:
+                item = (int(produto_id), int(quantidade))
+                int(atual[2][0])
+            except ValueError:
+                raise ValueError("id_cliente, produto_id e quantidade devem ser inteiros") from None
+            if item[1] <= 0:
+                raise ValueError("quantidade deve ser positiva")
+        except ValueError as e:
+            atual[4] = (numero, str(e))
+            continue
+        atual[3].append(item)
+    if atual is not None:
+        yield tuple(atual[1:])
+
+
+def importar_pedidos(caminho, ao_progredir=None, lote=LOTE):
+    """Importa pedidos e seus itens (colunas pedido, id_cliente, data, produto_id, quantidade).
+
+    Um pedido com qualquer linha inválida, cliente inexistente ou produto
+    inexistente é rejeitado por inteiro. `ao_progredir(lidas, importadas,
+    rejeitadas)` é chamada após cada lote; importadas conta pedidos, as demais linhas.
+    """
+    resultado = _Resultado()
+    pendentes = []   # (número da 1ª linha, (id_cliente, data), itens)
+
+    def gravar():
+        rejeitados = []  # só entram no resultado se o lote for confirmado
+        try:
+            # BEGIN IMMEDIATE: os ids lidos abaixo não podem ser tomados por outra conexão
+            with transacao(imediata=True) as conn:
+                clientes = _existentes(conn, "SELECT id FROM clientes WHERE id IN ({})",
+                                       {int(c) for _, (c, _), _ in pendentes})
+                precos = _existentes(conn, "SELECT id, preco_centavos FROM produtos WHERE id IN ({})",
+                                     {p for _, _, itens in pendentes for p, _ in itens})
+                # ids atribuídos aqui para ligar os itens sem um INSERT por pedido; a
+                # leitura e as gravações ficam na mesma transação
+                proximo = conn.execute(
+                    "SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name='pedidos'), 0), "
+                    "COALESCE((SELECT MAX(id) FROM pedidos), 0))"
+                ).fetchone()[0] + 1
+                pedidos, itens = [], []
+                for numero, (id_cliente, data), itens_pedido in pendentes:
+                    if int(id_cliente) not in clientes:
+                        rejeitados.append((numero, f"cliente {id_cliente} não existe", len(itens_pedido)))
+                        continue
+                    faltando = [p for p, _ in itens_pedido if p not in precos]
+                    if faltando:
+                        rejeitados.append((numero, f"produto {faltando[0]} não existe", len(itens_pedido)))
+                        continue
+                    pedidos.append((proximo, int(id_cliente), data))
+                    itens.extend((proximo, p, q, precos[p][1]) for p, q in itens_pedido)
+                    proximo += 1
+                conn.executemany("INSERT INTO pedidos (id, id_cliente, data) VALUES (?, ?, ?)", pedidos)
+                inserir_itens_em_massa(conn, itens)
+            resultado["importadas"] += len(pedidos)
+            for numero, motivo, quantidade in rejeitados:
+                resultado.rejeitar(numero, motivo, None, quantidade)
+        except Error as e:
+            # o lote inteiro (inclusive os pedidos já recusados acima) é contado uma vez
+            print(f"❌ Erro ao importar lote a partir da linha {pendentes[0][0]}: {e}")
+            resultado.rejeitar(pendentes[0][0], f"lote rejeitado pelo banco: {e}", None,
+                               sum(len(i) for _, _, i in pendentes))
+        pendentes.clear()
+        if ao_progredir:
+            ao_progredir(resultado["lidas"], resultado["importadas"], resultado["rejeitadas"])
+
+    linhas_no_lote = 0
+    try:
+        linhas = _ler(caminho, ("pedido", "id_cliente", "data", "produto_id", "quantidade"))
+        for numero, cabecalho, itens, erro, n_linhas in _pedidos(linhas, resultado):
+            if erro is not None:
+                resultado.rejeitar(erro[0], erro[1], None, n_linhas)
+                continue
+            pendentes.append((numero, cabecalho, itens))
+            linhas_no_lote += len(itens)
+            if linhas_no_lote >= lote:
+                gravar()
+                linhas_no_lote = 0
+    except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+        print(f"❌ Erro ao ler {caminho}: {e}")
+        return None
+    finally:
+        if pendentes:
+            gravar()
+        if resultado["importadas"]:
+            invalidar("pedidos", "itens_pedido")
+    return resultado
+
+
+def gravar_rejeitadas(resultado, caminho):
+    """Grava as linhas rejeitadas de uma importação em CSV (numero, motivo, valores...)."""
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["numero", "motivo", "valores"])
+        for erro in resultado["erros"]:
+            escritor.writerow([erro.numero, erro.motivo, *(erro.valores or ())])
+
+
+__all__ = ["LinhaRejeitada", "importar_clientes", "importar_produtos", "importar_pedidos", "gravar_rejeitadas"]
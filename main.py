@@ -1,15 +1,25 @@
+import os
+import time
 import tkinter as tk
+from importlib import import_module
+from importlib.util import find_spec
 from tkinter import ttk
 from db import inicializar_banco
-from views.clientes_view import ClientesView
-from views.pedidos_view import PedidosView
-from views.dashboard_view import DashboardView
-# nova view de produtos
-try:
-    from views.produtos_view import ProdutosView
-    has_produtos_view = True
-except Exception:
-    has_produtos_view = False
+
+# Views da navegação: (texto do botão, módulo, classe). Os módulos só são
+# importados, e as views só são construídas, no primeiro clique do botão.
+VIEWS = [
+    ("📊 Dashboard", "views.dashboard_view", "DashboardView"),
+    ("👥 Clientes", "views.clientes_view", "ClientesView"),
+    ("🧾 Pedidos", "views.pedidos_view", "PedidosView"),
+    ("📦 Produtos", "views.produtos_view", "ProdutosView"),
+    ("📈 Relatórios", "views.relatorios_view", "RelatoriosView"),
+    ("🩺 Diagnóstico", "views.diagnostico_view", "DiagnosticoView"),
+]
+
+# Quando definida, main() imprime o instante da primeira pintura da janela e
+# encerra (usado por benchmarks/bench_inicializacao.py).
+MEDIR_INICIO = os.environ.get("GESTAO_MEDIR_INICIO")
 
 
 def main():
@@ -158,29 +168,25 @@ def main():
     content = ttk.Frame(main_frame)
     content.pack(side="left", fill="both", expand=True)
 
-    # Cria frames para cada view e empilha (serão levantados quando selecionados)
-    frame_dashboard = ttk.Frame(content)
-    frame_clientes = ttk.Frame(content)
-    frame_pedidos = ttk.Frame(content)
-    frame_produtos = ttk.Frame(content) if has_produtos_view else None
-
-    frames_to_pack = [frame_dashboard, frame_clientes, frame_pedidos]
-    if frame_produtos:
-        frames_to_pack.append(frame_produtos)
+    # Cria um frame vazio para cada view (a view em si é criada sob demanda)
+    # a view de produtos é opcional: só entra na navegação se o módulo existir
+    views = [v for v in VIEWS if find_spec(v[1]) is not None]
+    frames = tuple(ttk.Frame(content) for _ in views)
     # Não empacotar os frames agora — iremos empacotar apenas o frame ativo
-    # lista de frames usada para navegação
-    frames = tuple(frames_to_pack)
+    construidas = set()
 
-    # Instancia as views dentro dos frames correspondentes
-    DashboardView(frame_dashboard)
-    ClientesView(frame_clientes)
-    PedidosView(frame_pedidos)
-    if frame_produtos:
-        ProdutosView(frame_produtos)
+    def construir_view(frame, modulo, classe):
+        """Importa o módulo e instancia a view no frame, apenas na primeira vez."""
+        if frame in construidas:
+            return
+        construidas.add(frame)
+        getattr(import_module(modulo), classe)(frame)
 
     # Função auxiliar para trocar a view ativa: esconde as outras e mostra apenas a selecionada
 
     def show_frame(frame):
+        _, modulo, classe = views[frames.index(frame)]
+        construir_view(frame, modulo, classe)
         for f in frames:
             if f is frame:
                 # (re)empacota para garantir que esteja visível
@@ -200,23 +206,13 @@ def main():
     # Botões da nav
     # Botões com ícones (uso de emoji simples para compatibilidade)
     # Usa o estilo Nav.TButton e ancora o texto à esquerda
-    btn_dash = ttk.Button(nav, text="📊 Dashboard", style="Nav.TButton", command=lambda: show_frame(frame_dashboard))
-    btn_clients = ttk.Button(nav, text="👥 Clientes", style="Nav.TButton", command=lambda: show_frame(frame_clientes))
-    btn_orders = ttk.Button(nav, text="🧾 Pedidos", style="Nav.TButton", command=lambda: show_frame(frame_pedidos))
-    if frame_produtos:
-        btn_produtos = ttk.Button(nav, text="📦 Produtos", style="Nav.TButton", command=lambda: show_frame(frame_produtos))
-
-    # Posiciona botões (com espaçamento)
-    btn_dash.pack(fill="x", pady=(12, 6), padx=12)
-    btn_clients.pack(fill="x", pady=6, padx=12)
-    btn_orders.pack(fill="x", pady=6, padx=12)
-    if frame_produtos:
-        btn_produtos.pack(fill="x", pady=6, padx=12)
-
     # Mantém referência aos botões para permitir destaque do ativo
-    nav_buttons = {frame_dashboard: btn_dash, frame_clientes: btn_clients, frame_pedidos: btn_orders}
-    if frame_produtos:
-        nav_buttons[frame_produtos] = btn_produtos
+    nav_buttons = {}
+    for i, (frame, (texto, _, _)) in enumerate(zip(frames, views)):
+        btn = ttk.Button(nav, text=texto, style="Nav.TButton", command=lambda f=frame: show_frame(f))
+        # Posiciona botões (com espaçamento)
+        btn.pack(fill="x", pady=(12, 6) if i == 0 else 6, padx=12)
+        nav_buttons[frame] = btn
 
     def highlight_active(frame):
         for fr, btn in nav_buttons.items():
@@ -226,8 +222,20 @@ def main():
                 btn.state(["!pressed"])
 
     # Mostra dashboard por padrão
-    show_frame(frame_dashboard)
-    highlight_active(frame_dashboard)
+    show_frame(frames[0])
+
+    if MEDIR_INICIO:
+        # o primeiro <Expose> indica que a janela foi mapeada; o redesenho dos
+        # widgets acontece nas tarefas ociosas, então medimos logo depois delas
+        def primeira_pintura():
+            print(f"PRIMEIRA_PINTURA {time.time():.6f}", flush=True)
+            root.destroy()
+
+        def ao_expor(_evento):
+            root.unbind("<Expose>")
+            root.after_idle(primeira_pintura)
+
+        root.bind("<Expose>", ao_expor)
 
     root.mainloop()
 
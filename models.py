@@ -2,76 +2,330 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from db import executar_query, consultar
+from collections import namedtuple
+from sqlite3 import Error
+
+from db import (executar_comando, executar_em_blocos, consultar, consultar_em_blocos, consultar_em_cache,
+                consultar_em_lotes, invalidar, transacao, tokenizador_busca_clientes)
+
+
+# ===========================================================
+# Tipos de linha
+# ===========================================================
+# Tuplas nomeadas montadas pela row factory de db.py: ocupam o mesmo espaço de uma
+# tupla comum, continuam indexáveis por posição (c[1]) e também por nome (c.nome).
+LinhaCliente = namedtuple("LinhaCliente", "id nome email telefone")
+LinhaPedido = namedtuple("LinhaPedido", "id id_cliente data total_centavos qtd_itens")
+LinhaPedidoCliente = namedtuple("LinhaPedidoCliente", "id cliente data total_centavos qtd_itens")
+LinhaItemPedido = namedtuple("LinhaItemPedido", "id pedido_id produto_id quantidade")
+LinhaItemProduto = namedtuple("LinhaItemProduto", "id produto_id nome preco_centavos quantidade subtotal_centavos")
+LinhaProduto = namedtuple("LinhaProduto", "id nome preco_centavos")
+
+
+def _gravar(modelo, query, parametros):
+    """Executa o INSERT/UPDATE de `modelo` e retorna a linha gravada (ou None se falhar).
+
+    Em inserções, o id gerado é atribuído a modelo.id. A tabela do modelo
+    (modelo.TABELA) é invalidada no cache de leitura.
+    """
+    cursor = executar_comando(query, parametros)
+    if cursor is None:
+        return None
+    invalidar(modelo.TABELA)
+    if not modelo.id:
+        modelo.id = cursor.lastrowid
+    return modelo.como_linha()
+
+
+def _remover(tabela, id_):
+    """Remove a linha `id_` de `tabela` e retorna o id removido (ou None se nenhuma linha foi removida)."""
+    cursor = executar_comando(f"DELETE FROM {tabela} WHERE id=?", (id_,))
+    if cursor is None or cursor.rowcount == 0:
+        return None
+    invalidar(tabela)
+    return id_
+
+
+def _remover_varios(tabela, ids):
+    """Remove as linhas `ids` de `tabela` em uma única transação (DELETE ... IN em blocos).
+
+    Retorna quantas linhas foram removidas, ou None se falhar (nada é removido).
+    """
+    removidas = executar_em_blocos(f"DELETE FROM {tabela} WHERE id IN ({{}})", ids)
+    if removidas:
+        invalidar(tabela)
+    return removidas
+
+
+def _por_chave(query, chaves, tipo, posicao=0):
+    """Busca as linhas de `query` (com um IN ({})) para todas as `chaves`, em blocos.
+
+    Retorna {chave: linha}, com a chave lida da coluna `posicao`; chaves sem linha
+    ficam de fora. Quando mais de uma linha tem a mesma chave, vale a última.
+    """
+    return {linha[posicao]: linha for linha in consultar_em_blocos(query, chaves, tipo)}
 
 
 # ===========================================================
 # Modelo: Cliente
 # ===========================================================
 class Cliente:
+    TABELA = "clientes"
+
     def __init__(self, nome, email, telefone, id=None):
         self.id = id
         self.nome = nome
         self.email = email
         self.telefone = telefone
 
+    def como_linha(self):
+        """Linha no mesmo formato de listar(): LinhaCliente(id, nome, email, telefone)."""
+        return LinhaCliente(self.id, self.nome, self.email, self.telefone)
+
     def salvar(self):
-        """Insere ou atualiza o cliente no banco."""
+        """Insere ou atualiza o cliente no banco. Retorna a linha gravada ou None."""
         if self.id:
             query = "UPDATE clientes SET nome=?, email=?, telefone=? WHERE id=?"
             parametros = (self.nome, self.email, self.telefone, self.id)
         else:
             query = "INSERT INTO clientes (nome, email, telefone) VALUES (?, ?, ?)"
             parametros = (self.nome, self.email, self.telefone)
-        return executar_query(query, parametros)
+        return _gravar(self, query, parametros)
 
     @staticmethod
     def listar():
-        """Retorna todos os clientes."""
-        return consultar("SELECT * FROM clientes")
+        """Retorna todos os clientes (do cache de leitura enquanto a tabela não mudar)."""
+        return consultar_em_cache("SELECT id, nome, email, telefone FROM clientes", tabelas=("clientes",),
+                                  tipo=LinhaCliente)
+
+    @staticmethod
+    def listar_pagina(depois_de=None, limite=100):
+        """Retorna até `limite` clientes em ordem de id, a partir do primeiro id maior que `depois_de`."""
+        query = "SELECT id, nome, email, telefone FROM clientes WHERE id > ? ORDER BY id LIMIT ?"
+        return consultar(query, (depois_de or 0, limite), LinhaCliente)
+
+    @staticmethod
+    def iterar():
+        """Gera todos os clientes sob demanda, em lotes (memória constante)."""
+        return consultar_em_lotes("SELECT id, nome, email, telefone FROM clientes", tipo=LinhaCliente)
+
+    @staticmethod
+    def buscar_por_ids(ids):
+        """Retorna {id: LinhaCliente} dos clientes `ids` que existem (IN em blocos, sem uma consulta por id)."""
+        return _por_chave("SELECT id, nome, email, telefone FROM clientes WHERE id IN ({})", ids, LinhaCliente)
+
+    @staticmethod
+    def buscar_por_nomes(nomes):
+        """Retorna {nome: LinhaCliente} dos clientes com esses nomes.
+
+        A comparação não diferencia maiúsculas (usa o índice idx_clientes_nome) e a
+        chave é o nome como está cadastrado; com nomes repetidos, vale o de menor id.
+        """
+        return _por_chave("SELECT id, nome, email, telefone FROM clientes "
+                          "WHERE nome COLLATE NOCASE IN ({}) ORDER BY id DESC", nomes, LinhaCliente, 1)
 
     @staticmethod
     def pesquisar_por_email(email_parcial):
         """Pesquisa clientes pelo email (parcial ou completo)."""
         like_pattern = f"%{email_parcial}%"
-        query = "SELECT * FROM clientes WHERE email LIKE ?"
-        return consultar(query, (like_pattern,))
+        query = "SELECT id, nome, email, telefone FROM clientes WHERE email LIKE ?"
+        return consultar(query, (like_pattern,), LinhaCliente)
+
+    @staticmethod
+    def pesquisar(termo, limite=100):
+        """Pesquisa clientes por nome, email ou telefone, com os mais relevantes primeiro.
+
+        Usa o índice FTS5 clientes_fts quando existir. Com o tokenizador trigram,
+        termos de menos de 3 caracteres não têm trigramas e são procurados nas três
+        colunas com casefold (como em Pedido.pesquisar_por_cliente: LIKE só ignora
+        maiúsculas em ASCII). Sem FTS5, mantém o comportamento de pesquisar_por_email.
+        """
+        termo = termo.strip()
+        tokenizador = tokenizador_busca_clientes()
+        if tokenizador is None:
+            return Cliente.pesquisar_por_email(termo)
+        if tokenizador == "trigram" and len(termo) < 3:
+            query = ("SELECT id, nome, email, telefone FROM clientes "
+                     "WHERE instr(casefold(nome), ?1) > 0 OR instr(casefold(email), ?1) > 0 "
+                     "OR instr(casefold(telefone), ?1) > 0 LIMIT ?2")
+            return consultar(query, (termo.casefold(), limite), LinhaCliente)
+        # termo entre aspas: pesquisado como frase, sem interpretar operadores do FTS5
+        frase = '"' + termo.replace('"', '""') + '"'
+        query = (
+            "SELECT c.id, c.nome, c.email, c.telefone FROM clientes_fts f JOIN clientes c ON c.id = f.rowid "
+            "WHERE clientes_fts MATCH ? ORDER BY f.rank LIMIT ?"
+        )
+        return consultar(query, (frase, limite), LinhaCliente)
 
     @staticmethod
     def deletar(cliente_id):
-        """Remove um cliente."""
-        return executar_query("DELETE FROM clientes WHERE id=?", (cliente_id,))
+        """Remove um cliente. Retorna o id removido ou None."""
+        return _remover(Cliente.TABELA, cliente_id)
+
+    @staticmethod
+    def deletar_varios(ids):
+        """Remove vários clientes em uma transação. Retorna quantos foram removidos ou None."""
+        return _remover_varios(Cliente.TABELA, ids)
 
 
 # ===========================================================
 # Modelo: Pedido
 # ===========================================================
 class Pedido:
-    def __init__(self, id_cliente, data, total=0, id=None):
+    """Pedido de um cliente.
+
+    total_centavos e qtd_itens são mantidos pelos gatilhos de itens_pedido (ver
+    db.GATILHOS_TOTAIS_PEDIDOS): aqui são apenas lidos do banco, nunca gravados.
+    """
+
+    TABELA = "pedidos"
+
+    def __init__(self, id_cliente, data, total=None, id=None):
+        # `total` fica na 3ª posição só por compatibilidade com Pedido(cliente, data, total, id):
+        # é ignorado, pois o total é calculado pelos gatilhos a partir dos itens
         self.id = id
         self.id_cliente = id_cliente
         self.data = data
-        self.total = total
+        self.total_centavos = 0
+        self.qtd_itens = 0
+
+    def como_linha(self):
+        """Linha no mesmo formato de listar(): LinhaPedido(id, id_cliente, data, total_centavos, qtd_itens)."""
+        return LinhaPedido(self.id, self.id_cliente, self.data, self.total_centavos, self.qtd_itens)
+
+    def _ler_totais(self, conn=None):
+        """Atualiza total_centavos e qtd_itens com os valores calculados pelos gatilhos."""
+        sql = "SELECT total_centavos, qtd_itens FROM pedidos WHERE id=?"
+        if conn is not None:
+            linha = conn.execute(sql, (self.id,)).fetchone()
+        else:
+            linhas = consultar(sql, (self.id,))
+            linha = linhas[0] if linhas else None
+        if linha is not None:
+            self.total_centavos, self.qtd_itens = linha
 
     def salvar(self):
-        """Insere ou atualiza um pedido."""
+        """Insere ou atualiza um pedido (cliente e data). Retorna a linha gravada ou None."""
         if self.id:
-            query = "UPDATE pedidos SET id_cliente=?, data=?, total=? WHERE id=?"
-            parametros = (self.id_cliente, self.data, self.total, self.id)
+            query = "UPDATE pedidos SET id_cliente=?, data=? WHERE id=?"
+            parametros = (self.id_cliente, self.data, self.id)
         else:
-            query = "INSERT INTO pedidos (id_cliente, data, total) VALUES (?, ?, ?)"
-            parametros = (self.id_cliente, self.data, self.total)
-        return executar_query(query, parametros)
+            query = "INSERT INTO pedidos (id_cliente, data) VALUES (?, ?)"
+            parametros = (self.id_cliente, self.data)
+        novo = not self.id
+        linha = _gravar(self, query, parametros)
+        if linha is None or novo:
+            return linha
+        self._ler_totais()
+        return self.como_linha()
+
+    def salvar_com_itens(self, itens):
+        """Insere o pedido e todos os seus itens em uma única transação.
+
+        `itens` é uma sequência de (produto_id, quantidade); o preço de cada item é o
+        preço atual do produto. Retorna o id do novo pedido (também atribuído a
+        self.id, com total_centavos e qtd_itens lidos do banco), ou None se nada foi gravado.
+        """
+        try:
+            with transacao() as conn:
+                cursor = conn.execute("INSERT INTO pedidos (id_cliente, data) VALUES (?, ?)",
+                                      (self.id_cliente, self.data))
+                self.id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO itens_pedido (pedido_id, produto_id, quantidade) VALUES (?, ?, ?)",
+                    ((self.id, produto_id, quantidade) for produto_id, quantidade in itens),
+                )
+                self._ler_totais(conn)
+        except Error as e:
+            print(f"❌ Erro ao salvar pedido: {e}")
+            self.id = None
+            return None
+        invalidar(Pedido.TABELA, ItemPedido.TABELA)
+        return self.id
 
     @staticmethod
     def listar():
         """Retorna todos os pedidos."""
-        return consultar("SELECT * FROM pedidos")
+        return consultar("SELECT id, id_cliente, data, total_centavos, qtd_itens FROM pedidos", tipo=LinhaPedido)
+
+    @staticmethod
+    def iterar():
+        """Gera todos os pedidos sob demanda, em lotes (memória constante)."""
+        return consultar_em_lotes("SELECT id, id_cliente, data, total_centavos, qtd_itens FROM pedidos",
+                                  tipo=LinhaPedido)
+
+    @staticmethod
+    def buscar_por_ids(ids):
+        """Retorna {id: LinhaPedido} dos pedidos `ids` que existem (IN em blocos, sem uma consulta por id)."""
+        return _por_chave("SELECT id, id_cliente, data, total_centavos, qtd_itens FROM pedidos WHERE id IN ({})",
+                          ids, LinhaPedido)
+
+    # Pedidos com o nome do cliente resolvido no próprio SQL:
+    # LinhaPedidoCliente(id, cliente, data, total_centavos, qtd_itens)
+    _SELECT_COM_CLIENTE = (
+        "SELECT p.id, c.nome, p.data, p.total_centavos, p.qtd_itens "
+        "FROM pedidos p LEFT JOIN clientes c ON c.id = p.id_cliente "
+    )
+
+    @staticmethod
+    def listar_pagina(antes_de=None, depois_de=None, limite=200):
+        """Retorna uma página de pedidos (id, cliente, data, total_centavos, qtd_itens) usando paginação por chave.
+
+        - sem argumentos: os `limite` pedidos mais recentes (id decrescente);
+        - antes_de=id: os próximos pedidos mais antigos que `id` (id decrescente);
+        - depois_de=id: os pedidos mais novos que `id`, em ordem crescente de id
+          (usado ao rolar a lista de volta para cima).
+
+        `cliente` é None quando o cliente do pedido não existe mais.
+        """
+        sql = Pedido._SELECT_COM_CLIENTE
+        if depois_de is not None:
+            return consultar(sql + "WHERE p.id > ? ORDER BY p.id ASC LIMIT ?", (depois_de, limite), LinhaPedidoCliente)
+        if antes_de is not None:
+            return consultar(sql + "WHERE p.id < ? ORDER BY p.id DESC LIMIT ?", (antes_de, limite), LinhaPedidoCliente)
+        return consultar(sql + "ORDER BY p.id DESC LIMIT ?", (limite,), LinhaPedidoCliente)
+
+    @staticmethod
+    def pesquisar_por_cliente(termo, limite=500):
+        """Pesquisa pedidos pelo nome do cliente (parcial, sem diferenciar maiúsculas, inclusive acentuadas).
+
+        Retorna até `limite` linhas (id, cliente, data, total_centavos, qtd_itens), dos pedidos mais
+        recentes para os mais antigos. Com o índice trigram de clientes, os clientes vêm
+        da coluna nome de clientes_fts; sem ele (ou com termos de 1-2 caracteres), da
+        comparação de casefold(nome). Os pedidos são buscados pelo índice de pedidos.id_cliente.
+        """
+        termo = termo.strip()
+        if tokenizador_busca_clientes() == "trigram" and len(termo) >= 3:
+            filtro = "c.id IN (SELECT rowid FROM clientes_fts WHERE clientes_fts MATCH ?)"
+            # só a coluna nome; termo entre aspas: pesquisado como frase, sem operadores do FTS5
+            valor = '{nome} : "' + termo.replace('"', '""') + '"'
+        else:
+            filtro = "instr(casefold(c.nome), ?) > 0"
+            valor = termo.casefold()
+        # CROSS JOIN fixa a ordem: sem ele o SQLite prefere percorrer pedidos inteiro
+        # em ordem de id (por causa do ORDER BY ... LIMIT) quando há poucos resultados
+        query = (
+            "SELECT p.id, c.nome, p.data, p.total_centavos, p.qtd_itens "
+            "FROM clientes c CROSS JOIN pedidos p ON p.id_cliente = c.id "
+            f"WHERE {filtro} ORDER BY p.id DESC LIMIT ?"
+        )
+        return consultar(query, (valor, limite), LinhaPedidoCliente)
 
     @staticmethod
     def deletar(pedido_id):
-        """Remove um pedido."""
-        return executar_query("DELETE FROM pedidos WHERE id=?", (pedido_id,))
+        """Remove um pedido e seus itens (gatilho pedidos_itens_ad). Retorna o id removido ou None."""
+        removido = _remover(Pedido.TABELA, pedido_id)
+        if removido is not None:
+            invalidar(ItemPedido.TABELA)
+        return removido
+
+    @staticmethod
+    def deletar_varios(ids):
+        """Remove vários pedidos e seus itens em uma transação. Retorna quantos pedidos foram removidos ou None."""
+        removidos = _remover_varios(Pedido.TABELA, ids)
+        if removidos:
+            invalidar(ItemPedido.TABELA)
+        return removidos
 
 
 # ===========================================================
@@ -79,60 +333,120 @@ class Pedido:
 # ===========================================================
 
 class ItemPedido:
+    TABELA = "itens_pedido"
+
     def __init__(self, pedido_id, produto_id, quantidade, id=None):
         self.id = id
         self.pedido_id = pedido_id
         self.produto_id = produto_id
         self.quantidade = quantidade
 
+    def como_linha(self):
+        """Linha da tabela itens_pedido: LinhaItemPedido(id, pedido_id, produto_id, quantidade)."""
+        return LinhaItemPedido(self.id, self.pedido_id, self.produto_id, self.quantidade)
+
     def salvar(self):
-        """Insere ou atualiza um item do pedido. Apenas produto_id e quantidade são armazenados;
-        nome e preço são obtidos via join com a tabela produtos quando necessário."""
+        """Insere ou atualiza um item do pedido. O preço unitário é o preço atual do produto,
+        gravado na inserção (e na troca de produto); o nome vem do join com produtos.
+        O total do pedido é ajustado pelos gatilhos. Retorna a linha gravada ou None."""
         if self.id:
-            query = "UPDATE itens_pedido SET pedido_id=?, produto_id=?, quantidade=? WHERE id=?"
-            parametros = (self.pedido_id, self.produto_id, self.quantidade, self.id)
+            query = (
+                "UPDATE itens_pedido SET pedido_id=?, produto_id=?, quantidade=?, preco_centavos=CASE "
+                "WHEN produto_id = ? THEN preco_centavos "
+                "ELSE (SELECT preco_centavos FROM produtos WHERE id = ?) END WHERE id=?"
+            )
+            parametros = (self.pedido_id, self.produto_id, self.quantidade, self.produto_id, self.produto_id,
+                          self.id)
         else:
             query = "INSERT INTO itens_pedido (pedido_id, produto_id, quantidade) VALUES (?, ?, ?)"
             parametros = (self.pedido_id, self.produto_id, self.quantidade)
-        return executar_query(query, parametros)
+        linha = _gravar(self, query, parametros)
+        if linha is not None:
+            invalidar(Pedido.TABELA)
+        return linha
 
     @staticmethod
     def listar_por_pedido(pedido_id):
-        """Lista todos os itens de um pedido com dados do produto via JOIN (id, produto_id, nome, preco_unit, quantidade)."""
+        """Lista todos os itens de um pedido com o nome do produto via JOIN.
+
+        Retorna LinhaItemProduto(id, produto_id, nome, preco_centavos, quantidade,
+        subtotal_centavos), com o preço unitário da venda e o subtotal calculado no SQL.
+        """
         query = (
-            "SELECT ip.id, ip.produto_id, p.nome, p.preco_unit, ip.quantidade "
+            "SELECT ip.id, ip.produto_id, p.nome, ip.preco_centavos, ip.quantidade, "
+            "ip.quantidade * ip.preco_centavos "
             "FROM itens_pedido ip JOIN produtos p ON ip.produto_id = p.id WHERE ip.pedido_id = ?"
         )
-        return consultar(query, (pedido_id,))
+        return consultar(query, (pedido_id,), LinhaItemProduto)
 
     @staticmethod
     def deletar(item_id):
-        """Remove um item do pedido."""
-        return executar_query("DELETE FROM itens_pedido WHERE id=?", (item_id,))
+        """Remove um item do pedido (os gatilhos descontam o item do total). Retorna o id removido ou None."""
+        removido = _remover(ItemPedido.TABELA, item_id)
+        if removido is not None:
+            invalidar(Pedido.TABELA)
+        return removido
 
 
 # ===========================================================
 # Modelo: Produto
 # ===========================================================
 class Produto:
-    def __init__(self, nome, preco_unit, id=None):
+    """Produto do catálogo; o preço unitário é guardado em centavos inteiros."""
+
+    TABELA = "produtos"
+
+    def __init__(self, nome, preco_centavos, id=None):
         self.id = id
         self.nome = nome
-        self.preco_unit = preco_unit
+        self.preco_centavos = preco_centavos
+
+    def como_linha(self):
+        """Linha no mesmo formato de listar(): LinhaProduto(id, nome, preco_centavos)."""
+        return LinhaProduto(self.id, self.nome, self.preco_centavos)
 
     def salvar(self):
         if self.id:
-            query = "UPDATE produtos SET nome=?, preco_unit=? WHERE id=?"
-            parametros = (self.nome, self.preco_unit, self.id)
+            query = "UPDATE produtos SET nome=?, preco_centavos=? WHERE id=?"
+            parametros = (self.nome, self.preco_centavos, self.id)
         else:
-            query = "INSERT INTO produtos (nome, preco_unit) VALUES (?, ?)"
-            parametros = (self.nome, self.preco_unit)
-        return executar_query(query, parametros)
+            query = "INSERT INTO produtos (nome, preco_centavos) VALUES (?, ?)"
+            parametros = (self.nome, self.preco_centavos)
+        return _gravar(self, query, parametros)
 
     @staticmethod
     def listar():
-        return consultar("SELECT * FROM produtos")
+        """Retorna todos os produtos (do cache de leitura enquanto a tabela não mudar)."""
+        return consultar_em_cache("SELECT id, nome, preco_centavos FROM produtos", tabelas=("produtos",),
+                                  tipo=LinhaProduto)
+
+    @staticmethod
+    def listar_pagina(depois_de=None, limite=100):
+        """Retorna até `limite` produtos em ordem de id, a partir do primeiro id maior que `depois_de`."""
+        query = "SELECT id, nome, preco_centavos FROM produtos WHERE id > ? ORDER BY id LIMIT ?"
+        return consultar(query, (depois_de or 0, limite), LinhaProduto)
+
+    @staticmethod
+    def iterar():
+        """Gera todos os produtos sob demanda, em lotes (memória constante)."""
+        return consultar_em_lotes("SELECT id, nome, preco_centavos FROM produtos", tipo=LinhaProduto)
+
+    @staticmethod
+    def buscar_por_ids(ids):
+        """Retorna {id: LinhaProduto} dos produtos `ids` que existem (IN em blocos, sem uma consulta por id)."""
+        return _por_chave("SELECT id, nome, preco_centavos FROM produtos WHERE id IN ({})", ids, LinhaProduto)
+
+    @staticmethod
+    def buscar_por_nomes(nomes):
+        """Retorna {nome: LinhaProduto} dos produtos com esses nomes exatos; com nomes repetidos, vale o de menor id."""
+        return _por_chave("SELECT id, nome, preco_centavos FROM produtos WHERE nome IN ({}) ORDER BY id DESC",
+                          nomes, LinhaProduto, 1)
 
     @staticmethod
     def deletar(produto_id):
-        return executar_query("DELETE FROM produtos WHERE id=?", (produto_id,))
+        return _remover(Produto.TABELA, produto_id)
+
+    @staticmethod
+    def deletar_varios(ids):
+        """Remove vários produtos em uma transação. Retorna quantos foram removidos ou None."""
+        return _remover_varios(Produto.TABELA, ids)
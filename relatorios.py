@@ -0,0 +1,168 @@
+"""Relatórios analíticos calculados fora do processo da interface.
+
+As agregações pesadas (receita por cliente, quantidade e receita por produto) são
+feitas pelo próprio SQLite, com GROUP BY sobre índices de cobertura, em processos
+de um ProcessPoolExecutor: cada parte roda em um processo separado, em paralelo, e
+a interface do Tk nunca disputa CPU (nem o GIL) com elas. Cada processo abre a sua
+própria conexão com o mesmo arquivo de banco e apenas lê.
+
+    r = gerar_relatorios()   # bloqueia até terminar: chame de uma thread de trabalho
+    r["top_clientes"], r["top_produtos"], r["abc"], r["medias"], r["tempos_ms"]
+
+A classificação ABC (Pareto) ordena os produtos pela receita: são classe A os
+que, somados, formam os primeiros 80% da receita, B os próximos 15% e C o resto.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import db
+from models import Produto
+
+LIMITE = 20              # linhas dos rankings de clientes e de produtos
+CLASSES_ABC = (("A", 0.80), ("B", 0.95), ("C", 1.0))  # classe, fração acumulada da receita
+PROCESSOS = min(3, os.cpu_count() or 1)  # uma parte do relatório por processo, sem passar do nº de CPUs
+
+ClienteReceita = namedtuple("ClienteReceita", "id nome pedidos receita_centavos")
+ProdutoVendido = namedtuple("ProdutoVendido", "id nome quantidade receita_centavos classe")
+ClasseABC = namedtuple("ClasseABC", "classe produtos receita_centavos fracao_produtos fracao_receita")
+
+_pool = None
+_caminho_pool = None
+_trava_pool = threading.Lock()
+
+
+# ===========================================================
+# Partes do relatório (executadas nos processos do pool)
+# ===========================================================
+def _iniciar_processo(caminho):
+    db.configurar_banco(caminho)
+    db.configurar_instrumentacao(ativa=False)
+
+
+def _medir(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def _clientes(limite):
+    """[ClienteReceita] dos `limite` clientes com maior receita."""
+    # o GROUP BY percorre só o índice idx_pedidos_cliente_total (id_cliente, total_centavos)
+    return db.consultar(
+        "SELECT s.id_cliente, c.nome, s.pedidos, s.receita FROM ("
+        "  SELECT id_cliente, COUNT(*) AS pedidos, SUM(total_centavos) AS receita "
+        "  FROM pedidos GROUP BY id_cliente ORDER BY receita DESC LIMIT ?"
+        ") s LEFT JOIN clientes c ON c.id = s.id_cliente ORDER BY s.receita DESC",
+        (limite,), ClienteReceita)
+
+
+def _mais_vendidos(vendas, limite):
+    return sorted(vendas, key=lambda v: v[1] or 0, reverse=True)[:limite]
+
+
+def _produtos(limite):
+    """Retorna ([(id, quantidade, receita)] de todos os produtos vendidos, {id: nome} dos `limite` mais vendidos)."""
+    # o GROUP BY percorre só o índice idx_itens_pedido_produto (produto_id, quantidade, preco_centavos)
+    vendas = db.consultar(
+        "SELECT produto_id, SUM(quantidade), SUM(quantidade * preco_centavos) FROM itens_pedido GROUP BY produto_id")
+    # só os nomes exibidos no ranking são buscados; a curva ABC usa apenas os ids
+    linhas = Produto.buscar_por_ids(v[0] for v in _mais_vendidos(vendas, limite))
+    return vendas, {produto_id: linha.nome for produto_id, linha in linhas.items()}
+
+
+def _resumo():
+    """(pedidos, linhas de itens, receita) somados a partir dos totais mantidos pelos gatilhos."""
+    r = db.consultar("SELECT COUNT(*), SUM(qtd_itens), SUM(total_centavos) FROM pedidos")
+    return r[0] if r else (0, 0, 0)
+
+
+# ===========================================================
+# Montagem
+# ===========================================================
+def classificar_abc(vendas):
+    """Recebe [(id, quantidade, receita)] e retorna ({id: classe}, [ClasseABC])."""
+    ordenados = sorted(vendas, key=lambda v: v[2] or 0, reverse=True)
+    receita_total = sum(v[2] or 0 for v in ordenados)
+    classes = {}
+    resumo = {classe: [0, 0] for classe, _ in CLASSES_ABC}
+    acumulado = 0
+    for produto_id, _, receita in ordenados:
+        fracao = acumulado / receita_total if receita_total else 1.0
+        # a classe depende da receita acumulada *antes* do produto: o primeiro é sempre A
+        classe = next((c for c, limite in CLASSES_ABC if fracao < limite), CLASSES_ABC[-1][0])
+        classes[produto_id] = classe
+        resumo[classe][0] += 1
+        resumo[classe][1] += receita or 0
+        acumulado += receita or 0
+    n = len(ordenados)
+    return classes, [
+        ClasseABC(c, qtd, receita, qtd / n if n else 0.0, receita / receita_total if receita_total else 0.0)
+        for c, (qtd, receita) in resumo.items()
+    ]
+
+
+def _obter_pool(caminho):
+    """Pool de processos para o banco `caminho` (recriado se o banco configurado mudar)."""
+    global _pool, _caminho_pool
+    with _trava_pool:
+        if _pool is None or _caminho_pool != caminho:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: o processo novo não herda conexões SQLite nem o Tk do processo principal
+            _pool = ProcessPoolExecutor(max_workers=PROCESSOS, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_iniciar_processo, initargs=(caminho,))
+            _caminho_pool = caminho
+        return _pool
+
+
+def encerrar():
+    """Encerra os processos do pool (são recriados na próxima chamada de gerar_relatorios)."""
+    global _pool
+    with _trava_pool:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def gerar_relatorios(limite=LIMITE, caminho=None):
+    """Calcula todos os relatórios em paralelo nos processos do pool e retorna um dict com:
+
+    - top_clientes: [ClienteReceita] com as maiores receitas;
+    - top_produtos: [ProdutoVendido] com as maiores quantidades vendidas;
+    - abc: [ClasseABC] com produtos e receita de cada classe;
+    - medias: pedidos, itens_por_pedido, unidades_por_pedido e ticket_medio_centavos;
+    - tempos_ms: duração de cada parte no seu processo e o total (com a comunicação).
+    """
+    inicio = time.perf_counter()
+    pool = _obter_pool(caminho or db.DB_PATH)
+    f_clientes = pool.submit(_medir, _clientes, limite)
+    f_produtos = pool.submit(_medir, _produtos, limite)
+    f_resumo = pool.submit(_medir, _resumo)
+    top_clientes, ms_clientes = f_clientes.result()
+    (vendas, nomes), ms_produtos = f_produtos.result()
+    (pedidos, linhas, receita), ms_resumo = f_resumo.result()
+
+    classes, abc = classificar_abc(vendas)
+    unidades = sum(v[1] or 0 for v in vendas)
+    pedidos = pedidos or 0
+    return {
+        "top_clientes": top_clientes,
+        "top_produtos": [ProdutoVendido(produto_id, nomes.get(produto_id), quantidade, receita, classes[produto_id])
+                         for produto_id, quantidade, receita in _mais_vendidos(vendas, limite)],
+        "abc": abc,
+        "medias": {
+            "pedidos": pedidos,
+            "itens_por_pedido": (linhas or 0) / pedidos if pedidos else 0.0,
+            "unidades_por_pedido": unidades / pedidos if pedidos else 0.0,
+            "ticket_medio_centavos": (2 * (receita or 0) + pedidos) // (2 * pedidos) if pedidos else 0,
+        },
+        "tempos_ms": {"clientes": ms_clientes, "produtos": ms_produtos, "resumo": ms_resumo,
+                      "total": (time.perf_counter() - inicio) * 1000},
+    }
+
+
+__all__ = ["ClienteReceita", "ProdutoVendido", "ClasseABC", "classificar_abc", "gerar_relatorios", "encerrar"]
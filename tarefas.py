@@ -0,0 +1,120 @@
+"""Execução das operações de banco fora da thread principal do Tk.
+
+As views submetem funções (consultas, gravações) ao executor; elas rodam em
+threads de trabalho, cada uma com a sua própria conexão (db.conectar é por
+thread), e os resultados voltam para a thread da interface via `after()`.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ===========================================================
+# Executor de tarefas em segundo plano
+# ===========================================================
+class ExecutorTarefas:
+    """Pool de threads que entrega resultados na thread do Tk.
+
+    Cada submissão recebe uma `chave` (ex.: (view, "listar")). Quando uma nova
+    tarefa é submetida com a mesma chave, o resultado das anteriores é descartado
+    ao chegar, evitando que uma listagem antiga sobrescreva uma mais recente.
+    Tarefas com chave None nunca são descartadas (úteis para gravações).
+    """
+
+    def __init__(self, root, max_workers=2, intervalo_ms=25):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._resultados = queue.Queue()
+        self._geracoes = {}     # chave -> geração da submissão mais recente
+        self._pendentes = 0     # tarefas ainda não entregues
+        self._ocupados = {}     # indicador -> nº de tarefas em andamento
+        self._agendado = False
+
+    def submeter(self, chave, funcao, *args, ao_concluir=None, ao_falhar=None, indicador=None):
+        """Executa `funcao(*args)` em segundo plano.
+
+        `ao_concluir(resultado)` e `ao_falhar(erro)` são chamados na thread do Tk.
+        `indicador(True/False)` é avisado quando há (ou deixa de haver) tarefas
+        em andamento associadas a ele.
+        """
+        geracao = None
+        if chave is not None:
+            geracao = self._geracoes.get(chave, 0) + 1
+            self._geracoes[chave] = geracao
+
+        if indicador is not None:
+            self._ocupados[indicador] = self._ocupados.get(indicador, 0) + 1
+            if self._ocupados[indicador] == 1:
+                indicador(True)
+
+        self._pendentes += 1
+        self._pool.submit(self._executar, chave, geracao, funcao, args, ao_concluir, ao_falhar, indicador)
+        self._agendar()
+        return geracao
+
+    def _executar(self, chave, geracao, funcao, args, ao_concluir, ao_falhar, indicador):
+        """Roda na thread de trabalho: apenas executa e enfileira o resultado."""
+        try:
+            resultado, erro = funcao(*args), None
+        except Exception as e:
+            resultado, erro = None, e
+        self._resultados.put((chave, geracao, resultado, erro, ao_concluir, ao_falhar, indicador))
+
+    def _agendar(self):
+        if not self._agendado and self._pendentes:
+            self._agendado = True
+            self.root.after(self.intervalo_ms, self._entregar)
+
+    def _entregar(self):
+        """Roda na thread do Tk: repassa os resultados prontos aos callbacks."""
+        self._agendado = False
+        while True:
+            try:
+                chave, geracao, resultado, erro, ao_concluir, ao_falhar, indicador = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._pendentes -= 1
+
+            if indicador is not None:
+                self._ocupados[indicador] -= 1
+                if self._ocupados[indicador] == 0:
+                    del self._ocupados[indicador]
+                    self._chamar(indicador, False)
+
+            # Resultado obsoleto: já existe uma requisição mais nova para a mesma chave
+            if chave is not None and self._geracoes.get(chave) != geracao:
+                continue
+
+            if erro is not None:
+                if ao_falhar is not None:
+                    self._chamar(ao_falhar, erro)
+                else:
+                    print(f"❌ Erro em tarefa em segundo plano: {erro}")
+            elif ao_concluir is not None:
+                self._chamar(ao_concluir, resultado)
+        self._agendar()
+
+    @staticmethod
+    def _chamar(callback, valor):
+        try:
+            callback(valor)
+        except Exception as e:
+            # ex.: o widget de destino foi fechado antes do resultado chegar
+            print(f"❌ Erro ao entregar resultado de tarefa: {e}")
+
+    def encerrar(self):
+        """Libera as threads de trabalho (tarefas em andamento são concluídas)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executores = {}
+
+
+def obter_executor(widget):
+    """Retorna o executor compartilhado pela janela principal de `widget`."""
+    root = widget.nametowidget(".")
+    executor = _executores.get(root)
+    if executor is None:
+        executor = ExecutorTarefas(root)
+        _executores[root] = executor
+    return executor
@@ -0,0 +1,141 @@
+import re
+from bisect import bisect_left
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+
+# ===========================================================
+# Valores monetários
+# ===========================================================
+# Preços e totais são guardados no banco como centavos inteiros; a conversão
+# acontece só nas bordas (entrada de texto, CSV e exibição).
+def para_centavos(valor):
+    """Converte reais ('12,50', '12.50', 12.5) em centavos inteiros (1250).
+
+    Arredonda meio centavo para cima. Levanta ValueError se o valor não for numérico.
+    """
+    try:
+        reais = Decimal(str(valor).strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"valor monetário inválido: {valor!r}") from None
+    if not reais.is_finite():
+        raise ValueError(f"valor monetário inválido: {valor!r}")
+    return int((reais * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def formatar_centavos(centavos):
+    """Formata centavos inteiros como reais com ponto decimal: 1250 -> '12.50'."""
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}{reais}.{resto:02d}"
+
+
+# ===========================================================
+# Validações (usadas pelas views e pela importação de CSV)
+# ===========================================================
+_PADRAO_EMAIL = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+# aceita DDD, traços e espaços
+_PADRAO_TELEFONE = re.compile(r'^\(?\d{2,3}\)?[\s\-]?\d{4,5}[\s\-]?\d{4}$')
+
+
+def validar_email(email):
+    """Verifica se o email é válido."""
+    return _PADRAO_EMAIL.match(email) is not None
+
+
+def validar_telefone(telefone):
+    """Verifica se o telefone é válido (aceita DDD, traços e espaços)."""
+    return _PADRAO_TELEFONE.match(telefone) is not None
+
+
+def validar_data(data):
+    """Verifica se a data está no formato YYYY-MM-DD."""
+    try:
+        datetime.strptime(data, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+# ===========================================================
+# Índice de busca de produtos (usado no modal "Adicionar Item")
+# ===========================================================
+class IndiceProdutos:
+    """Índice em memória para localizar produtos por id, prefixo ou trecho do nome.
+
+    - por_id: dict id -> (id, nome, preco_centavos), acesso direto sem varrer a lista;
+    - nomes ordenados: consultas de 1-2 caracteres usam busca binária por prefixo;
+    - trigramas: consultas de 3+ caracteres partem da menor lista de candidatos
+      entre os trigramas da consulta, em vez de testar todos os produtos.
+
+    Toda pesquisa retorna no máximo `limite` produtos, então o custo por tecla não
+    cresce com o tamanho do catálogo.
+    """
+
+    LIMITE = 100
+
+    def __init__(self, produtos):
+        self.por_id = {}
+        self._ordenados = []   # (nome em minúsculas, id), em ordem alfabética
+        self._trigramas = {}   # trigrama -> [ids em ordem alfabética]
+        for p in produtos or []:
+            self.por_id[p[0]] = tuple(p)
+            self._ordenados.append((p[1].lower(), p[0]))
+        self._ordenados.sort()
+        for nome, pid in self._ordenados:
+            for tri in {nome[i:i + 3] for i in range(len(nome) - 2)}:
+                self._trigramas.setdefault(tri, []).append(pid)
+
+    def __len__(self):
+        return len(self.por_id)
+
+    def obter(self, produto_id):
+        """Retorna (id, nome, preco_centavos) do produto ou None."""
+        return self.por_id.get(produto_id)
+
+    def pesquisar(self, termo="", limite=None):
+        """Retorna até `limite` produtos cujo nome contém `termo` (ou cujo id é `termo`)."""
+        limite = limite or self.LIMITE
+        termo = termo.strip().lower()
+        resultados = []
+        vistos = set()
+
+        def adicionar(pid):
+            if pid not in vistos:
+                vistos.add(pid)
+                resultados.append(self.por_id[pid])
+
+        # id digitado diretamente
+        if termo.isdigit() and int(termo) in self.por_id:
+            adicionar(int(termo))
+
+        if not termo:
+            candidatos = (pid for _, pid in self._ordenados)
+        elif len(termo) < 3:
+            candidatos = self._por_prefixo(termo)
+        else:
+            candidatos = self._por_trigramas(termo)
+
+        for pid in candidatos:
+            if len(resultados) >= limite:
+                break
+            adicionar(pid)
+        return resultados
+
+    def _por_prefixo(self, termo):
+        i = bisect_left(self._ordenados, (termo,))
+        while i < len(self._ordenados) and self._ordenados[i][0].startswith(termo):
+            yield self._ordenados[i][1]
+            i += 1
+
+    def _por_trigramas(self, termo):
+        listas = []
+        for tri in {termo[i:i + 3] for i in range(len(termo) - 2)}:
+            ids = self._trigramas.get(tri)
+            if not ids:
+                return
+            listas.append(ids)
+        # a lista do trigrama mais raro é a menor fonte de candidatos
+        for pid in min(listas, key=len):
+            if termo in self.por_id[pid][1].lower():
+                yield pid
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
+from importacao import importar_clientes
 from models import Cliente
-import re  # para validações
+from tarefas import obter_executor
+from utils import validar_email, validar_telefone
+from views.componentes import IndicadorOcupado, ExecucaoEmSegundoPlano, aplicar_linha, remover_linhas
 
 
-class ClientesView(ttk.Frame):
+class ClientesView(ExecucaoEmSegundoPlano, ttk.Frame):
     def __init__(self, master=None):
         super().__init__(master)
         self.pack(fill="both", expand=True, padx=12, pady=8)
+        self.executor = obter_executor(self)
         self.criar_widgets()
         self.listar_clientes()
 
@@ -32,25 +36,31 @@ class ClientesView(ttk.Frame):
         frame_botoes = ttk.Frame(self)
         frame_botoes.grid(row=3, column=0, columnspan=2, pady=10)
 
-        ttk.Button(frame_botoes, text="Salvar", command=self.salvar_cliente, width=12).grid(row=0, column=0, padx=6)
+        self.btn_salvar = ttk.Button(frame_botoes, text="Salvar", command=self.salvar_cliente, width=12)
+        self.btn_salvar.grid(row=0, column=0, padx=6)
         ttk.Button(frame_botoes, text="Editar", command=self.abrir_modal_edicao, width=12).grid(row=0, column=1, padx=6)
         ttk.Button(frame_botoes, text="Excluir", command=self.excluir_cliente, width=12).grid(row=0, column=2, padx=6)
+        ttk.Button(frame_botoes, text="Importar CSV", width=12,
+                   command=lambda: self.importar_csv(importar_clientes, lambda r: self.listar_clientes())
+                   ).grid(row=0, column=3, padx=6)
 
         # Barra de pesquisa
         frame_pesquisa = ttk.Frame(self)
         frame_pesquisa.grid(row=4, column=0, columnspan=2, sticky="ew", pady=6)
 
-        ttk.Label(frame_pesquisa, text="Pesquisar por Email:").pack(side="left", padx=6)
+        ttk.Label(frame_pesquisa, text="Pesquisar (nome, email ou telefone):").pack(side="left", padx=6)
         self.entry_pesquisa = ttk.Entry(frame_pesquisa, width=34)
         self.entry_pesquisa.pack(side="left", padx=6)
         self.entry_pesquisa.bind("<Return>", lambda e: self.pesquisar_cliente())
 
         ttk.Button(frame_pesquisa, text="Pesquisar", command=self.pesquisar_cliente).pack(side="left", padx=6)
         ttk.Button(frame_pesquisa, text="Limpar", command=self.listar_clientes).pack(side="left", padx=6)
+        self.indicador = IndicadorOcupado(frame_pesquisa)
+        self.indicador.pack(side="right", padx=6)
 
         # Lista
         colunas = ("id", "nome", "email", "telefone")
-        self.tree = ttk.Treeview(self, columns=colunas, show="headings")
+        self.tree = ttk.Treeview(self, columns=colunas, show="headings", selectmode="extended")
         for col in colunas:
             self.tree.heading(col, text=col.capitalize())
         self.tree.column("id", width=60, anchor="center")
@@ -71,38 +81,38 @@ class ClientesView(ttk.Frame):
     # ===========================================================
     def validar_email(self, email):
         """Verifica se o email é válido."""
-        padrao = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-        return re.match(padrao, email) is not None
+        return validar_email(email)
 
     def validar_telefone(self, telefone):
         """Verifica se o telefone é válido (aceita DDD, traços e espaços)."""
-        padrao = r'^\(?\d{2,3}\)?[\s\-]?\d{4,5}[\s\-]?\d{4}$'
-        return re.match(padrao, telefone) is not None
+        return validar_telefone(telefone)
 
     # ===========================================================
     # CRUD e Pesquisa
     # ===========================================================
-    def listar_clientes(self):
+    def preencher_tree(self, clientes):
         for item in self.tree.get_children():
             self.tree.delete(item)
-        for c in Cliente.listar():
-            self.tree.insert("", "end", values=c)
+        for c in clientes:
+            self.tree.insert("", "end", iid=str(c[0]), values=c)
+
+    def listar_clientes(self):
+        """Recarrega a lista inteira (botão Limpar); as gravações atualizam só a linha afetada."""
+        self.executar("listar", Cliente.listar, ao_concluir=self.preencher_tree)
 
     def pesquisar_cliente(self):
-        email_busca = self.entry_pesquisa.get().strip()
-        if not email_busca:
-            messagebox.showinfo("Pesquisa", "Digite um e-mail para pesquisar.")
+        termo = self.entry_pesquisa.get().strip()
+        if not termo:
+            messagebox.showinfo("Pesquisa", "Digite um nome, e-mail ou telefone para pesquisar.")
             return
 
-        resultados = Cliente.pesquisar_por_email(email_busca)
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        def exibir(resultados):
+            self.preencher_tree(resultados)
+            if not resultados:
+                messagebox.showinfo("Pesquisa", "Nenhum cliente encontrado.")
 
-        if resultados:
-            for c in resultados:
-                self.tree.insert("", "end", values=c)
-        else:
-            messagebox.showinfo("Pesquisa", "Nenhum cliente encontrado com esse e-mail.")
+        # mesma chave da listagem: a pesquisa substitui uma listagem ainda em andamento
+        self.executar("listar", Cliente.pesquisar, termo, ao_concluir=exibir)
 
     def salvar_cliente(self):
         nome = self.entry_nome.get().strip()
@@ -120,28 +130,39 @@ class ClientesView(ttk.Frame):
             messagebox.showerror("Telefone inválido", "Digite um telefone válido. Exemplo: (11) 99999-9999")
             return
 
-        cliente = Cliente(nome, email, telefone)
-        cliente.salvar()
-        self.listar_clientes()
-        messagebox.showinfo("Sucesso", "Cliente salvo com sucesso!")
+        def concluido(linha):
+            if linha is None:
+                messagebox.showerror("Erro", "Não foi possível salvar o cliente.")
+                return
+            aplicar_linha(self.tree, linha)
+            # os campos só são limpos depois de gravados: em caso de erro o usuário não perde o que digitou
+            self.entry_nome.delete(0, tk.END)
+            self.entry_email.delete(0, tk.END)
+            self.entry_tel.delete(0, tk.END)
+            messagebox.showinfo("Sucesso", "Cliente salvo com sucesso!")
 
-        self.entry_nome.delete(0, tk.END)
-        self.entry_email.delete(0, tk.END)
-        self.entry_tel.delete(0, tk.END)
+        cliente = Cliente(nome, email, telefone)
+        self.gravar(self.btn_salvar, cliente.salvar, ao_concluir=concluido)
 
     def excluir_cliente(self):
-        selecionado = self.tree.selection()
-        if not selecionado:
-            messagebox.showwarning("Aviso", "Selecione um cliente para excluir.")
+        """Exclui os clientes selecionados (seleção múltipla com Ctrl/Shift) em uma transação."""
+        selecionados = self.tree.selection()
+        if not selecionados:
+            messagebox.showwarning("Aviso", "Selecione um ou mais clientes para excluir.")
             return
 
-        item = self.tree.item(selecionado)
-        cliente_id = item["values"][0]
+        ids = [self.tree.item(i)["values"][0] for i in selecionados]
+        pergunta = ("Deseja realmente excluir este cliente?" if len(ids) == 1
+                    else f"Deseja realmente excluir os {len(ids)} clientes selecionados?")
+        if messagebox.askyesno("Confirmação", pergunta):
+            def concluido(removidos):
+                if removidos is None:
+                    messagebox.showerror("Erro", "Não foi possível excluir os clientes.")
+                    return
+                remover_linhas(self.tree, ids)
+                messagebox.showinfo("Sucesso", f"{removidos} cliente(s) excluído(s) com sucesso!")
 
-        if messagebox.askyesno("Confirmação", "Deseja realmente excluir este cliente?"):
-            Cliente.deletar(cliente_id)
-            self.listar_clientes()
-            messagebox.showinfo("Sucesso", "Cliente excluído com sucesso!")
+            self.executar(None, Cliente.deletar_varios, ids, ao_concluir=concluido)
 
     # ===========================================================
     # Modal de edição
@@ -152,7 +173,8 @@ class ClientesView(ttk.Frame):
             messagebox.showwarning("Aviso", "Selecione um cliente para editar.")
             return
 
-        item = self.tree.item(selecionado)
+        # com vários clientes selecionados, edita o primeiro
+        item = self.tree.item(selecionado[0])
         cliente_id, nome, email, telefone = item["values"]
 
         modal = Toplevel(self)
@@ -191,11 +213,18 @@ class ClientesView(ttk.Frame):
                 messagebox.showerror("Telefone inválido", "Digite um telefone válido. Exemplo: (11) 99999-9999")
                 return
 
+            def concluido(linha):
+                if linha is None:
+                    messagebox.showerror("Erro", "Não foi possível atualizar o cliente.")
+                    return
+                aplicar_linha(self.tree, linha)
+                # o modal só fecha depois de gravado: em caso de erro as alterações continuam nele
+                modal.destroy()
+                messagebox.showinfo("Sucesso", "Cliente atualizado com sucesso!")
+
             cliente_editado = Cliente(novo_nome, novo_email, novo_tel, id=cliente_id)
-            cliente_editado.salvar()
-            self.listar_clientes()
-            messagebox.showinfo("Sucesso", "Cliente atualizado com sucesso!")
-            modal.destroy()
+            self.gravar(btn_salvar, cliente_editado.salvar, ao_concluir=concluido)
 
-        tk.Button(modal, text="Salvar Alterações", command=salvar_edicao, width=20).pack(pady=10)
+        btn_salvar = tk.Button(modal, text="Salvar Alterações", command=salvar_edicao, width=20)
+        btn_salvar.pack(pady=10)
         tk.Button(modal, text="Cancelar", command=modal.destroy, width=20).pack(pady=5)
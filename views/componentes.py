@@ -0,0 +1,119 @@
+from tkinter import ttk, messagebox, filedialog
+
+
+class IndicadorOcupado(ttk.Label):
+    """Rótulo que mostra "Carregando..." enquanto a view tem tarefas de banco em andamento.
+
+    A instância é chamável e pode ser passada diretamente como `indicador` para
+    ExecutorTarefas.submeter.
+    """
+
+    def __init__(self, master=None, texto="⏳ Carregando...", **kw):
+        super().__init__(master, text="", foreground="#555555", **kw)
+        self.texto = texto
+
+    def __call__(self, ocupado):
+        self.config(text=self.texto if ocupado else "")
+
+
+class ExecucaoEmSegundoPlano:
+    """Mixin das views: encaminha o trabalho de banco para o ExecutorTarefas.
+
+    A view deve definir `self.executor` (ver tarefas.obter_executor) e
+    `self.indicador` (um IndicadorOcupado).
+    """
+
+    def executar(self, chave, funcao, *args, ao_concluir=None, ao_falhar=None):
+        """Executa `funcao(*args)` em segundo plano e entrega o resultado na thread do Tk.
+
+        Com `chave` definida, resultados de chamadas anteriores desta view com a
+        mesma chave são descartados; use None para operações que não podem ser
+        ignoradas (gravações). Sem `ao_falhar`, erros são exibidos por erro_banco.
+        """
+        if chave is not None:
+            chave = (self, chave)
+        self.executor.submeter(chave, funcao, *args, ao_concluir=ao_concluir,
+                               ao_falhar=ao_falhar or self.erro_banco, indicador=self.indicador)
+
+    def gravar(self, botao, funcao, *args, ao_concluir=None):
+        """Executa uma gravação em segundo plano com `botao` desabilitado até o resultado chegar.
+
+        Um duplo clique (ou Enter repetido) enquanto a gravação está pendente é
+        ignorado, em vez de gravar o mesmo registro duas vezes.
+        """
+        if str(botao["state"]) == "disabled":
+            return
+        botao.config(state="disabled")
+
+        def liberar():
+            if botao.winfo_exists():
+                botao.config(state="normal")
+
+        def concluido(resultado):
+            liberar()
+            if ao_concluir is not None:
+                ao_concluir(resultado)
+
+        def falhou(erro):
+            liberar()
+            self.erro_banco(erro)
+
+        self.executar(None, funcao, *args, ao_concluir=concluido, ao_falhar=falhou)
+
+    def erro_banco(self, erro):
+        messagebox.showerror("Erro", f"Falha ao acessar o banco de dados:\n{erro}")
+
+    def importar_csv(self, funcao, ao_concluir=None):
+        """Pede um arquivo CSV e o importa em segundo plano com `funcao` (ver importacao.py).
+
+        Ao final mostra o resumo com as primeiras linhas rejeitadas e chama
+        `ao_concluir(resultado)`.
+        """
+        caminho = filedialog.askopenfilename(parent=self, title="Importar CSV",
+                                             filetypes=[("Arquivos CSV", "*.csv"), ("Todos os arquivos", "*.*")])
+        if not caminho:
+            return
+
+        def concluido(resultado):
+            if resultado is None:
+                messagebox.showerror("Erro", "Não foi possível ler o arquivo CSV.")
+                return
+            resumo = f"{resultado['importadas']} registros importados, {resultado['rejeitadas']} linhas rejeitadas."
+            exemplos = "\n".join(f"Linha {e.numero}: {e.motivo}" for e in resultado["erros"][:10])
+            messagebox.showinfo("Importação concluída", resumo + ("\n\n" + exemplos if exemplos else ""))
+            if ao_concluir:
+                ao_concluir(resultado)
+
+        self.executar(None, funcao, caminho, ao_concluir=concluido)
+
+
+# ===========================================================
+# Atualização incremental de Treeviews
+# ===========================================================
+# As linhas são inseridas com iid = str(id do registro), o que permite localizar
+# e alterar uma única linha sem recarregar a lista inteira.
+
+def aplicar_linha(tree, valores, indice="end"):
+    """Atualiza a linha com o id de `valores[0]` ou a insere em `indice` se não existir."""
+    iid = str(valores[0])
+    if tree.exists(iid):
+        tree.item(iid, values=valores)
+    else:
+        tree.insert("", indice, iid=iid, values=valores)
+
+
+def remover_linha(tree, id_):
+    """Remove a linha do registro `id_`, se estiver no Treeview."""
+    iid = str(id_)
+    if tree.exists(iid):
+        tree.delete(iid)
+
+
+def remover_linhas(tree, ids):
+    """Remove as linhas dos registros `ids` que estiverem no Treeview, em uma única chamada."""
+    iids = [str(i) for i in ids if tree.exists(str(i))]
+    if iids:
+        tree.delete(*iids)
+
+
+__all__ = ["IndicadorOcupado", "ExecucaoEmSegundoPlano", "aplicar_linha", "remover_linha", "remover_linhas"]
@@ -1,23 +1,96 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from db import consultar
+from tkinter import ttk
+from db import consultar, versao_dados
 from datetime import datetime
+from tarefas import obter_executor
+from views.componentes import IndicadorOcupado
+
+
+def intervalo_do_mes(referencia=None):
+	"""Retorna (inicio, fim) do mês de `referencia` como datas ISO, com fim exclusivo.
+
+	O filtro `data >= inicio AND data < fim` pode usar o índice de pedidos.data,
+	ao contrário de `substr(data,1,7)=?`.
+	"""
+	ref = referencia or datetime.now()
+	inicio = ref.strftime("%Y-%m-01")
+	if ref.month == 12:
+		fim = f"{ref.year + 1}-01-01"
+	else:
+		fim = f"{ref.year}-{ref.month + 1:02d}-01"
+	return inicio, fim
+
+
+def meses_ate(referencia=None, quantidade=12):
+	"""Retorna os `quantidade` meses ('YYYY-MM') terminados no mês de `referencia`, do mais antigo ao mais novo."""
+	ref = referencia or datetime.now()
+	ultimo = ref.year * 12 + ref.month - 1
+	return [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in range(ultimo - quantidade + 1, ultimo + 1)]
+
+
+def consultar_vendas_mensais(meses=12, referencia=None):
+	"""Retorna [(mes, pedidos, receita em centavos)] dos últimos `meses` meses, incluindo o atual.
+
+	Lê a tabela de resumo vendas_mensais pela chave primária (no máximo uma linha
+	por mês, seja qual for o tamanho de pedidos); meses sem vendas entram zerados.
+	"""
+	chaves = meses_ate(referencia, meses)
+	linhas = consultar(
+		"SELECT mes, pedidos, receita_centavos FROM vendas_mensais WHERE mes >= ? AND mes <= ?",
+		(chaves[0], chaves[-1]),
+	)
+	por_mes = {mes: (pedidos, receita) for mes, pedidos, receita in linhas}
+	return [(mes, *por_mes.get(mes, (0, 0))) for mes in chaves]
+
+
+def consultar_metricas(referencia=None):
+	"""Retorna (total de clientes, pedidos no mês, ticket médio do mês em centavos) em uma única consulta.
+
+	O filtro por intervalo de datas é resolvido pelo índice de cobertura
+	idx_pedidos_data (data, total_centavos), então o custo acompanha apenas os
+	pedidos do mês, e não o tamanho total da tabela. A média é calculada só com
+	inteiros (SUM exato, arredondada para o centavo mais próximo).
+	"""
+	inicio, fim = intervalo_do_mes(referencia)
+	r = consultar(
+		"SELECT (SELECT COUNT(*) FROM clientes), COUNT(*), "
+		"(2 * SUM(total_centavos) + COUNT(*)) / (2 * COUNT(*)) "
+		"FROM pedidos WHERE data >= ? AND data < ?",
+		(inicio, fim),
+	)
+	if not r:
+		return 0, 0, 0
+	total_clients, total_orders, avg = r[0]
+	return total_clients or 0, total_orders or 0, avg or 0
 
 
 class DashboardView(ttk.Frame):
-	"""Dashboard refinado com três métricas e botão Atualizar.
+	"""Dashboard refinado com três métricas, tendência mensal e botão Atualizar.
 
 	Exibe:
 	- total de clientes
 	- total de pedidos no mês corrente
 	- ticket médio do mês corrente
+	- receita (barras) e pedidos (linha) dos últimos 12 ou 24 meses
+
+	Um timer compara db.versao_dados() (PRAGMA data_version + alterações da própria
+	conexão) com o valor da última atualização e só refaz as consultas quando o
+	banco mudou, inclusive por outro programa usando o mesmo arquivo.
 	"""
 
+	INTERVALO_VERIFICACAO_MS = 2000  # checagem de alterações enquanto a view está visível
+
+	COR_RECEITA = "#4a7ebb"
+	COR_PEDIDOS = "#d9822b"
+
 	def __init__(self, master=None):
 		super().__init__(master)
 		self.pack(fill="both", expand=True, padx=12, pady=8)
+		self.executor = obter_executor(self)
+		self._versao = None
 		self._create_widgets()
 		self.update_dashboard()
+		self.after(self.INTERVALO_VERIFICACAO_MS, self._verificar_alteracoes)
 
 	def _create_widgets(self):
 		# Título da área
@@ -42,10 +115,28 @@ class DashboardView(ttk.Frame):
 		self.card_orders.pack(side="left", expand=True, fill="x", padx=6)
 		self.card_ticket.pack(side="left", expand=True, fill="x", padx=6)
 
+		# Tendência mensal (tabela vendas_mensais)
+		cabecalho = ttk.Frame(container)
+		cabecalho.pack(fill="x", pady=(12, 0), padx=6)
+		ttk.Label(cabecalho, text="Receita e pedidos por mês", font=("Segoe UI", 10)).pack(side="left")
+		self.meses_var = tk.IntVar(value=12)
+		for meses in (24, 12):
+			ttk.Radiobutton(cabecalho, text=f"{meses} meses", value=meses, variable=self.meses_var,
+							command=self.atualizar_tendencia).pack(side="right", padx=4)
+		self.grafico = tk.Canvas(container, height=220, background="white", highlightthickness=0)
+		self.grafico.pack(fill="both", expand=True, padx=6, pady=6)
+		self.grafico.bind("<Configure>", lambda e: self._desenhar_tendencia())
+		self._vendas = []
+
 		# Botão atualizar
 		footer = ttk.Frame(container)
 		footer.pack(fill="x", pady=(12, 0))
 		ttk.Button(footer, text="Atualizar", command=self._on_refresh).pack(side="right")
+		self.indicador = IndicadorOcupado(footer)
+		self.indicador.pack(side="right", padx=6)
+		# situação da última atualização (substitui as caixas de diálogo)
+		self.lbl_status = ttk.Label(footer, text="", foreground="gray")
+		self.lbl_status.pack(side="left")
 
 	def _make_card(self, parent, title):
 		card = ttk.Frame(parent, padding=12, relief="raised")
@@ -56,21 +147,81 @@ class DashboardView(ttk.Frame):
 		card.value_label = val
 		return card
 
-	def update_dashboard(self):
-		"""Executa consultas agregadas e atualiza os widgets do dashboard."""
-		try:
-			# total de clientes
-			r = consultar("SELECT COUNT(*) FROM clientes")
-			total_clients = r[0][0] if r and r[0] and r[0][0] is not None else 0
+	def _assinatura(self):
+		"""Versão do banco e mês corrente: se nenhum dos dois mudou, os números também não."""
+		return versao_dados(), intervalo_do_mes()[0]
+
+	def _verificar_alteracoes(self):
+		"""Timer: refaz as consultas só se o banco mudou desde a última atualização.
 
-			# pedidos do mês corrente (usa prefixo YYYY-MM da coluna data)
-			ym = datetime.now().strftime("%Y-%m")
-			r2 = consultar("SELECT COUNT(*) FROM pedidos WHERE substr(data,1,7)=?", (ym,))
-			total_orders = r2[0][0] if r2 and r2[0] and r2[0][0] is not None else 0
+		Enquanto a view está escondida nada é consultado; ao voltar a aparecer, a
+		primeira checagem atualiza o que tiver mudado nesse meio tempo.
+		"""
+		if self.winfo_ismapped() and self._assinatura() != self._versao:
+			self.update_dashboard()
+		self.after(self.INTERVALO_VERIFICACAO_MS, self._verificar_alteracoes)
 
-			# ticket médio do mês corrente
-			r3 = consultar("SELECT AVG(total) FROM pedidos WHERE substr(data,1,7)=?", (ym,))
-			avg = r3[0][0] if r3 and r3[0] and r3[0][0] is not None else 0.0
+	def update_dashboard(self):
+		"""Executa as consultas agregadas em segundo plano e atualiza os widgets do dashboard."""
+		# lida antes das consultas: uma alteração feita durante elas provoca nova atualização
+		self._versao = self._assinatura()
+
+		def aplicar(metricas):
+			self._aplicar_metricas(metricas)
+			self.lbl_status.config(text=f"Atualizado às {datetime.now():%H:%M:%S}")
+
+		def falhou(e):
+			self._versao = None  # tenta de novo na próxima checagem
+			self.lbl_status.config(text=f"Falha ao atualizar: {e}")
+
+		self.executor.submeter((self, "metricas"), consultar_metricas,
+							   ao_concluir=aplicar, ao_falhar=falhou, indicador=self.indicador)
+		self.atualizar_tendencia()
+
+	def atualizar_tendencia(self):
+		"""Busca a série mensal em segundo plano e redesenha o gráfico."""
+		def aplicar(vendas):
+			self._vendas = vendas
+			self._desenhar_tendencia()
+
+		self.executor.submeter((self, "vendas_mensais"), consultar_vendas_mensais, self.meses_var.get(),
+							   ao_concluir=aplicar, indicador=self.indicador)
+
+	def _desenhar_tendencia(self):
+		"""Desenha barras de receita e a linha de pedidos com os dados de self._vendas."""
+		c = self.grafico
+		c.delete("all")
+		if not self._vendas:
+			return
+		largura, altura = c.winfo_width(), c.winfo_height()
+		margem_x, topo, base = 40, 20, altura - 24
+		if largura <= 2 * margem_x or base <= topo:
+			return
+		max_receita = max(v[2] for v in self._vendas) or 1
+		max_pedidos = max(v[1] for v in self._vendas) or 1
+		passo = (largura - 2 * margem_x) / len(self._vendas)
+		pontos = []
+		for i, (mes, pedidos, receita) in enumerate(self._vendas):
+			x = margem_x + i * passo
+			y = base - (base - topo) * receita / max_receita
+			c.create_rectangle(x + passo * 0.15, y, x + passo * 0.85, base, fill=self.COR_RECEITA, width=0)
+			pontos.append((x + passo / 2, base - (base - topo) * pedidos / max_pedidos))
+			# rótulo MM/AA; com 24 meses, um mês sim, outro não
+			if len(self._vendas) <= 12 or i % 2 == len(self._vendas) % 2:
+				c.create_text(x + passo / 2, base + 12, text=f"{mes[5:]}/{mes[2:4]}", font=("Segoe UI", 8))
+		if len(pontos) > 1:
+			c.create_line(*[coord for p in pontos for coord in p], fill=self.COR_PEDIDOS, width=2)
+		for x, y in pontos:
+			c.create_oval(x - 3, y - 3, x + 3, y + 3, fill=self.COR_PEDIDOS, outline="")
+		c.create_text(margem_x, topo - 10, anchor="w", fill=self.COR_RECEITA, font=("Segoe UI", 8),
+					  text=f"■ receita (máx. R$ {max_receita // 100:,})".replace(",", "."))
+		c.create_text(largura - margem_x, topo - 10, anchor="e", fill=self.COR_PEDIDOS, font=("Segoe UI", 8),
+					  text=f"● pedidos (máx. {max_pedidos:,})".replace(",", "."))
+
+	def _aplicar_metricas(self, metricas):
+		"""Atualiza os cards com (total de clientes, pedidos no mês, ticket médio em centavos)."""
+		try:
+			total_clients, total_orders, avg = metricas
 
 			# Formata valores (milhares com ponto e decimais com vírgula)
 			def br_number(n):
@@ -80,10 +231,10 @@ class DashboardView(ttk.Frame):
 					s = "0"
 				return s.replace(",", ".")
 
-			def br_currency(x):
-				s = f"{x:,.2f}"
-				s = s.replace(",", "X").replace(".", ",").replace("X", ".")
-				return f"R$ {s}"
+			def br_currency(centavos):
+				reais, resto = divmod(int(centavos), 100)
+				s = f"{reais:,}".replace(",", ".")
+				return f"R$ {s},{resto:02d}"
 
 			self.card_clients.value_label.config(text=br_number(total_clients))
 			self.card_orders.value_label.config(text=br_number(total_orders))
@@ -94,12 +245,11 @@ class DashboardView(ttk.Frame):
 				self.card_ticket.value_label.config(text=br_currency(avg))
 
 		except Exception as e:
-			messagebox.showerror("Erro", f"Falha ao atualizar dashboard:\n{e}")
+			self.lbl_status.config(text=f"Falha ao atualizar: {e}")
 
 	def _on_refresh(self):
 		self.update_dashboard()
-		messagebox.showinfo("Atualização", "Dashboard atualizado com sucesso.")
 
 
-__all__ = ["DashboardView"]
+__all__ = ["DashboardView", "consultar_metricas", "consultar_vendas_mensais", "intervalo_do_mes", "meses_ate"]
 
@@ -0,0 +1,160 @@
+import tkinter as tk
+from tkinter import ttk
+
+import db
+from tarefas import obter_executor
+from views.componentes import IndicadorOcupado
+
+
+class DiagnosticoView(ttk.Frame):
+    """Estatísticas ao vivo das consultas SQL registradas por db.py.
+
+    Mostra as instruções com maior tempo total e o log de consultas lentas, com o
+    plano de execução da consulta lenta selecionada (quando capturado), e as
+    rotinas de manutenção que refazem dados derivados (totais dos pedidos, itens
+    órfãos e o resumo vendas_mensais).
+    """
+
+    INTERVALO_MS = 1000  # atualização automática enquanto a view está visível
+    TOP_N = 15
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self.pack(fill="both", expand=True, padx=12, pady=8)
+        self._lentas = []
+        self.executor = obter_executor(self)
+        self.criar_widgets()
+        self.atualizar()
+
+    # ===========================================================
+    # Interface
+    # ===========================================================
+    def criar_widgets(self):
+        ttk.Label(self, text="Diagnóstico de Consultas", font=("Segoe UI", 12, "bold")).grid(
+            row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        # Configuração da instrumentação
+        frame_config = ttk.Frame(self)
+        frame_config.grid(row=1, column=0, columnspan=2, sticky="ew", pady=4)
+        ttk.Label(frame_config, text="Consulta lenta acima de (ms):").pack(side="left", padx=6)
+        self.limite_var = tk.StringVar(value=f"{db.LIMITE_LENTA_MS:g}")
+        spin = ttk.Spinbox(frame_config, from_=1, to=60000, increment=10, width=8,
+                           textvariable=self.limite_var, command=self.aplicar_configuracao)
+        spin.pack(side="left", padx=6)
+        spin.bind("<Return>", lambda e: self.aplicar_configuracao())
+        self.plano_var = tk.BooleanVar(value=db.CAPTURAR_PLANO)
+        ttk.Checkbutton(frame_config, text="Capturar EXPLAIN QUERY PLAN", variable=self.plano_var,
+                        command=self.aplicar_configuracao).pack(side="left", padx=6)
+        ttk.Button(frame_config, text="Zerar estatísticas", command=self.zerar).pack(side="right", padx=6)
+
+        # Instruções com maior tempo total
+        ttk.Label(self, text=f"Top {self.TOP_N} instruções por tempo total").grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(8, 2))
+        colunas = ("execucoes", "total_ms", "media_ms", "max_ms", "linhas", "erros", "chamador", "sql")
+        self.tree_top = ttk.Treeview(self, columns=colunas, show="headings", height=8)
+        for col, largura in zip(colunas, (80, 90, 90, 90, 80, 60, 200, 420)):
+            self.tree_top.heading(col, text=col.capitalize())
+            self.tree_top.column(col, width=largura, anchor="w" if col in ("chamador", "sql") else "e")
+        self.tree_top.grid(row=3, column=0, columnspan=2, sticky="nsew", padx=6, pady=4)
+
+        # Log de consultas lentas
+        ttk.Label(self, text="Consultas lentas (mais recentes primeiro)").grid(
+            row=4, column=0, columnspan=2, sticky="w", pady=(8, 2))
+        colunas_lentas = ("quando", "ms", "linhas", "chamador", "sql")
+        self.tree_lentas = ttk.Treeview(self, columns=colunas_lentas, show="headings", height=6)
+        for col, largura in zip(colunas_lentas, (150, 80, 80, 200, 520)):
+            self.tree_lentas.heading(col, text=col.capitalize())
+            self.tree_lentas.column(col, width=largura, anchor="e" if col in ("ms", "linhas") else "w")
+        self.tree_lentas.grid(row=5, column=0, columnspan=2, sticky="nsew", padx=6, pady=4)
+        self.tree_lentas.bind("<<TreeviewSelect>>", lambda e: self.mostrar_plano())
+
+        self.lbl_plano = ttk.Label(self, text="", justify="left", font=("Consolas", 9))
+        self.lbl_plano.grid(row=6, column=0, columnspan=2, sticky="w", padx=6, pady=4)
+
+        # Cache de leitura de clientes e produtos
+        self.lbl_cache = ttk.Label(self, text="")
+        self.lbl_cache.grid(row=7, column=0, columnspan=2, sticky="w", padx=6, pady=(0, 4))
+
+        # Manutenção: recalcula em massa os dados mantidos por gatilhos
+        frame_manutencao = ttk.Frame(self)
+        frame_manutencao.grid(row=8, column=0, columnspan=2, sticky="ew", pady=4)
+        for texto, funcao in (("Verificar totais dos pedidos", db.verificar_totais_pedidos),
+                              ("Remover itens órfãos", db.remover_itens_orfaos),
+                              ("Reconstruir vendas mensais", db.reconstruir_vendas_mensais)):
+            ttk.Button(frame_manutencao, text=texto,
+                       command=lambda t=texto, f=funcao: self.executar_manutencao(t, f)).pack(side="left", padx=6)
+        self.indicador = IndicadorOcupado(frame_manutencao)
+        self.indicador.pack(side="left", padx=6)
+        self.lbl_manutencao = ttk.Label(frame_manutencao, text="")
+        self.lbl_manutencao.pack(side="left", padx=6)
+
+        self.grid_rowconfigure(3, weight=1)
+        self.grid_rowconfigure(5, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+    # ===========================================================
+    # Atualização
+    # ===========================================================
+    def atualizar(self):
+        """Relê as estatísticas e se reagenda; só redesenha quando a view está visível."""
+        if self.winfo_ismapped():
+            self.preencher()
+        self.after(self.INTERVALO_MS, self.atualizar)
+
+    def preencher(self):
+        self.tree_top.delete(*self.tree_top.get_children())
+        for e in db.resumo_consultas(self.TOP_N):
+            chamador = e["chamadores"][0][0] if e["chamadores"] else ""
+            self.tree_top.insert("", "end", values=(
+                e["execucoes"], f"{e['total_ms']:.1f}", f"{e['media_ms']:.2f}", f"{e['max_ms']:.2f}",
+                e["linhas"], e["erros"], chamador, e["sql"]))
+
+        lentas = db.consultas_lentas()
+        if len(lentas) != len(self._lentas) or lentas[-1:] != self._lentas[-1:]:
+            self._lentas = lentas
+            self.tree_lentas.delete(*self.tree_lentas.get_children())
+            for i in range(len(lentas) - 1, -1, -1):
+                c = lentas[i]
+                self.tree_lentas.insert("", "end", iid=str(i), values=(
+                    c["quando"], f"{c['ms']:.1f}", c["linhas"], c["chamador"], c["sql"]))
+
+        c = db.estatisticas_cache()
+        self.lbl_cache.config(text=(
+            f"Cache de leitura: {c['entradas']} entradas, {c['linhas']}/{c['limite_linhas']} linhas · "
+            f"{c['acertos']} acertos, {c['faltas']} faltas ({c['taxa_acerto']:.0%}) · "
+            f"{c['despejos']} despejos · {c['invalidacoes_externas']} invalidações externas"))
+
+    def mostrar_plano(self):
+        sel = self.tree_lentas.selection()
+        if not sel:
+            return
+        consulta = self._lentas[int(sel[0])]
+        if consulta["plano"]:
+            self.lbl_plano.config(text="Plano:\n" + "\n".join(consulta["plano"]))
+        else:
+            self.lbl_plano.config(text="Plano não capturado (ative 'Capturar EXPLAIN QUERY PLAN').")
+
+    def aplicar_configuracao(self):
+        try:
+            limite = float(self.limite_var.get().replace(",", "."))
+        except ValueError:
+            limite = None
+        db.configurar_instrumentacao(limite_lenta_ms=limite, capturar_plano=self.plano_var.get())
+
+    def executar_manutencao(self, texto, funcao):
+        """Roda uma rotina de manutenção de db.py em segundo plano e mostra o resultado."""
+        def concluido(n):
+            self.lbl_manutencao.config(text=f"{texto}: " + ("falhou (ver console)" if n is None else f"{n} linha(s)"))
+
+        self.lbl_manutencao.config(text=f"{texto}...")
+        self.executor.submeter((self, "manutencao"), funcao, ao_concluir=concluido, indicador=self.indicador)
+
+    def zerar(self):
+        db.limpar_estatisticas()
+        db.limpar_cache()
+        self._lentas = []
+        self.lbl_plano.config(text="")
+        self.preencher()
+
+
+__all__ = ["DiagnosticoView"]
@@ -1,13 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
+from importacao import importar_pedidos
+from db import versao_tabela
 from models import Cliente, Pedido, ItemPedido, Produto
 from datetime import datetime
+from tarefas import obter_executor
+from utils import IndiceProdutos, formatar_centavos, validar_data
+from views.componentes import IndicadorOcupado, ExecucaoEmSegundoPlano, aplicar_linha, remover_linhas
 
 
-class PedidosView(ttk.Frame):
-    def __init__(self, master=None):
+class PedidosView(ExecucaoEmSegundoPlano, ttk.Frame):
+    # Paginação da lista de pedidos
+    TAMANHO_PAGINA = 200   # pedidos buscados por página
+    MAX_LINHAS = 1000      # máximo de linhas mantidas no Treeview ao mesmo tempo
+    LIMITE_PESQUISA = 500  # máximo de pedidos retornados por uma pesquisa
+    ATRASO_BUSCA_MS = 150  # espera após a última tecla antes de filtrar produtos
+
+    # (versão da tabela produtos, índice) do modal "Adicionar Item", compartilhado entre aberturas
+    _indice_produtos = (None, None)
+
+    def __init__(self, master=None, tamanho_pagina=None, max_linhas=None):
         super().__init__(master)
         self.pack(fill="both", expand=True, padx=12, pady=8)
+        self.executor = obter_executor(self)
+        self.tamanho_pagina = tamanho_pagina or self.TAMANHO_PAGINA
+        self.max_linhas = max(max_linhas or self.MAX_LINHAS, 2 * self.tamanho_pagina)
+        # Estado da rolagem virtual
+        self._paginando = False       # False durante uma pesquisa (lista completa)
+        self._carregando = False      # há uma página a caminho
+        self._tem_mais_acima = False  # há pedidos mais novos fora da janela
+        self._tem_mais_abaixo = False  # há pedidos mais antigos fora da janela
         self.criar_widgets()
         self.listar_pedidos()
 
@@ -23,27 +45,33 @@ class PedidosView(ttk.Frame):
         self.entry_pesquisa.pack(side="left", padx=6)
         ttk.Button(frame_pesquisa, text="Pesquisar", command=self.pesquisar_pedido).pack(side="left", padx=6)
         ttk.Button(frame_pesquisa, text="Limpar", command=self.listar_pedidos).pack(side="left", padx=6)
+        self.indicador = IndicadorOcupado(frame_pesquisa)
+        self.indicador.pack(side="right", padx=6)
 
         # Botões principais
         frame_botoes = ttk.Frame(self)
         frame_botoes.grid(row=1, column=0, columnspan=2, pady=10)
         ttk.Button(frame_botoes, text="Novo Pedido", command=self.abrir_modal_pedido, width=16).grid(row=0, column=0, padx=6)
         ttk.Button(frame_botoes, text="Excluir Pedido", command=self.excluir_pedido, width=16).grid(row=0, column=1, padx=6)
+        ttk.Button(frame_botoes, text="Importar CSV", width=16,
+                   command=lambda: self.importar_csv(importar_pedidos, lambda r: self.listar_pedidos())
+                   ).grid(row=0, column=2, padx=6)
 
         # Treeview de pedidos
-        colunas = ("id", "cliente", "data", "total")
-        self.tree = ttk.Treeview(self, columns=colunas, show="headings")
+        colunas = ("id", "cliente", "data", "itens", "total")
+        self.tree = ttk.Treeview(self, columns=colunas, show="headings", selectmode="extended")
         for col in colunas:
             self.tree.heading(col, text=col.capitalize())
         self.tree.column("id", width=60, anchor="center")
         self.tree.column("cliente", width=300)
         self.tree.column("data", width=120, anchor="center")
+        self.tree.column("itens", width=70, anchor="center")
         self.tree.column("total", width=120, anchor="e")
         self.tree.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=6, pady=6)
 
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.grid(row=2, column=2, sticky="ns", pady=6)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscroll=self._ao_rolar)
+        self.scrollbar.grid(row=2, column=2, sticky="ns", pady=6)
 
         # Itens do pedido selecionado
         ttk.Label(self, text="Itens do Pedido Selecionado").grid(row=3, column=0, columnspan=2, pady=10)
@@ -72,54 +100,175 @@ class PedidosView(ttk.Frame):
     # ===========================================================
     def carregar_clientes(self):
         clientes = Cliente.listar()
-        return [f"{c[0]} - {c[1]}" for c in clientes]
+        return [f"{c.id} - {c.nome}" for c in clientes]
 
     def carregar_produtos(self):
         produtos = Produto.listar()
         # formato: "id - nome - preço"
-        return [f"{p[0]} - {p[1]} - {p[2]:.2f}" for p in produtos]
+        return [f"{p.id} - {p.nome} - {formatar_centavos(p.preco_centavos)}" for p in produtos]
+
+    @classmethod
+    def carregar_indice_produtos(cls):
+        """Roda em segundo plano: índice de busca dos produtos, remontado só se a tabela mudou."""
+        versao = versao_tabela("produtos")  # lida antes da consulta: alteração concorrente força nova montagem
+        anterior, indice = cls._indice_produtos
+        if anterior != versao or indice is None:
+            indice = IndiceProdutos(Produto.listar())
+            cls._indice_produtos = (versao, indice)
+        return indice
 
     def validar_data(self, data):
-        try:
-            datetime.strptime(data, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
+        return validar_data(data)
 
     # ===========================================================
     # CRUD de Pedidos
     # ===========================================================
-    def listar_pedidos(self):
+    @staticmethod
+    def formatar_linha(p):
+        """LinhaPedidoCliente vinda do banco -> valores exibidos no Treeview."""
+        return (p.id, p.cliente if p.cliente is not None else "Desconhecido", p.data, p.qtd_itens,
+                formatar_centavos(p.total_centavos))
+
+    @staticmethod
+    def buscar_pagina(antes_de=None, depois_de=None, limite=200):
+        """Roda em segundo plano: retorna uma página de linhas (id, cliente, data, itens, total)."""
+        pedidos = Pedido.listar_pagina(antes_de=antes_de, depois_de=depois_de, limite=limite)
+        return [PedidosView.formatar_linha(p) for p in pedidos]
+
+    @staticmethod
+    def buscar_por_cliente(termo, limite=500):
+        """Roda em segundo plano: pedidos cujo nome do cliente contém `termo`."""
+        return [PedidosView.formatar_linha(p) for p in Pedido.pesquisar_por_cliente(termo, limite)]
+
+    def preencher_tree(self, linhas):
         for i in self.tree.get_children():
             self.tree.delete(i)
-        pedidos = Pedido.listar()
-        clientes = {c[0]: c[1] for c in Cliente.listar()}
-        for p in pedidos:
-            nome_cliente = clientes.get(p[1], "Desconhecido")
-            self.tree.insert("", "end", values=(p[0], nome_cliente, p[2], f"{p[3]:.2f}"))
+        for linha in linhas:
+            self.tree.insert("", "end", iid=str(linha[0]), values=linha)
+
+    def listar_pedidos(self):
+        """Recarrega a lista a partir da primeira página (pedidos mais recentes).
+
+        Só é chamada na abertura e no botão Limpar; criar ou excluir pedidos altera
+        apenas a linha afetada.
+        """
+        self._paginando = True
+        self._carregando = True
+        self.executar("listar", self.buscar_pagina, None, None, self.tamanho_pagina,
+                      ao_concluir=self._pagina_inicial, ao_falhar=self._falha_pagina)
 
     def pesquisar_pedido(self):
-        termo = self.entry_pesquisa.get().strip().lower()
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        pedidos = Pedido.listar()
-        clientes = {c[0]: c[1] for c in Cliente.listar()}
-        for p in pedidos:
-            nome_cliente = clientes.get(p[1], "")
-            if termo in nome_cliente.lower():
-                self.tree.insert("", "end", values=(p[0], nome_cliente, p[2], f"{p[3]:.2f}"))
+        termo = self.entry_pesquisa.get().strip()
+        self._paginando = False
+        self._carregando = False
+        self.executar("listar", self.buscar_por_cliente, termo, self.LIMITE_PESQUISA,
+                      ao_concluir=self.preencher_tree)
+
+    def adicionar_pedido_na_lista(self, linha):
+        """Mostra um pedido recém-criado no topo, se a janela exibida é a dos mais recentes."""
+        if not self._paginando or self._tem_mais_acima:
+            # pesquisa ativa ou janela rolada para pedidos antigos: o novo pedido
+            # aparecerá quando a lista for rolada/recarregada
+            return
+        aplicar_linha(self.tree, linha, 0)
+        filhos = self.tree.get_children()
+        if len(filhos) > self.max_linhas:
+            self.tree.delete(*filhos[self.max_linhas:])
+            self._tem_mais_abaixo = True
+
+    # ===========================================================
+    # Rolagem virtual (paginação por chave)
+    # ===========================================================
+    def _pagina_inicial(self, linhas):
+        self.preencher_tree(linhas)
+        self._tem_mais_acima = False
+        self._tem_mais_abaixo = len(linhas) == self.tamanho_pagina
+        self._carregando = False
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """yscrollcommand do Treeview: atualiza a barra e busca páginas perto das bordas."""
+        self.scrollbar.set(primeiro, ultimo)
+        if not self._paginando or self._carregando:
+            return
+        filhos = self.tree.get_children()
+        if not filhos:
+            return
+        if float(ultimo) >= 0.95 and self._tem_mais_abaixo:
+            self._carregando = True
+            ultimo_id = self.tree.item(filhos[-1])["values"][0]
+            self.executar("listar", self.buscar_pagina, ultimo_id, None, self.tamanho_pagina,
+                          ao_concluir=self._anexar_abaixo, ao_falhar=self._falha_pagina)
+        elif float(primeiro) <= 0.05 and self._tem_mais_acima:
+            self._carregando = True
+            primeiro_id = self.tree.item(filhos[0])["values"][0]
+            self.executar("listar", self.buscar_pagina, None, primeiro_id, self.tamanho_pagina,
+                          ao_concluir=self._anexar_acima, ao_falhar=self._falha_pagina)
+
+    def _falha_pagina(self, erro):
+        """A página não veio (ex.: banco bloqueado): libera a rolagem para tentar de novo."""
+        self._carregando = False
+        self.erro_banco(erro)
+
+    def _primeira_linha_visivel(self):
+        total = len(self.tree.get_children())
+        return int(round(float(self.tree.yview()[0]) * total))
+
+    def _mover_para_linha(self, indice):
+        total = len(self.tree.get_children())
+        if total:
+            self.tree.yview_moveto(max(indice, 0) / total)
+
+    def _anexar_abaixo(self, linhas):
+        """Acrescenta pedidos mais antigos ao fim e descarta o excesso do topo."""
+        visivel = self._primeira_linha_visivel()
+        for linha in linhas:
+            aplicar_linha(self.tree, linha)
+        self._tem_mais_abaixo = len(linhas) == self.tamanho_pagina
+
+        filhos = self.tree.get_children()
+        excesso = len(filhos) - self.max_linhas
+        if excesso > 0:
+            self.tree.delete(*filhos[:excesso])
+            self._tem_mais_acima = True
+            self._mover_para_linha(visivel - excesso)
+        self._carregando = False
+
+    def _anexar_acima(self, linhas):
+        """Insere pedidos mais novos no topo e descarta o excesso do fim.
+
+        `linhas` chega em ordem crescente de id; inserir cada uma na posição 0
+        deixa a mais nova no topo.
+        """
+        visivel = self._primeira_linha_visivel()
+        for linha in linhas:
+            aplicar_linha(self.tree, linha, 0)
+        self._tem_mais_acima = len(linhas) == self.tamanho_pagina
+
+        filhos = self.tree.get_children()
+        if len(filhos) > self.max_linhas:
+            self.tree.delete(*filhos[self.max_linhas:])
+            self._tem_mais_abaixo = True
+        self._mover_para_linha(visivel + len(linhas))
+        self._carregando = False
 
     def excluir_pedido(self):
+        """Exclui os pedidos selecionados e seus itens (seleção múltipla com Ctrl/Shift) em uma transação."""
         selec = self.tree.selection()
         if not selec:
-            messagebox.showwarning("Aviso", "Selecione um pedido para excluir.")
+            messagebox.showwarning("Aviso", "Selecione um ou mais pedidos para excluir.")
             return
-        pedido_id = self.tree.item(selec)["values"][0]
-        if messagebox.askyesno("Confirmação", "Deseja excluir este pedido?"):
-            Pedido.deletar(pedido_id)
-            self.listar_pedidos()
-            self.tree_itens.delete(*self.tree_itens.get_children())
-            messagebox.showinfo("Sucesso", "Pedido excluído.")
+        ids = [self.tree.item(i)["values"][0] for i in selec]
+        pergunta = "Deseja excluir este pedido?" if len(ids) == 1 else f"Deseja excluir os {len(ids)} pedidos selecionados?"
+        if messagebox.askyesno("Confirmação", pergunta):
+            def concluido(removidos):
+                if removidos is None:
+                    messagebox.showerror("Erro", "Não foi possível excluir os pedidos.")
+                    return
+                remover_linhas(self.tree, ids)
+                self.tree_itens.delete(*self.tree_itens.get_children())
+                messagebox.showinfo("Sucesso", f"{removidos} pedido(s) excluído(s).")
+
+            self.executar(None, Pedido.deletar_varios, ids, ao_concluir=concluido)
 
     # ===========================================================
     # MODAL DE CRIAÇÃO DE PEDIDO
@@ -133,8 +282,10 @@ class PedidosView(ttk.Frame):
 
         # Cliente
         tk.Label(modal, text="Cliente:").pack(pady=5)
-        combo_cliente = ttk.Combobox(modal, values=self.carregar_clientes(), width=40, state="readonly")
+        combo_cliente = ttk.Combobox(modal, values=[], width=40, state="readonly")
         combo_cliente.pack(pady=5)
+        self.executar("clientes_modal", self.carregar_clientes,
+                      ao_concluir=lambda valores: combo_cliente.config(values=valores))
 
         # Data
         tk.Label(modal, text="Data (YYYY-MM-DD):").pack(pady=5)
@@ -156,8 +307,9 @@ class PedidosView(ttk.Frame):
             tree_itens_modal.column(c, width=w)
         tree_itens_modal.pack(fill="both", expand=True, padx=5, pady=5)
 
-        # Total
-        total_var = tk.DoubleVar(value=0.0)
+        # Total (somado em centavos inteiros; total_var só exibe o valor formatado)
+        total_centavos = [0]
+        total_var = tk.StringVar(value=formatar_centavos(0))
         tk.Label(modal, textvariable=total_var, font=("Arial", 12, "bold")).pack(pady=5)
 
         # Funções internas
@@ -181,18 +333,31 @@ class PedidosView(ttk.Frame):
             lb_scroll.pack(side="right", fill="y")
             listbox.configure(yscrollcommand=lb_scroll.set)
 
-            produtos_cache = Produto.listar() or []  # list of tuples (id, nome, preco_unit)
+            # índice de produtos (id -> produto, prefixos e trigramas), montado em segundo plano
+            indice = IndiceProdutos([])
+            ids_exibidos = []  # id do produto em cada linha da listbox
+            busca_agendada = [None]
 
             def refresh_listbox(filter_text=""):
                 listbox.delete(0, tk.END)
-                ft = filter_text.strip().lower()
-                for p in produtos_cache:
-                    pid, nome, preco = p
-                    display = f"{pid} - {nome}  (R$ {preco:.2f})"
-                    if not ft or ft in nome.lower() or ft in str(pid):
-                        listbox.insert(tk.END, display)
+                ids_exibidos.clear()
+                for pid, nome, preco in indice.pesquisar(filter_text):
+                    ids_exibidos.append(pid)
+                    listbox.insert(tk.END, f"{pid} - {nome}  (R$ {formatar_centavos(preco)})")
+
+            def produtos_carregados(novo_indice):
+                nonlocal indice
+                indice = novo_indice
+                refresh_listbox(entry_search.get())
 
-            refresh_listbox()
+            self.executar("produtos_modal", self.carregar_indice_produtos,
+                          ao_concluir=produtos_carregados)
+
+            def produto_selecionado():
+                cur = listbox.curselection()
+                if not cur or cur[0] >= len(ids_exibidos):
+                    return None
+                return indice.obter(ids_exibidos[cur[0]])
 
             tk.Label(item_modal, text="Quantidade:").pack(pady=4)
             entry_qtd = ttk.Entry(item_modal, width=20)
@@ -203,41 +368,31 @@ class PedidosView(ttk.Frame):
             lbl_preco = ttk.Label(item_modal, textvariable=preco_var, width=20, anchor="w")
             lbl_preco.pack(pady=2)
 
-            # atualizar listbox ao digitar
-            def on_search_key(e=None):
+            # atualizar listbox ao digitar (com debounce: só filtra quando a digitação pausa)
+            def executar_busca():
+                busca_agendada[0] = None
                 refresh_listbox(entry_search.get())
 
+            def on_search_key(e=None):
+                if busca_agendada[0] is not None:
+                    item_modal.after_cancel(busca_agendada[0])
+                busca_agendada[0] = item_modal.after(self.ATRASO_BUSCA_MS, executar_busca)
+
             entry_search.bind("<KeyRelease>", on_search_key)
 
             # quando selecionar na listbox, preencher preço
             def on_listbox_select(e=None):
-                sel = listbox.curselection()
-                if not sel:
-                    return
-                text = listbox.get(sel[0])
-                try:
-                    pid = int(text.split(" - ")[0])
-                except Exception:
-                    pid = None
-                if pid is None:
-                    return
-                # buscar produto no cache
-                for p in produtos_cache:
-                    if p[0] == pid:
-                        preco_var.set(f"{p[2]:.2f}")
-                        break
+                p = produto_selecionado()
+                if p is not None:
+                    preco_var.set(formatar_centavos(p[2]))
 
             listbox.bind("<<ListboxSelect>>", on_listbox_select)
 
             def salvar_item():
-                sel = None
-                cur = listbox.curselection()
-                if cur:
-                    sel = listbox.get(cur[0])
+                produto = produto_selecionado()
                 qtd = entry_qtd.get().strip()
-                preco = preco_var.get().strip()
 
-                if not sel or not qtd:
+                if not produto or not qtd:
                     messagebox.showwarning("Campos obrigatórios", "Selecione um produto e informe a quantidade!")
                     return
                 try:
@@ -246,24 +401,13 @@ class PedidosView(ttk.Frame):
                     messagebox.showerror("Erro", "Quantidade deve ser um número inteiro.")
                     return
 
-                try:
-                    prod_id = int(sel.split(" - ")[0])
-                except Exception:
-                    messagebox.showerror("Erro", "Produto inválido selecionado.")
-                    return
-
-                # obter preço do cache
-                preco_f = 0.0
-                for p in produtos_cache:
-                    if p[0] == prod_id:
-                        preco_f = float(p[2])
-                        prod_nome = p[1]
-                        break
-
-                subtotal = qtd * preco_f
+                prod_id, prod_nome, preco = produto
+                subtotal = qtd * preco
                 # armazenamos produto_id como primeira coluna (oculta)
-                tree_itens_modal.insert("", "end", values=(prod_id, prod_nome, qtd, f"{preco_f:.2f}", f"{subtotal:.2f}"))
-                total_var.set(total_var.get() + subtotal)
+                tree_itens_modal.insert("", "end", values=(prod_id, prod_nome, qtd, formatar_centavos(preco),
+                                                           formatar_centavos(subtotal)))
+                total_centavos[0] += subtotal
+                total_var.set(formatar_centavos(total_centavos[0]))
                 item_modal.destroy()
 
             tk.Button(item_modal, text="Salvar", command=salvar_item, width=15).pack(pady=10)
@@ -274,7 +418,8 @@ class PedidosView(ttk.Frame):
             if not cliente_sel:
                 messagebox.showwarning("Aviso", "Selecione um cliente.")
                 return
-            id_cliente = int(cliente_sel.split(" - ")[0])
+            id_cliente, nome_cliente = cliente_sel.split(" - ", 1)
+            id_cliente = int(id_cliente)
             data = entry_data.get().strip()
             if not self.validar_data(data):
                 messagebox.showerror("Data inválida", "Use o formato YYYY-MM-DD.")
@@ -283,31 +428,31 @@ class PedidosView(ttk.Frame):
                 messagebox.showwarning("Aviso", "Adicione pelo menos um item.")
                 return
 
-            # Salva pedido
-            pedido = Pedido(id_cliente, data, total_var.get())
-            pedido.salvar()
-
-            # Recupera o ID recém-criado
-            pedidos = Pedido.listar()
-            novo_id = pedidos[-1][0]
-
-            # Salva itens (ItemPedido aceita: pedido_id, produto_id, quantidade)
+            # Lê os itens do modal ainda na thread do Tk
+            itens = []
             for item in tree_itens_modal.get_children():
                 vals = tree_itens_modal.item(item)["values"]
-                produto_id = int(vals[0])
-                qtd = int(vals[2])
-                item_p = ItemPedido(novo_id, produto_id, qtd)
-                item_p.salvar()
+                itens.append((int(vals[0]), int(vals[2])))
+            # Pedido e itens são gravados juntos em uma transação; o total é calculado pelos gatilhos
+            pedido = Pedido(id_cliente, data)
 
-            self.listar_pedidos()
-            messagebox.showinfo("Sucesso", "Pedido criado com sucesso!")
-            modal.destroy()
+            def concluido(novo_id):
+                if novo_id is None:
+                    messagebox.showerror("Erro", "Não foi possível salvar o pedido.")
+                    return
+                self.adicionar_pedido_na_lista((novo_id, nome_cliente, data, pedido.qtd_itens,
+                                                formatar_centavos(pedido.total_centavos)))
+                messagebox.showinfo("Sucesso", "Pedido criado com sucesso!")
+                modal.destroy()
+
+            self.gravar(btn_salvar, pedido.salvar_com_itens, itens, ao_concluir=concluido)
 
         # Botões do modal
         frame_botoes = tk.Frame(modal)
         frame_botoes.pack(pady=10)
         tk.Button(frame_botoes, text="Adicionar Item", command=adicionar_item, width=15).grid(row=0, column=0, padx=5)
-        tk.Button(frame_botoes, text="Salvar Pedido", command=salvar_pedido, width=15).grid(row=0, column=1, padx=5)
+        btn_salvar = tk.Button(frame_botoes, text="Salvar Pedido", command=salvar_pedido, width=15)
+        btn_salvar.grid(row=0, column=1, padx=5)
         tk.Button(frame_botoes, text="Cancelar", command=modal.destroy, width=15).grid(row=0, column=2, padx=5)
 
     # ===========================================================
@@ -317,18 +462,18 @@ class PedidosView(ttk.Frame):
         for i in self.tree_itens.get_children():
             self.tree_itens.delete(i)
         selec = self.tree.selection()
-        if not selec:
-            return
-        pedido_id = self.tree.item(selec)["values"][0]
-        itens = ItemPedido.listar_por_pedido(pedido_id)
-        total = 0
+        if len(selec) != 1:
+            return  # itens só são mostrados com um único pedido selecionado
+        pedido_id = self.tree.item(selec[0])["values"][0]
+        # chave única: trocar a seleção rapidamente descarta os itens do pedido anterior
+        self.executar("itens", ItemPedido.listar_por_pedido, pedido_id, ao_concluir=self.preencher_itens)
+
+    def preencher_itens(self, itens):
+        for i in self.tree_itens.get_children():
+            self.tree_itens.delete(i)
         for item in itens:
-            # item: (id, produto_id, nome, preco_unit, quantidade)
-            produto_id = item[1]
-            nome = item[2]
-            preco = float(item[3])
-            qtd = int(item[4])
-            subtotal = preco * qtd
-            total += subtotal
-            # inserimos produto_id (oculto), nome, qtd, preco, subtotal
-            self.tree_itens.insert("", "end", values=(produto_id, nome, qtd, f"{preco:.2f}", f"{subtotal:.2f}"))
+            # item: LinhaItemProduto(id, produto_id, nome, preco_centavos, quantidade, subtotal_centavos)
+            # inserimos produto_id (oculto), nome, qtd, preco, subtotal (calculado no SQL)
+            self.tree_itens.insert("", "end", values=(item.produto_id, item.nome, item.quantidade,
+                                                      formatar_centavos(item.preco_centavos),
+                                                      formatar_centavos(item.subtotal_centavos)))
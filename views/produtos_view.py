@@ -8,13 +8,18 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+from importacao import importar_produtos
 from models import Produto
+from utils import formatar_centavos, para_centavos
+from tarefas import obter_executor
+from views.componentes import IndicadorOcupado, ExecucaoEmSegundoPlano, aplicar_linha, remover_linhas
 
 
-class ProdutosView(ttk.Frame):
+class ProdutosView(ExecucaoEmSegundoPlano, ttk.Frame):
     def __init__(self, master=None):
         super().__init__(master)
         self.pack(fill="both", expand=True, padx=12, pady=8)
+        self.executor = obter_executor(self)
         self.criar_widgets()
         self.listar_produtos()
 
@@ -29,12 +34,19 @@ class ProdutosView(ttk.Frame):
 
         frame_botoes = ttk.Frame(self)
         frame_botoes.grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(frame_botoes, text="Salvar", command=self.salvar_produto, width=12).grid(row=0, column=0, padx=6)
+        self.btn_salvar = ttk.Button(frame_botoes, text="Salvar", command=self.salvar_produto, width=12)
+        self.btn_salvar.grid(row=0, column=0, padx=6)
         ttk.Button(frame_botoes, text="Editar", command=self.abrir_modal_edicao, width=12).grid(row=0, column=1, padx=6)
         ttk.Button(frame_botoes, text="Excluir", command=self.excluir_produto, width=12).grid(row=0, column=2, padx=6)
+        ttk.Button(frame_botoes, text="Recarregar", command=self.listar_produtos, width=12).grid(row=0, column=3, padx=6)
+        ttk.Button(frame_botoes, text="Importar CSV", width=12,
+                   command=lambda: self.importar_csv(importar_produtos, lambda r: self.listar_produtos())
+                   ).grid(row=0, column=4, padx=6)
+        self.indicador = IndicadorOcupado(frame_botoes)
+        self.indicador.grid(row=0, column=5, padx=6)
 
         colunas = ("id", "nome", "preco")
-        self.tree = ttk.Treeview(self, columns=colunas, show="headings")
+        self.tree = ttk.Treeview(self, columns=colunas, show="headings", selectmode="extended")
         for col in colunas:
             self.tree.heading(col, text=col.capitalize())
         self.tree.column("id", width=60, anchor="center")
@@ -49,11 +61,20 @@ class ProdutosView(ttk.Frame):
         self.grid_rowconfigure(3, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
-    def listar_produtos(self):
+    @staticmethod
+    def valores(p):
+        """LinhaProduto(id, nome, preco_centavos) -> valores exibidos no Treeview."""
+        return (p.id, p.nome, formatar_centavos(p.preco_centavos))
+
+    def preencher_tree(self, produtos):
         for item in self.tree.get_children():
             self.tree.delete(item)
-        for p in Produto.listar():
-            self.tree.insert("", "end", values=(p[0], p[1], f"{p[2]:.2f}"))
+        for p in produtos:
+            self.tree.insert("", "end", iid=str(p[0]), values=self.valores(p))
+
+    def listar_produtos(self):
+        """Recarrega a lista inteira; as gravações atualizam só a linha afetada."""
+        self.executar("listar", Produto.listar, ao_concluir=self.preencher_tree)
 
     def salvar_produto(self):
         nome = self.entry_nome.get().strip()
@@ -62,34 +83,48 @@ class ProdutosView(ttk.Frame):
             messagebox.showwarning("Aviso", "O campo Nome é obrigatório!")
             return
         try:
-            preco = float(preco)
+            preco = para_centavos(preco)
         except ValueError:
             messagebox.showerror("Erro", "Preço deve ser numérico.")
             return
+        def concluido(linha):
+            if linha is None:
+                messagebox.showerror("Erro", "Não foi possível salvar o produto.")
+                return
+            aplicar_linha(self.tree, self.valores(linha))
+            # os campos só são limpos depois de gravados: em caso de erro o usuário não perde o que digitou
+            self.entry_nome.delete(0, tk.END)
+            self.entry_preco.delete(0, tk.END)
+            messagebox.showinfo("Sucesso", "Produto salvo com sucesso!")
+
         prod = Produto(nome, preco)
-        prod.salvar()
-        self.listar_produtos()
-        messagebox.showinfo("Sucesso", "Produto salvo com sucesso!")
-        self.entry_nome.delete(0, tk.END)
-        self.entry_preco.delete(0, tk.END)
+        self.gravar(self.btn_salvar, prod.salvar, ao_concluir=concluido)
 
     def excluir_produto(self):
+        """Exclui os produtos selecionados (seleção múltipla com Ctrl/Shift) em uma transação."""
         sel = self.tree.selection()
         if not sel:
-            messagebox.showwarning("Aviso", "Selecione um produto para excluir.")
+            messagebox.showwarning("Aviso", "Selecione um ou mais produtos para excluir.")
             return
-        pid = self.tree.item(sel)["values"][0]
-        if messagebox.askyesno("Confirmação", "Deseja realmente excluir este produto?"):
-            Produto.deletar(pid)
-            self.listar_produtos()
-            messagebox.showinfo("Sucesso", "Produto excluído.")
+        ids = [self.tree.item(i)["values"][0] for i in sel]
+        pergunta = ("Deseja realmente excluir este produto?" if len(ids) == 1
+                    else f"Deseja realmente excluir os {len(ids)} produtos selecionados?")
+        if messagebox.askyesno("Confirmação", pergunta):
+            def concluido(removidos):
+                if removidos is None:
+                    messagebox.showerror("Erro", "Não foi possível excluir os produtos.")
+                    return
+                remover_linhas(self.tree, ids)
+                messagebox.showinfo("Sucesso", f"{removidos} produto(s) excluído(s).")
+
+            self.executar(None, Produto.deletar_varios, ids, ao_concluir=concluido)
 
     def abrir_modal_edicao(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showwarning("Aviso", "Selecione um produto para editar.")
             return
-        pid, nome, preco = self.tree.item(sel)["values"]
+        pid, nome, preco = self.tree.item(sel[0])["values"]  # com vários selecionados, edita o primeiro
         modal = Toplevel(self)
         modal.title("Editar Produto")
         modal.geometry("350x180")
@@ -112,17 +147,24 @@ class ProdutosView(ttk.Frame):
                 messagebox.showwarning("Aviso", "Nome é obrigatório")
                 return
             try:
-                pp = float(pp)
+                pp = para_centavos(pp)
             except ValueError:
                 messagebox.showerror("Erro", "Preço deve ser numérico")
                 return
+            def concluido(linha):
+                if linha is None:
+                    messagebox.showerror("Erro", "Não foi possível atualizar o produto.")
+                    return
+                aplicar_linha(self.tree, self.valores(linha))
+                # o modal só fecha depois de gravado: em caso de erro as alterações continuam nele
+                modal.destroy()
+                messagebox.showinfo("Sucesso", "Produto atualizado com sucesso")
+
             prod = Produto(nn, pp, id=pid)
-            prod.salvar()
-            self.listar_produtos()
-            messagebox.showinfo("Sucesso", "Produto atualizado com sucesso")
-            modal.destroy()
+            self.gravar(btn_salvar, prod.salvar, ao_concluir=concluido)
 
-        ttk.Button(modal, text="Salvar Alterações", command=salvar_edicao, width=20).pack(pady=8)
+        btn_salvar = ttk.Button(modal, text="Salvar Alterações", command=salvar_edicao, width=20)
+        btn_salvar.pack(pady=8)
         ttk.Button(modal, text="Cancelar", command=modal.destroy, width=20).pack()
 
 __all__ = ["ProdutosView"]
@@ -0,0 +1,110 @@
+from tkinter import ttk
+
+from relatorios import gerar_relatorios
+from tarefas import obter_executor
+from utils import formatar_centavos
+from views.componentes import IndicadorOcupado, ExecucaoEmSegundoPlano
+
+
+class RelatoriosView(ExecucaoEmSegundoPlano, ttk.Frame):
+    """Relatórios analíticos: maiores clientes, produtos mais vendidos, curva ABC e médias.
+
+    Os números são calculados em outros processos (ver relatorios.py); a view só
+    dispara o cálculo em segundo plano e preenche as abas com o resultado.
+    """
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self.pack(fill="both", expand=True, padx=12, pady=8)
+        self.executor = obter_executor(self)
+        self.criar_widgets()
+        self.gerar()
+
+    # ===========================================================
+    # Interface
+    # ===========================================================
+    def criar_widgets(self):
+        topo = ttk.Frame(self)
+        topo.pack(fill="x", pady=(0, 8))
+        ttk.Label(topo, text="Relatórios", font=("Segoe UI", 12, "bold")).pack(side="left")
+        ttk.Button(topo, text="Gerar novamente", command=self.gerar).pack(side="right")
+        self.indicador = IndicadorOcupado(topo, texto="⏳ Calculando...")
+        self.indicador.pack(side="right", padx=6)
+        self.lbl_tempo = ttk.Label(topo, text="", foreground="gray")
+        self.lbl_tempo.pack(side="right", padx=6)
+
+        abas = ttk.Notebook(self)
+        abas.pack(fill="both", expand=True)
+        self.tree_clientes = self._criar_tabela(abas, "Maiores clientes", (
+            ("posicao", "#", 50, "center"), ("cliente", "Cliente", 300, "w"),
+            ("pedidos", "Pedidos", 90, "e"), ("receita", "Receita", 140, "e")))
+        self.tree_produtos = self._criar_tabela(abas, "Produtos mais vendidos", (
+            ("posicao", "#", 50, "center"), ("produto", "Produto", 300, "w"),
+            ("quantidade", "Quantidade", 100, "e"), ("receita", "Receita", 140, "e"),
+            ("classe", "Classe ABC", 90, "center")))
+        self.tree_abc = self._criar_tabela(abas, "Curva ABC", (
+            ("classe", "Classe", 70, "center"), ("produtos", "Produtos", 100, "e"),
+            ("fracao_produtos", "% dos produtos", 120, "e"), ("receita", "Receita", 160, "e"),
+            ("fracao_receita", "% da receita", 120, "e")))
+
+        aba_medias = ttk.Frame(abas, padding=12)
+        abas.add(aba_medias, text="Médias")
+        self.lbls_medias = {}
+        for linha, (chave, titulo) in enumerate((("pedidos", "Pedidos"),
+                                                 ("itens_por_pedido", "Itens por pedido"),
+                                                 ("unidades_por_pedido", "Unidades por pedido"),
+                                                 ("ticket_medio_centavos", "Ticket médio (R$)"))):
+            ttk.Label(aba_medias, text=titulo + ":").grid(row=linha, column=0, sticky="e", padx=6, pady=4)
+            self.lbls_medias[chave] = ttk.Label(aba_medias, text="—", font=("Segoe UI", 11, "bold"))
+            self.lbls_medias[chave].grid(row=linha, column=1, sticky="w", padx=6, pady=4)
+
+    @staticmethod
+    def _criar_tabela(abas, titulo, colunas):
+        """Cria uma aba com um Treeview de `colunas` ((id, título, largura, alinhamento), ...)."""
+        aba = ttk.Frame(abas)
+        abas.add(aba, text=titulo)
+        tree = ttk.Treeview(aba, columns=[c[0] for c in colunas], show="headings")
+        for col, texto, largura, ancora in colunas:
+            tree.heading(col, text=texto)
+            tree.column(col, width=largura, anchor=ancora)
+        scrollbar = ttk.Scrollbar(aba, orient="vertical", command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        tree.pack(side="left", fill="both", expand=True, padx=6, pady=6)
+        scrollbar.pack(side="right", fill="y", pady=6)
+        return tree
+
+    # ===========================================================
+    # Cálculo e exibição
+    # ===========================================================
+    def gerar(self):
+        """Calcula os relatórios em segundo plano (a thread de trabalho espera pelos processos)."""
+        self.executar("relatorios", gerar_relatorios, ao_concluir=self.preencher)
+
+    @staticmethod
+    def _preencher_tabela(tree, linhas):
+        tree.delete(*tree.get_children())
+        for valores in linhas:
+            tree.insert("", "end", values=valores)
+
+    def preencher(self, r):
+        self._preencher_tabela(self.tree_clientes, (
+            (i, c.nome if c.nome is not None else "Desconhecido", c.pedidos, formatar_centavos(c.receita_centavos))
+            for i, c in enumerate(r["top_clientes"], start=1)))
+        self._preencher_tabela(self.tree_produtos, (
+            (i, p.nome if p.nome is not None else "Desconhecido", p.quantidade, formatar_centavos(p.receita_centavos),
+             p.classe)
+            for i, p in enumerate(r["top_produtos"], start=1)))
+        self._preencher_tabela(self.tree_abc, (
+            (a.classe, a.produtos, f"{a.fracao_produtos:.1%}", formatar_centavos(a.receita_centavos),
+             f"{a.fracao_receita:.1%}")
+            for a in r["abc"]))
+
+        m = r["medias"]
+        self.lbls_medias["pedidos"].config(text=str(m["pedidos"]))
+        self.lbls_medias["itens_por_pedido"].config(text=f"{m['itens_por_pedido']:.2f}")
+        self.lbls_medias["unidades_por_pedido"].config(text=f"{m['unidades_por_pedido']:.2f}")
+        self.lbls_medias["ticket_medio_centavos"].config(text=formatar_centavos(m["ticket_medio_centavos"]))
+        self.lbl_tempo.config(text=f"Calculado em {r['tempos_ms']['total']:.0f} ms")
+
+
+__all__ = ["RelatoriosView"]